@@ -0,0 +1,80 @@
+"""
+Import-time budget check for application startup.
+
+Imports the modules needed to show the main window in a fresh interpreter
+and fails if that takes longer than the budget or pulls in heavy
+dependencies that should only load in the background:
+
+    python benchmarks/import_budget.py --budget 1.5
+"""
+
+import sys
+import json
+import argparse
+import subprocess
+from pathlib import Path
+from typing import List, Optional
+
+project_root = Path(__file__).resolve().parent.parent
+
+# Modules that must not be imported before the window is shown
+HEAVY_MODULES = ["torch", "whisper", "transformers", "librosa"]
+
+# Seconds allowed for the startup imports
+DEFAULT_BUDGET = 1.5
+
+# Startup imports measured in the child interpreter
+_PROBE = """
+import sys, json, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import config
+import src.transcription
+import src.gui
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+def measure_startup_imports(python: str = sys.executable) -> dict:
+    """
+    Import the startup modules in a fresh interpreter.
+
+    Returns:
+        Dictionary with the import time in seconds and loaded module names
+    """
+    output = subprocess.run(
+        [python, "-c", _PROBE.format(root=str(project_root))],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=project_root
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Budget check entry point."""
+    parser = argparse.ArgumentParser(description="Check application import time against a budget.")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="Maximum import time in seconds")
+    parser.add_argument("--runs", type=int, default=3, help="Measurements; the fastest is used")
+    args = parser.parse_args(argv)
+
+    results = [measure_startup_imports() for _ in range(args.runs)]
+    seconds = min(result["seconds"] for result in results)
+    loaded = set(results[0]["modules"])
+    heavy = [name for name in HEAVY_MODULES if name in loaded]
+
+    print(f"Startup imports: {seconds:.3f}s (budget {args.budget:.3f}s)")
+    failed = False
+    if seconds > args.budget:
+        print("FAIL: import time exceeds budget")
+        failed = True
+    if heavy:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(heavy)}")
+        failed = True
+    if not failed:
+        print("OK")
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""
+Accuracy and speed of the int8 speaker classifier against fp32.
+
+Classifies a fixed set of segment texts with the fp32 model and with an
+int8 copy of the same weights, so differences come from quantization
+alone, and reports label agreement, score drift, throughput and size:
+
+    python benchmarks/quantization_report.py --count 500 --threads 4
+    python benchmarks/quantization_report.py --segments output/call.json --output report.json
+"""
+
+import io
+import sys
+import copy
+import json
+import time
+import argparse
+import statistics
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from config import (
+    SPEAKER_MODEL,
+    BATCH_SIZE,
+    INFERENCE_THREADS,
+    CLASSIFICATION_CONFIDENCE_THRESHOLD
+)
+
+_OPENERS = ["Hi, thanks for", "So about", "I wanted to ask about", "Can you walk me through",
+            "We are looking at", "Let me check on", "Honestly the", "Could we revisit"]
+_TOPICS = ["the pricing for twenty seats", "your renewal next quarter", "the enterprise plan",
+           "a discount if we sign this month", "the contract terms", "the demo on Thursday",
+           "our budget for the rollout", "the onboarding timeline", "support response times",
+           "integrating with our CRM"]
+_CLOSERS = ["", " before Friday", " because finance keeps asking", " and what the next steps are",
+            " since the last call", " for the whole team, including the people in the other office"]
+
+def fixed_segments(count: int, seed: int = 0) -> List[str]:
+    """
+    Build a reproducible set of call-like segment texts of varied length.
+
+    Args:
+        count: Number of texts
+        seed: Random seed
+
+    Returns:
+        Segment texts
+    """
+    rng = np.random.default_rng(seed)
+    texts = []
+    for _ in range(count):
+        sentences = [
+            f"{rng.choice(_OPENERS)} {rng.choice(_TOPICS)}{rng.choice(_CLOSERS)}."
+            for _ in range(rng.integers(1, 5))
+        ]
+        texts.append(" ".join(sentences))
+    return texts
+
+def load_segments(path: Path) -> List[str]:
+    """Read segment texts from a JSON or JSONL transcript export."""
+    with open(path, encoding="utf-8") as f:
+        if path.suffix == ".jsonl":
+            return [json.loads(line)["text"] for line in f if line.strip()]
+        return [segment["text"] for segment in json.load(f)["segments"]]
+
+def serialized_size(model) -> int:
+    """Get the size of a model's saved state dict in bytes."""
+    import torch
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell()
+
+def time_classifier(classifier, texts: List[str], repeats: int) -> Dict:
+    """
+    Classify texts in length-sorted batches, as SpeakerClassifier does.
+
+    Returns:
+        Predictions in input order and the median seconds per pass
+    """
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    batches = [order[i:i + BATCH_SIZE] for i in range(0, len(order), BATCH_SIZE)]
+
+    # Warm-up pass
+    classifier(texts[:BATCH_SIZE], batch_size=BATCH_SIZE, truncation=True)
+
+    timings = []
+    predictions: List[Dict] = [None] * len(texts)
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for batch in batches:
+            results = classifier([texts[i] for i in batch], batch_size=len(batch), truncation=True)
+            for i, result in zip(batch, results):
+                predictions[i] = result[0] if isinstance(result, list) else result
+        timings.append(time.perf_counter() - start)
+
+    return {"predictions": predictions, "seconds": statistics.median(timings)}
+
+def build_report(texts: List[str], model_name: str, threads: int, repeats: int) -> Dict:
+    """
+    Compare the fp32 and int8 classifiers on the same texts.
+
+    Args:
+        texts: Segment texts to classify
+        model_name: Speaker model name or path
+        threads: Intra-op CPU threads set for both runs, recorded in the report
+        repeats: Timed passes per model; the median is reported
+
+    Returns:
+        Report record
+    """
+    from transformers import pipeline
+    from src.transcription.model_registry import get_model_registry, quantize_linear_layers
+
+    fp32 = get_model_registry().get("text-classification", model_name, "cpu")
+    int8 = pipeline(
+        "text-classification",
+        model=quantize_linear_layers(copy.deepcopy(fp32.model).eval()),
+        tokenizer=fp32.tokenizer,
+        device=-1
+    )
+
+    runs = {
+        "fp32": time_classifier(fp32, texts, repeats),
+        "int8": time_classifier(int8, texts, repeats)
+    }
+    base, quant = runs["fp32"]["predictions"], runs["int8"]["predictions"]
+    drift = np.abs(np.array([p["score"] for p in base]) - np.array([p["score"] for p in quant]))
+    kept = lambda predictions: np.array([
+        p["score"] >= CLASSIFICATION_CONFIDENCE_THRESHOLD for p in predictions
+    ])
+
+    return {
+        "config": {
+            "model": model_name,
+            "segments": len(texts),
+            "threads": threads,
+            "batch_size": BATCH_SIZE,
+            "repeats": repeats
+        },
+        "accuracy": {
+            "label_agreement": float(np.mean([a["label"] == b["label"] for a, b in zip(base, quant)])),
+            "threshold_agreement": float(np.mean(kept(base) == kept(quant))),
+            "mean_score_drift": float(drift.mean()) if len(drift) else 0.0,
+            "max_score_drift": float(drift.max()) if len(drift) else 0.0
+        },
+        "speed": {
+            mode: {
+                "seconds": run["seconds"],
+                "segments_per_second": len(texts) / run["seconds"] if run["seconds"] > 0 else 0.0
+            }
+            for mode, run in runs.items()
+        },
+        "speedup": runs["fp32"]["seconds"] / runs["int8"]["seconds"] if runs["int8"]["seconds"] > 0 else 0.0,
+        "size": {
+            "fp32": serialized_size(fp32.model),
+            "int8": serialized_size(int8.model)
+        }
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Report entry point."""
+    parser = argparse.ArgumentParser(description="Compare the int8 and fp32 speaker classifiers.")
+    parser.add_argument("--segments", type=Path, help="JSON or JSONL transcript export to classify")
+    parser.add_argument("--count", type=int, default=500, help="Generated segments when --segments is omitted")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the generated segments")
+    parser.add_argument("--model", default=SPEAKER_MODEL, help="Speaker model name or path")
+    parser.add_argument("--threads", type=int, default=INFERENCE_THREADS, help="Intra-op CPU threads")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed passes per model")
+    parser.add_argument("--output", type=Path, help="Write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    # Process-wide, so it is set before either model is loaded or timed
+    from src.transcription.model_registry import set_inference_threads
+    set_inference_threads(args.threads)
+
+    texts = load_segments(args.segments) if args.segments else fixed_segments(args.count, args.seed)
+    report = build_report(texts, args.model, args.threads, args.repeats)
+
+    accuracy, speed, size = report["accuracy"], report["speed"], report["size"]
+    print(f"Model: {args.model}, {len(texts)} segments, {args.threads} threads")
+    print(f"- label agreement: {accuracy['label_agreement']:.2%}")
+    print(f"- threshold agreement: {accuracy['threshold_agreement']:.2%}")
+    print(f"- score drift: mean {accuracy['mean_score_drift']:.4f}, max {accuracy['max_score_drift']:.4f}")
+    for mode in ("fp32", "int8"):
+        print(f"- {mode}: {speed[mode]['segments_per_second']:.1f} segments/s, "
+              f"{size[mode] / 1024 / 1024:.1f}MB")
+    print(f"Speedup: {report['speedup']:.2f}x")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+Benchmark harness for the transcription pipeline.
+
+Generates synthetic call audio, times every pipeline stage and exporter,
+and writes or compares against a JSON baseline:
+
+    python benchmarks/run_benchmarks.py --duration 600 --output baseline.json
+    python benchmarks/run_benchmarks.py --duration 600 --compare baseline.json
+"""
+
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from config import EXPORT_FORMATS, WHISPER_MODEL
+from synthetic_audio import write_call
+from stub_models import install_stub_models
+
+def run_once(audio_path: Path, export_dir: Path, diarization: str = "text") -> Dict[str, float]:
+    """
+    Run the pipeline and exporters once.
+
+    Args:
+        audio_path: Call to process
+        export_dir: Directory for the exports
+        diarization: Speaker labelling mode passed to the pipeline
+
+    Returns:
+        Seconds per stage and exporter
+    """
+    from src.transcription import TranscriptionPipeline
+    from src.utils.artifact_cache import ArtifactCache
+    from src.utils.audio_store import AudioStore
+    from src.utils.metrics import MetricsSink
+    from src.utils.export_utils import export_transcript
+
+    # Caching would turn every repeat after the first into a lookup, and a
+    # shared audio store would skip decoding, so each run starts empty
+    with tempfile.TemporaryDirectory() as store_dir:
+        pipeline = TranscriptionPipeline(cache=ArtifactCache(enabled=False), metrics_sink=MetricsSink(None),
+                                         diarization=diarization, checkpoints=False,
+                                         audio_store=AudioStore(Path(store_dir)))
+
+        start = time.perf_counter()
+        results = pipeline.process(audio_path)
+        timings = {"pipeline_total": time.perf_counter() - start}
+    for stage, entry in results["metrics"]["stages"].items():
+        timings[stage] = entry["wall_time"]
+
+    for format in EXPORT_FORMATS:
+        start = time.perf_counter()
+        try:
+            export_transcript(results, export_dir / f"benchmark.{format}", format)
+        except RuntimeError:
+            # Optional dependency (e.g. pyarrow) not installed
+            continue
+        timings[f"export_{format}"] = time.perf_counter() - start
+
+    return timings
+
+def run_benchmarks(duration: float, sample_rate: int, channels: int,
+                   repeats: int, stub: bool, seed: int = 0,
+                   diarization: str = "text") -> Dict:
+    """
+    Benchmark the pipeline on a synthetic call.
+
+    Args:
+        duration: Length of the synthetic call in seconds
+        sample_rate: Sample rate of the generated file
+        channels: Channel count of the generated file
+        repeats: Number of timed runs; the median is reported
+        stub: Use offline stub models instead of the real ones
+        seed: Seed for the synthetic audio
+        diarization: Speaker labelling mode, "text" or "acoustic"
+
+    Returns:
+        Benchmark record suitable for a baseline file
+    """
+    if stub:
+        install_stub_models()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        audio_path = tmp_dir / "synthetic_call.wav"
+        write_call(audio_path, duration, sample_rate, channels, seed)
+
+        # Warm-up run loads models and fills OS caches
+        run_once(audio_path, tmp_dir, diarization)
+
+        runs: List[Dict[str, float]] = [
+            run_once(audio_path, tmp_dir, diarization) for _ in range(repeats)
+        ]
+
+    stages = {
+        name: statistics.median(run[name] for run in runs if name in run)
+        for name in runs[0]
+    }
+    return {
+        "config": {
+            "duration": duration,
+            "sample_rate": sample_rate,
+            "channels": channels,
+            "repeats": repeats,
+            "seed": seed,
+            "models": "stub" if stub else WHISPER_MODEL,
+            "diarization": diarization
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine()
+        },
+        "timings": stages,
+        "realtime_factor": stages["pipeline_total"] / duration
+    }
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Find stages that got slower than the baseline allows.
+
+    Args:
+        current: Record from run_benchmarks()
+        baseline: Previously saved record
+        tolerance: Allowed relative slowdown, e.g. 0.1 for 10%
+
+    Returns:
+        Descriptions of regressions
+    """
+    if current["config"] != baseline["config"]:
+        print("Warning: benchmark configuration differs from the baseline.")
+
+    regressions = []
+    print(f"\n{'Stage':<28}{'Baseline':>12}{'Current':>12}{'Change':>10}")
+    for name, base_time in sorted(baseline["timings"].items()):
+        if name not in current["timings"]:
+            continue
+        current_time = current["timings"][name]
+        change = (current_time - base_time) / base_time if base_time > 0 else 0.0
+        flag = ""
+        if change > tolerance:
+            flag = "  REGRESSION"
+            regressions.append(f"{name}: {base_time:.4f}s -> {current_time:.4f}s ({change:+.1%})")
+        print(f"{name:<28}{base_time:>11.4f}s{current_time:>11.4f}s{change:>+10.1%}{flag}")
+
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the transcription pipeline on synthetic audio.")
+    parser.add_argument("--duration", type=float, default=300, help="Synthetic call length in seconds")
+    parser.add_argument("--sample-rate", type=int, default=44100, help="Sample rate of the synthetic file")
+    parser.add_argument("--channels", type=int, default=2, help="Channels in the synthetic file")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic audio")
+    parser.add_argument("--real-models", action="store_true",
+                        help="Use the configured models instead of offline stubs")
+    parser.add_argument("--diarization", choices=["text", "acoustic"], default="text",
+                        help="Label speakers from the transcript or from the voices")
+    parser.add_argument("--output", type=Path, help="Write results to this baseline file")
+    parser.add_argument("--compare", type=Path, help="Compare results against this baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="Allowed relative slowdown before a stage is flagged")
+    args = parser.parse_args(argv)
+
+    record = run_benchmarks(
+        args.duration,
+        args.sample_rate,
+        args.channels,
+        args.repeats,
+        stub=not args.real_models,
+        seed=args.seed,
+        diarization=args.diarization
+    )
+
+    print(f"Synthetic call: {args.duration:.0f}s, {args.sample_rate}Hz, {args.channels}ch")
+    for name, seconds in sorted(record["timings"].items()):
+        print(f"- {name}: {seconds:.4f}s")
+    print(f"Real-time factor: {record['realtime_factor']:.4f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=2)
+        print(f"\nBaseline written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(record, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions beyond tolerance:")
+            for regression in regressions:
+                print(f"- {regression}")
+            return 1
+        print("\nNo regressions beyond tolerance.")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,7 +4,6 @@ Configuration settings for the Sales Conversation Transcription System.
 
 import os
 from pathlib import Path
-import torch
 
 # Base directory paths
 BASE_DIR = Path(__file__).resolve().parent
@@ -21,17 +20,106 @@ SUPPORTED_FORMATS = ['.wav', '.mp3', '.m4a']
 MAX_FILE_SIZE = 500 * 1024 * 1024  # 500MB
 MIN_SAMPLE_RATE = 16000
 MIN_SEGMENT_LENGTH = 2  # seconds
+SAVE_PROCESSED_AUDIO = False  # Debug: also write preprocessed audio to TEMP_DIR as WAV
+STREAMING_THRESHOLD = 50 * 1024 * 1024  # Decode larger files block by block (50MB)
+STREAM_BLOCK_SECONDS = 30  # Length of each streamed decode block
+
+# Voice activity detection settings
+VAD_ENABLED = False  # Only send detected speech to Whisper; changes timestamps and text, so opt-in
+VAD_FRAME_MS = 30
+VAD_ENERGY_MARGIN_DB = 10.0  # Required level above the recording's noise floor
+VAD_MIN_SPEECH_DURATION = 0.3  # seconds
+VAD_MIN_SILENCE_DURATION = 0.5  # Shorter pauses are kept as speech (seconds)
+VAD_PADDING = 0.2  # Context kept around each speech region (seconds)
 
 # Whisper model settings
 WHISPER_MODEL = "base"  # Options: tiny, base, small, medium, large
-DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
+_device = None
+
+def get_device() -> str:
+    """Get the compute device, importing torch only on first use."""
+    global _device
+    if _device is None:
+        import torch
+        _device = "cuda" if torch.cuda.is_available() else "cpu"
+    return _device
+
+def __getattr__(name):
+    # Keep `from config import DEVICE` working without importing torch at startup
+    if name == "DEVICE":
+        return get_device()
+    raise AttributeError(f"module 'config' has no attribute '{name}'")
+
+# Cascade transcription settings
+CASCADE_TRANSCRIPTION = False  # Fast first pass, accurate re-decode of low-confidence segments
+CASCADE_FAST_MODEL = "tiny"
+CASCADE_ACCURATE_MODEL = "medium"
+CASCADE_CONFIDENCE_THRESHOLD = 0.6  # exp(avg_logprob) below which a segment is re-decoded
+CASCADE_MERGE_GAP = 1.0  # Re-decode neighbouring weak segments closer than this together (seconds)
+CASCADE_PADDING = 0.5  # Context added around each re-decoded span (seconds)
+
+# Parallel transcription settings
+PARALLEL_TRANSCRIPTION = False  # Split long recordings across worker processes
+PARALLEL_MIN_DURATION = 20 * 60  # Only split recordings longer than this (seconds)
+PARALLEL_CHUNK_SECONDS = 5 * 60  # Target chunk length
+PARALLEL_CHUNK_OVERLAP = 2.0  # Context decoded on each side of a chunk (seconds)
+PARALLEL_SPLIT_SEARCH_SECONDS = 15  # Window searched for a quiet split point
+TRANSCRIPTION_WORKERS = max(1, min(4, (os.cpu_count() or 2) // 2))
+
+# Live transcription settings
+STREAM_WINDOW_SECONDS = 20  # Most audio re-transcribed per step
+STREAM_STEP_SECONDS = 3  # New audio needed before the next step
+STREAM_COMMIT_MARGIN = 2.0  # Segments ending this close to the live edge stay provisional
+STREAM_BUFFER_SECONDS = 60  # Audio kept in the rolling buffer
+
+# Model registry settings
+MODEL_CACHE_MAX_ENTRIES = 4  # Models kept resident per process
+MODEL_CACHE_MEMORY_BUDGET = 6 * 1024 * 1024 * 1024  # 6GB in bytes
 
 # Speaker classification settings
+SPEAKER_MODEL = "distilbert-base-uncased"
 SPEAKER_CLASSES = ["salesperson", "customer"]
 CLASSIFICATION_CONFIDENCE_THRESHOLD = 0.75
+SPEAKER_QUANTIZED = False  # CPU only: int8 linear layers, built once and cached in MODELS_DIR
+INFERENCE_THREADS = max(1, min(8, os.cpu_count() or 1))  # Intra-op threads for CPU inference
+SPEAKER_DIARIZATION = "text"  # Options: text (classifier on transcript), acoustic (voice clustering)
+
+# Acoustic diarization settings
+DIARIZATION_FRAME_MS = 25
+DIARIZATION_HOP_MS = 10
+DIARIZATION_NUM_MFCC = 13  # Coefficients per frame, excluding c0
+DIARIZATION_CONFIDENCE_THRESHOLD = 0.55  # Relative closeness to the assigned voice (0.5 to 1)
 
 # Export settings
-EXPORT_FORMATS = ["txt", "csv", "json"]
+EXPORT_FORMATS = ["txt", "csv", "json", "jsonl", "parquet"]
+EXPORT_CHUNK_SIZE = 10000  # Segments per Parquet row group and progress update
+EXPORT_DATASET_DIR = OUTPUT_DIR / "dataset"  # Partitioned Parquet dataset for bulk analytics
+
+# Artifact cache settings
+PIPELINE_VERSION = "3"  # Bump when a stage's output format or algorithm changes
+ARTIFACT_CACHE_ENABLED = True
+ARTIFACT_CACHE_DIR = TEMP_DIR / "cache"
+ARTIFACT_CACHE_MAX_SIZE = 2 * 1024 * 1024 * 1024  # 2GB in bytes
+
+# Decoded audio settings
+AUDIO_STORE_DIR = TEMP_DIR / "audio"
+AUDIO_STORE_MAX_SIZE = 4 * 1024 * 1024 * 1024  # 4GB in bytes, about 18 hours of audio
+PEAK_BUCKET_SAMPLES = 64  # Samples per finest waveform peak bucket (4 ms at 16 kHz)
+
+# Checkpoint settings
+CHECKPOINT_ENABLED = False  # Persist job progress so interrupted runs resume; decodes in windows, so opt-in
+CHECKPOINT_DIR = TEMP_DIR / "jobs"
+CHECKPOINT_WINDOW_SECONDS = 120  # Audio transcribed between checkpoints
+CHECKPOINT_INTERVAL_SECONDS = 10  # Minimum time between classification checkpoints
+CHECKPOINT_PROMPT_CHARS = 800  # Previous text carried into the next window as decoder prompt
+CHECKPOINT_MAX_AGE = 7 * 24 * 3600  # Abandoned job state is deleted after this (seconds)
+
+# Metrics settings
+METRICS_SINK = "jsonl"  # Options: jsonl, prometheus, None
+METRICS_DIR = OUTPUT_DIR
+
+# GUI settings
+GUI_CONCURRENT_JOBS = 2  # Queued recordings processed at the same time; models are shared
 
 # Performance settings
 BATCH_SIZE = 16
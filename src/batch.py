@@ -0,0 +1,315 @@
+"""
+Headless batch entry point for the Sales Conversation Transcription System.
+
+Processes many recordings across a pool of worker processes, each holding
+its own warm copy of the models:
+
+    python src/batch.py "calls/2024-*/*.wav" -o exports/ --format json
+    python src/batch.py "calls/2024-*/*.wav" --dataset exports/dataset
+"""
+
+import os
+import sys
+import glob
+import time
+import hashlib
+import signal
+import argparse
+import multiprocessing
+from pathlib import Path
+from datetime import date
+from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from config import OUTPUT_DIR, NUM_WORKERS, EXPORT_FORMATS, SUPPORTED_FORMATS, EXPORT_DATASET_DIR
+
+# Pipeline held by each worker process for the lifetime of the pool
+_pipeline = None
+
+class FileTimeoutError(Exception):
+    """Raised when a single file exceeds its processing time limit."""
+
+def _init_worker(num_threads: int):
+    """Load models once per worker process."""
+    from src.transcription import TranscriptionPipeline
+    from src.transcription.model_registry import set_inference_threads
+
+    global _pipeline
+    set_inference_threads(num_threads)
+    _pipeline = TranscriptionPipeline()
+
+def _on_timeout(signum, frame):
+    raise FileTimeoutError("Processing timed out")
+
+def _process_file(audio_path: Path, output_path: Path, format: str,
+                  timeout: Optional[float], compression: Optional[str] = None,
+                  dataset_dir: Optional[Path] = None) -> Dict:
+    """
+    Process and export a single file inside a worker process.
+
+    Args:
+        audio_path: Path to the recording
+        output_path: Path of the export to write
+        format: Export format
+        timeout: Per-file limit in seconds, enforced where SIGALRM exists
+        compression: Compression for text exports
+        dataset_dir: Append to this Parquet dataset instead of writing an export
+
+    Returns:
+        Dictionary describing the outcome
+    """
+    from src.utils.export_utils import export_transcript, export_to_dataset
+
+    start_time = time.perf_counter()
+    use_alarm = bool(timeout) and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    try:
+        results = _pipeline.process(audio_path)
+
+        if dataset_dir is not None:
+            export_to_dataset(results, dataset_dir, call_id_for(audio_path), dataset_partition_for(audio_path))
+        else:
+            # Write to a partial file first so resume never sees a truncated export
+            partial_path = output_path.with_name(output_path.name + ".part")
+            export_transcript(results, partial_path, format, compression)
+            os.replace(partial_path, output_path)
+
+        return {
+            "file": str(audio_path),
+            "status": "ok",
+            "seconds": time.perf_counter() - start_time,
+            "audio_seconds": results["duration"],
+            "cascade": results.get("cascade")
+        }
+
+    except FileTimeoutError as e:
+        status, error = "timeout", str(e)
+    except Exception as e:
+        status, error = "failed", str(e)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+    return {
+        "file": str(audio_path),
+        "status": status,
+        "error": error,
+        "seconds": time.perf_counter() - start_time,
+        "audio_seconds": 0.0
+    }
+
+def collect_inputs(patterns: List[str]) -> List[Path]:
+    """
+    Expand input globs into a sorted list of supported audio files.
+
+    Args:
+        patterns: Glob patterns, files or directories
+
+    Returns:
+        Unique audio file paths
+    """
+    files = set()
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            candidates = path.rglob("*")
+        else:
+            candidates = (Path(p) for p in glob.glob(pattern, recursive=True))
+        for candidate in candidates:
+            if candidate.is_file() and candidate.suffix.lower() in SUPPORTED_FORMATS:
+                files.add(candidate.resolve())
+    return sorted(files)
+
+def call_id_for(audio_path: Path) -> str:
+    """
+    Get the name a recording's export and dataset rows are stored under.
+
+    The file name alone is not unique when inputs come from several
+    directories, so a short hash of the resolved path is appended.
+
+    Args:
+        audio_path: Path to the recording
+
+    Returns:
+        The file stem followed by eight hex digits
+    """
+    digest = hashlib.sha256(str(Path(audio_path).resolve()).encode("utf-8")).hexdigest()
+    return f"{Path(audio_path).stem}-{digest[:8]}"
+
+def output_path_for(audio_path: Path, output_dir: Path, format: str,
+                    compression: Optional[str] = None) -> Path:
+    """Get the export path for a recording."""
+    suffix = {"gzip": ".gz", "zstd": ".zst"}.get(compression, "") if format != "parquet" else ""
+    return output_dir / f"{call_id_for(audio_path)}.{format}{suffix}"
+
+def dataset_partition_for(audio_path: Path) -> str:
+    """Get a recording's dataset partition: the date it was last modified."""
+    return date.fromtimestamp(audio_path.stat().st_mtime).isoformat()
+
+def run_batch(inputs: List[Path], output_dir: Path, format: str = "json",
+              workers: int = NUM_WORKERS, timeout: Optional[float] = None,
+              resume: bool = True, compression: Optional[str] = None,
+              dataset_dir: Optional[Path] = None) -> Dict:
+    """
+    Process recordings across a pool of worker processes.
+
+    Args:
+        inputs: Audio files to process
+        output_dir: Directory for exports
+        format: Export format
+        workers: Number of worker processes
+        timeout: Per-file limit in seconds
+        resume: Skip files whose export already exists
+        compression: Compression for text exports
+        dataset_dir: Append every call to this partitioned Parquet dataset
+            instead of writing one export per file
+
+    Returns:
+        Summary of the run
+    """
+    from src.utils.export_utils import dataset_path_for
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    pending = []
+    skipped = 0
+    for audio_path in inputs:
+        if dataset_dir is not None:
+            output_path = dataset_path_for(dataset_dir, call_id_for(audio_path), dataset_partition_for(audio_path))
+        else:
+            output_path = output_path_for(audio_path, output_dir, format, compression)
+        if resume and output_path.exists():
+            skipped += 1
+            continue
+        pending.append((audio_path, output_path))
+
+    outcomes = []
+    start_time = time.perf_counter()
+
+    if pending:
+        workers = max(1, min(workers, len(pending)))
+        num_threads = max(1, (os.cpu_count() or 1) // workers)
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(num_threads,)
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _process_file, audio_path, output_path, format, timeout, compression, dataset_dir
+                ): audio_path
+                for audio_path, output_path in pending
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    outcome = {
+                        "file": str(futures[future]),
+                        "status": "failed",
+                        "error": str(e),
+                        "seconds": 0.0,
+                        "audio_seconds": 0.0
+                    }
+                outcomes.append(outcome)
+                print(f"[{done}/{len(pending)}] {outcome['status']}: {outcome['file']}")
+
+    wall_time = time.perf_counter() - start_time
+    succeeded = [o for o in outcomes if o["status"] == "ok"]
+    audio_seconds = sum(o["audio_seconds"] for o in succeeded)
+
+    cascade = None
+    cascaded = [o["cascade"] for o in succeeded if o.get("cascade")]
+    if cascaded:
+        transcribed = sum(c["audio_seconds"] for c in cascaded)
+        refined = sum(c["refined_seconds"] for c in cascaded)
+        cascade = {
+            "transcribed_seconds": transcribed,
+            "refined_seconds": refined,
+            "refined_fraction": refined / transcribed if transcribed else 0.0
+        }
+
+    return {
+        "total": len(inputs),
+        "processed": len(succeeded),
+        "skipped": skipped,
+        "failed": [o for o in outcomes if o["status"] == "failed"],
+        "timed_out": [o for o in outcomes if o["status"] == "timeout"],
+        "wall_time": wall_time,
+        "audio_seconds": audio_seconds,
+        "files_per_minute": len(succeeded) * 60 / wall_time if wall_time else 0.0,
+        "realtime_factor": audio_seconds / wall_time if wall_time else 0.0,
+        "cascade": cascade
+    }
+
+def print_summary(summary: Dict):
+    """Print a human readable run summary."""
+    print("\nBatch Summary")
+    print("="*30)
+    print(f"Files found: {summary['total']}")
+    print(f"Processed: {summary['processed']}")
+    print(f"Skipped (already exported): {summary['skipped']}")
+    print(f"Failed: {len(summary['failed'])}")
+    print(f"Timed out: {len(summary['timed_out'])}")
+    print(f"Wall time: {summary['wall_time']:.1f}s")
+    print(f"Audio processed: {summary['audio_seconds']/3600:.2f}h")
+    print(f"Throughput: {summary['files_per_minute']:.2f} files/min, "
+          f"{summary['realtime_factor']:.1f}x realtime")
+    if summary.get("cascade"):
+        cascade = summary["cascade"]
+        print(f"Re-decoded by the accurate model: {cascade['refined_fraction']:.1%} "
+              f"of {cascade['transcribed_seconds']/3600:.2f}h transcribed")
+
+    for outcome in summary["failed"] + summary["timed_out"]:
+        print(f"- {outcome['status']}: {outcome['file']}: {outcome['error']}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Batch entry point."""
+    parser = argparse.ArgumentParser(description="Transcribe a batch of recordings without the GUI.")
+    parser.add_argument("inputs", nargs="+", help="Input files, directories or glob patterns")
+    parser.add_argument("-o", "--output-dir", type=Path, default=OUTPUT_DIR,
+                        help="Directory for exported transcripts")
+    parser.add_argument("-f", "--format", choices=EXPORT_FORMATS, default="json",
+                        help="Export format")
+    parser.add_argument("-c", "--compression", choices=["gzip", "zstd"], default=None,
+                        help="Compress text exports")
+    parser.add_argument("--dataset", type=Path, nargs="?", const=EXPORT_DATASET_DIR, default=None,
+                        help="Append all calls to one date-partitioned Parquet dataset")
+    parser.add_argument("-w", "--workers", type=int, default=NUM_WORKERS,
+                        help="Number of worker processes")
+    parser.add_argument("-t", "--timeout", type=float, default=None,
+                        help="Per-file timeout in seconds")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="Reprocess files that already have an export")
+    args = parser.parse_args(argv)
+
+    inputs = collect_inputs(args.inputs)
+    if not inputs:
+        print("No supported audio files found.")
+        return 1
+
+    summary = run_batch(
+        inputs,
+        args.output_dir,
+        format=args.format,
+        workers=args.workers,
+        timeout=args.timeout,
+        resume=not args.no_resume,
+        compression=args.compression,
+        dataset_dir=args.dataset
+    )
+    print_summary(summary)
+
+    return 0 if not (summary["failed"] or summary["timed_out"]) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
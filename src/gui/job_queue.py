@@ -0,0 +1,248 @@
+"""
+Queue of transcription jobs processed by a pool of worker threads.
+"""
+
+import time
+import itertools
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+from src.transcription import TranscriptionPipeline, CancellationToken, JobCancelledError
+from config import GUI_CONCURRENT_JOBS
+
+PRIORITY_LOW = 0
+PRIORITY_NORMAL = 1
+PRIORITY_HIGH = 2
+PRIORITY_NAMES = {PRIORITY_HIGH: "High", PRIORITY_NORMAL: "Normal", PRIORITY_LOW: "Low"}
+
+class TranscriptionWorker(QThread):
+    """Worker thread for handling transcription processing."""
+    progress = pyqtSignal(float)
+    # Results hold a SegmentStore; passing the object avoids a QVariantMap copy
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, audio_path: Path):
+        super().__init__()
+        self.audio_path = audio_path
+        self.pipeline = None
+        self.cancel_token = CancellationToken()
+
+    def cancel(self):
+        """Stop processing at the next decoding window or batch."""
+        self.cancel_token.cancel()
+
+    def run(self):
+        try:
+            # Models come from the shared registry, so only the first job loads them
+            self.pipeline = TranscriptionPipeline()
+            results = self.pipeline.process(
+                self.audio_path,
+                progress_callback=self.progress.emit,
+                cancel_token=self.cancel_token
+            )
+            self.finished.emit(results)
+
+        except JobCancelledError:
+            self.cancelled.emit()
+        except Exception as e:
+            self.error.emit(str(e))
+
+class Job:
+    """A queued recording with its state, timings and results."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    def __init__(self, job_id: int, audio_path: Path, priority: int):
+        self.id = job_id
+        self.audio_path = Path(audio_path)
+        self.priority = priority
+        self.state = Job.QUEUED
+        self.progress = 0.0
+        self.results: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def active(self) -> bool:
+        """Whether the job is waiting or running."""
+        return self.state in (Job.QUEUED, Job.RUNNING)
+
+    @property
+    def wait_time(self) -> float:
+        """Seconds spent in the queue before starting."""
+        end = self.started_at or self.finished_at or time.time()
+        return end - self.submitted_at
+
+    @property
+    def run_time(self) -> Optional[float]:
+        """Seconds spent processing, or None if the job never started."""
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+class JobQueue(QObject):
+    """
+    Runs queued jobs in priority order on up to max_concurrent workers.
+
+    Workers share the process-wide model registry, so models load once.
+    Jobs of equal priority run in submission order.
+    """
+    job_added = pyqtSignal(int)
+    job_changed = pyqtSignal(int)
+    job_removed = pyqtSignal(int)
+    job_finished = pyqtSignal(int)
+
+    def __init__(self, max_concurrent: int = GUI_CONCURRENT_JOBS, parent=None):
+        """
+        Initialize the queue.
+
+        Args:
+            max_concurrent: Number of jobs processed at the same time
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.max_concurrent = max(1, max_concurrent)
+        self.paused = False
+        self.jobs: Dict[int, Job] = {}
+        self._workers: Dict[int, TranscriptionWorker] = {}
+        self._ids = itertools.count(1)
+
+    def submit(self, paths: Iterable[Path], priority: int = PRIORITY_NORMAL) -> List[int]:
+        """
+        Queue recordings for processing.
+
+        Args:
+            paths: Audio files to process
+            priority: PRIORITY_HIGH, PRIORITY_NORMAL or PRIORITY_LOW
+
+        Returns:
+            IDs of the new jobs
+        """
+        job_ids = []
+        for path in paths:
+            job = Job(next(self._ids), path, priority)
+            self.jobs[job.id] = job
+            job_ids.append(job.id)
+            self.job_added.emit(job.id)
+        self._schedule()
+        return job_ids
+
+    def set_priority(self, job_id: int, priority: int):
+        """Change the priority of a job that has not started yet."""
+        job = self.jobs.get(job_id)
+        if job is not None and job.state == Job.QUEUED:
+            job.priority = priority
+            self.job_changed.emit(job_id)
+
+    def cancel(self, job_id: int):
+        """Cancel a queued job, or stop a running one at its next checkpoint."""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return
+        if job.state == Job.QUEUED:
+            self._finish(job, Job.CANCELLED)
+        elif job.state == Job.RUNNING:
+            self._workers[job_id].cancel()
+
+    def remove(self, job_id: int):
+        """Forget a finished job and its results."""
+        job = self.jobs.get(job_id)
+        if job is not None and not job.active:
+            del self.jobs[job_id]
+            self.job_removed.emit(job_id)
+
+    def clear_finished(self):
+        """Forget all finished jobs."""
+        for job_id in [job.id for job in self.jobs.values() if not job.active]:
+            self.remove(job_id)
+
+    def set_max_concurrent(self, count: int):
+        """Change the number of concurrent workers; running jobs are not interrupted."""
+        self.max_concurrent = max(1, count)
+        self._schedule()
+
+    def set_paused(self, paused: bool):
+        """Hold queued jobs, e.g. until the models are loaded."""
+        self.paused = paused
+        self._schedule()
+
+    def cancel_all(self):
+        """Cancel every queued and running job."""
+        for job_id in [job.id for job in self.jobs.values() if job.active]:
+            self.cancel(job_id)
+
+    def shutdown(self):
+        """Cancel all jobs and wait for running workers to stop."""
+        self.paused = True
+        self.cancel_all()
+        for worker in list(self._workers.values()):
+            worker.wait()
+
+    def running_count(self) -> int:
+        """Get the number of jobs being processed."""
+        return len(self._workers)
+
+    def _schedule(self):
+        """Start the highest priority queued jobs while workers are free."""
+        while not self.paused and len(self._workers) < self.max_concurrent:
+            queued = [job for job in self.jobs.values() if job.state == Job.QUEUED]
+            if not queued:
+                return
+            job = min(queued, key=lambda job: (-job.priority, job.id))
+            self._start(job)
+
+    def _start(self, job: Job):
+        """Run a job on a new worker thread."""
+        worker = TranscriptionWorker(job.audio_path)
+        worker.progress.connect(lambda value, job_id=job.id: self._on_progress(job_id, value))
+        worker.finished.connect(lambda results, job_id=job.id: self._on_done(job_id, results))
+        worker.error.connect(lambda error, job_id=job.id: self._on_error(job_id, error))
+        worker.cancelled.connect(lambda job_id=job.id: self._on_cancelled(job_id))
+
+        job.state = Job.RUNNING
+        job.started_at = time.time()
+        self._workers[job.id] = worker
+        worker.start()
+        self.job_changed.emit(job.id)
+
+    def _on_progress(self, job_id: int, value: float):
+        job = self.jobs[job_id]
+        job.progress = value
+        self.job_changed.emit(job_id)
+
+    def _on_done(self, job_id: int, results: Dict):
+        job = self.jobs[job_id]
+        job.results = results
+        job.progress = 100.0
+        self._finish(job, Job.DONE)
+
+    def _on_error(self, job_id: int, error: str):
+        job = self.jobs[job_id]
+        job.error = error
+        self._finish(job, Job.FAILED)
+
+    def _on_cancelled(self, job_id: int):
+        self._finish(self.jobs[job_id], Job.CANCELLED)
+
+    def _finish(self, job: Job, state: str):
+        """Record a job's outcome and start the next one."""
+        job.state = state
+        job.finished_at = time.time()
+
+        worker = self._workers.pop(job.id, None)
+        if worker is not None:
+            # The outcome signal is the last thing run() does; let the thread exit
+            worker.wait()
+
+        self.job_changed.emit(job.id)
+        self.job_finished.emit(job.id)
+        self._schedule()
@@ -4,68 +4,76 @@ Main application window for the Sales Conversation Transcription System.
 
 import sys
 from pathlib import Path
+from typing import Optional
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLabel, QFileDialog, QProgressBar,
+    QPushButton, QLabel, QFileDialog, QSplitter,
     QStatusBar, QMessageBox
 )
 from PyQt6.QtCore import Qt, QThread, pyqtSignal
 
-from src.transcription import AudioTranscriber, AudioProcessor, SpeakerClassifier
+from src.transcription import (
+    AudioTranscriber, SpeakerClassifier, CancellationToken,
+    StreamingTranscriber, GrowingFileSource, MicrophoneSource, set_inference_threads
+)
 from src.gui.transcription_view import TranscriptionView
 from src.gui.timeline_view import TimelineView
-from config import SUPPORTED_FORMATS
+from src.gui.job_queue import Job, JobQueue
+from src.gui.queue_view import QueueView
+from config import SUPPORTED_FORMATS, SPEAKER_DIARIZATION, get_device
+
+class ModelWarmupWorker(QThread):
+    """Worker thread that loads the shared models in the background."""
+    ready = pyqtSignal(str)
+    failed = pyqtSignal(str)
+    
+    def run(self):
+        try:
+            # Importing torch and loading models is slow; keep it off the UI thread
+            set_inference_threads()
+            device = get_device()
+            AudioTranscriber()
+            if SPEAKER_DIARIZATION == "text":
+                SpeakerClassifier()
+            self.ready.emit(device)
+            
+        except Exception as e:
+            self.failed.emit(str(e))
 
-class TranscriptionWorker(QThread):
-    """Worker thread for handling transcription processing."""
-    progress = pyqtSignal(float)
-    finished = pyqtSignal(dict)
+class LiveTranscriptionWorker(QThread):
+    """Worker thread that transcribes a live source until stopped."""
+    segments_ready = pyqtSignal(object, float)
     error = pyqtSignal(str)
     
-    def __init__(self, audio_path: Path):
+    def __init__(self, audio_path: Optional[Path] = None):
+        """
+        Args:
+            audio_path: File being recorded to follow; the microphone if omitted
+        """
         super().__init__()
         self.audio_path = audio_path
-        self.transcriber = AudioTranscriber()
-        self.processor = AudioProcessor()
-        self.classifier = SpeakerClassifier()
-        
+        self.cancel_token = CancellationToken()
+    
+    def stop(self):
+        """Stop after committing the remaining audio."""
+        self.cancel_token.cancel()
+    
     def run(self):
         try:
-            # Validate file
-            valid, error = self.processor.validate_file(self.audio_path)
-            if not valid:
-                self.error.emit(error)
-                return
-                
-            # Preprocess audio
-            processed_path = self.processor.preprocess_audio(self.audio_path)
-            
-            # Transcribe audio
-            transcription = self.transcriber.transcribe(processed_path)
-            
-            # Classify speakers
-            segments = self.classifier.classify_segments(transcription["segments"])
-            
-            # Detect overlaps
-            segments = self.classifier.detect_speaker_overlap(segments)
-            
-            # Get statistics
-            stats = self.classifier.get_speaker_statistics(segments)
-            
-            # Prepare results
-            results = {
-                "segments": segments,
-                "statistics": stats,
-                "language": transcription["language"],
-                "duration": transcription["duration"]
-            }
-            
-            self.finished.emit(results)
+            if self.audio_path:
+                source = GrowingFileSource(self.audio_path)
+            else:
+                source = MicrophoneSource()
             
+            streamer = StreamingTranscriber()
+            streamer.run(
+                source,
+                lambda segments: self.segments_ready.emit(segments, streamer.duration),
+                self.cancel_token
+            )
+        
         except Exception as e:
             self.error.emit(str(e))
-        finally:
-            self.processor.cleanup()
 
 class MainWindow(QMainWindow):
     """Main application window."""
@@ -75,12 +83,29 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Sales Conversation Transcription System")
         self.setMinimumSize(1024, 768)
         
+        # Jobs wait in the queue until the models are loaded
+        self.job_queue = JobQueue(parent=self)
+        self.job_queue.set_paused(True)
+        self.job_queue.job_finished.connect(self._job_finished)
+        self.job_queue.job_removed.connect(self._job_removed)
+        
         # Initialize UI
         self._init_ui()
+        self.setAcceptDrops(True)
         
         # Initialize state
         self.current_file = None
-        self.worker = None
+        self.selected_files = []
+        self.displayed_job = None
+        self.live_worker = None
+        self.models_ready = False
+        
+        # Load models in the background so the window appears immediately
+        self.status_bar.showMessage("Loading models...")
+        self.warmup_worker = ModelWarmupWorker()
+        self.warmup_worker.ready.connect(self._models_ready)
+        self.warmup_worker.failed.connect(self._models_failed)
+        self.warmup_worker.start()
         
     def _init_ui(self):
         """Initialize the user interface."""
@@ -94,27 +119,42 @@ class MainWindow(QMainWindow):
         layout.addLayout(toolbar)
         
         # Add file selection button
-        self.file_btn = QPushButton("Select Audio File")
+        self.file_btn = QPushButton("Select Audio Files")
         self.file_btn.clicked.connect(self._select_file)
         toolbar.addWidget(self.file_btn)
         
         # Add process button
-        self.process_btn = QPushButton("Process")
+        self.process_btn = QPushButton("Add to Queue")
         self.process_btn.clicked.connect(self._start_processing)
         self.process_btn.setEnabled(False)
         toolbar.addWidget(self.process_btn)
         
-        # Add progress bar
-        self.progress_bar = QProgressBar()
-        self.progress_bar.setRange(0, 100)
-        self.progress_bar.hide()
-        toolbar.addWidget(self.progress_bar)
+        # Add live transcription button
+        self.live_btn = QPushButton("Go Live")
+        self.live_btn.setToolTip(
+            "Transcribe the microphone, or follow the selected WAV file while it is recorded"
+        )
+        self.live_btn.clicked.connect(self._toggle_live)
+        self.live_btn.setEnabled(False)
+        toolbar.addWidget(self.live_btn)
         
         toolbar.addStretch()
         
+        # Queue panel above the result views
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        layout.addWidget(splitter)
+        
+        # Add queue panel; clicking a finished job shows its results
+        self.queue_view = QueueView(self.job_queue)
+        self.queue_view.job_activated.connect(self._show_job)
+        splitter.addWidget(self.queue_view)
+        
         # Add views
-        views_layout = QHBoxLayout()
-        layout.addLayout(views_layout)
+        views = QWidget()
+        views_layout = QHBoxLayout(views)
+        views_layout.setContentsMargins(0, 0, 0, 0)
+        splitter.addWidget(views)
+        splitter.setSizes([200, 600])
         
         # Add transcription view
         self.transcription_view = TranscriptionView()
@@ -131,66 +171,155 @@ class MainWindow(QMainWindow):
     def _select_file(self):
         """Handle file selection."""
         formats = " ".join(f"*{fmt}" for fmt in SUPPORTED_FORMATS)
-        file_path, _ = QFileDialog.getOpenFileName(
+        file_paths, _ = QFileDialog.getOpenFileNames(
             self,
-            "Select Audio File",
+            "Select Audio Files",
             "",
             f"Audio Files ({formats})"
         )
         
-        if file_path:
-            self.current_file = Path(file_path)
+        if file_paths:
+            self.selected_files = [Path(file_path) for file_path in file_paths]
+            # Live mode follows the first selected recording
+            self.current_file = self.selected_files[0]
             self.process_btn.setEnabled(True)
-            self.status_bar.showMessage(f"Selected file: {self.current_file.name}")
+            if len(self.selected_files) == 1:
+                self.status_bar.showMessage(f"Selected file: {self.current_file.name}")
+            else:
+                self.status_bar.showMessage(f"Selected {len(self.selected_files)} files")
+                
+    def dragEnterEvent(self, event):
+        """Accept dragged audio files."""
+        if self._dropped_files(event):
+            event.acceptProposedAction()
+            
+    def dropEvent(self, event):
+        """Queue dropped audio files."""
+        paths = self._dropped_files(event)
+        if paths:
+            event.acceptProposedAction()
+            self._enqueue(paths)
+            
+    def _dropped_files(self, event):
+        """Get supported audio files from a drag or drop event."""
+        mime = event.mimeData()
+        if not mime.hasUrls():
+            return []
+        paths = [Path(url.toLocalFile()) for url in mime.urls() if url.isLocalFile()]
+        return [path for path in paths if path.suffix.lower() in SUPPORTED_FORMATS]
+        
+    def _models_ready(self, device):
+        """Enable processing once the models are loaded."""
+        self.models_ready = True
+        self.job_queue.set_paused(False)
+        self.live_btn.setEnabled(True)
+        self.status_bar.showMessage(f"Models ready ({device.upper()})")
+        
+    def _models_failed(self, error):
+        """Handle a failed model warm-up."""
+        # Processing stays possible; the first job will retry loading
+        self.models_ready = True
+        self.job_queue.set_paused(False)
+        self.live_btn.setEnabled(True)
+        self.status_bar.showMessage(f"Model loading failed: {error}")
             
     def _start_processing(self):
-        """Start audio processing."""
-        if not self.current_file:
+        """Queue the selected files."""
+        if self.selected_files:
+            self._enqueue(self.selected_files)
+            
+    def _enqueue(self, paths):
+        """Add recordings to the job queue at the chosen priority."""
+        self.job_queue.submit(paths, self.queue_view.priority)
+        waiting = "" if self.models_ready else " (starts once the models are loaded)"
+        self.status_bar.showMessage(f"Queued {len(paths)} file(s){waiting}")
+        
+    def _toggle_live(self):
+        """Start or stop live transcription."""
+        if self.live_worker:
+            self.live_worker.stop()
+            self.live_btn.setEnabled(False)
+            self.status_bar.showMessage("Finishing live transcription...")
             return
             
-        # Disable controls
-        self.file_btn.setEnabled(False)
-        self.process_btn.setEnabled(False)
+        # Follow the selected file if it is a recording in progress
+        audio_path = self.current_file if self.current_file and self.current_file.suffix.lower() == ".wav" else None
+        
+        self.live_btn.setText("Stop Live")
+        self.displayed_job = None
+        self.transcription_view.set_results(None)
+        self.timeline_view.set_results(None)
+        
+        self.live_worker = LiveTranscriptionWorker(audio_path)
+        self.live_worker.segments_ready.connect(self._live_segments)
+        self.live_worker.error.connect(self._processing_error)
+        self.live_worker.finished.connect(self._live_finished)
+        self.live_worker.start()
+        
+        source = audio_path.name if audio_path else "microphone"
+        self.status_bar.showMessage(f"Live transcription from {source}")
         
-        # Show progress
-        self.progress_bar.setValue(0)
-        self.progress_bar.show()
-        
-        # Create and start worker
-        self.worker = TranscriptionWorker(self.current_file)
-        self.worker.progress.connect(self._update_progress)
-        self.worker.finished.connect(self._processing_finished)
-        self.worker.error.connect(self._processing_error)
-        self.worker.start()
-        
-    def _update_progress(self, value):
-        """Update progress bar."""
-        self.progress_bar.setValue(int(value))
-        
-    def _processing_finished(self, results):
-        """Handle completed processing."""
-        # Re-enable controls
-        self.file_btn.setEnabled(True)
-        self.process_btn.setEnabled(True)
-        self.progress_bar.hide()
-        
-        # Update views
-        self.transcription_view.set_results(results)
-        self.timeline_view.set_results(results)
-        
-        # Update status
-        duration = int(results["duration"])
+    def _live_segments(self, segments, duration):
+        """Append newly committed live segments to the views."""
+        self.transcription_view.append_segments(segments, duration)
+        self.timeline_view.append_segments(segments, duration)
+        
+    def _live_finished(self):
+        """Restore controls when live transcription stops."""
+        self.live_worker = None
+        self.live_btn.setText("Go Live")
+        self.live_btn.setEnabled(True)
+        self.status_bar.showMessage("Live transcription stopped")
+        
+    def _job_finished(self, job_id):
+        """Report a finished job and show it if nothing else is displayed."""
+        job = self.job_queue.jobs[job_id]
+        if job.state == Job.DONE:
+            if self.displayed_job is None and self.live_worker is None:
+                self._show_job(job_id)
+            else:
+                self.status_bar.showMessage(f"Finished {job.audio_path.name}")
+        elif job.state == Job.FAILED:
+            self.status_bar.showMessage(f"Failed {job.audio_path.name}: {job.error}")
+        else:
+            self.status_bar.showMessage(f"Cancelled {job.audio_path.name}")
+            
+    def _job_removed(self, job_id):
+        """Clear the views when the displayed job is removed from the queue."""
+        if job_id != self.displayed_job:
+            return
+        self.displayed_job = None
+        self.transcription_view.set_results(None)
+        self.timeline_view.set_results(None)
+        self.status_bar.clearMessage()
+        
+    def _show_job(self, job_id):
+        """Load a finished job's results into the views without reprocessing."""
+        job = self.job_queue.jobs.get(job_id)
+        if job is None or job.state != Job.DONE or job_id == self.displayed_job:
+            return
+        if self.live_worker is not None:
+            self.status_bar.showMessage("Stop live transcription to view queued results")
+            return
+            
+        self.displayed_job = job_id
+        self.transcription_view.set_results(job.results)
+        self.timeline_view.set_results(job.results)
+        
+        duration = int(job.results["duration"])
         self.status_bar.showMessage(
-            f"Processing complete - Duration: {duration//60}:{duration%60:02d}"
+            f"{job.audio_path.name} - Duration: {duration//60}:{duration%60:02d}, "
+            f"processed in {job.run_time:.1f}s"
         )
         
     def _processing_error(self, error):
-        """Handle processing error."""
-        # Re-enable controls
-        self.file_btn.setEnabled(True)
-        self.process_btn.setEnabled(True)
-        self.progress_bar.hide()
-        
-        # Show error
+        """Handle a live transcription error."""
         QMessageBox.critical(self, "Error", str(error))
-        self.status_bar.showMessage("Error during processing")
\ No newline at end of file
+        
+    def closeEvent(self, event):
+        """Stop workers before the window closes."""
+        self.job_queue.shutdown()
+        if self.live_worker:
+            self.live_worker.stop()
+            self.live_worker.wait()
+        super().closeEvent(event)
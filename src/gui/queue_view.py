@@ -0,0 +1,189 @@
+"""
+Panel listing queued, running and finished transcription jobs.
+"""
+
+from typing import List, Optional
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView, QHeaderView, QAbstractItemView,
+    QPushButton, QComboBox, QSpinBox, QLabel
+)
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor
+
+from src.gui.job_queue import (
+    Job, JobQueue, PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW, PRIORITY_NAMES
+)
+
+def _format_seconds(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return ""
+    seconds = int(seconds)
+    return f"{seconds//60}:{seconds%60:02d}"
+
+class JobTableModel(QAbstractTableModel):
+    """Exposes the jobs of a JobQueue as table rows in submission order."""
+
+    COLUMNS = ["File", "Priority", "State", "Progress", "Waited", "Ran"]
+    JobIdRole = Qt.ItemDataRole.UserRole + 1
+
+    STATE_COLORS = {
+        Job.RUNNING: QColor("#E3F2FD"),
+        Job.DONE: QColor("#E8F5E9"),
+        Job.FAILED: QColor("#FFEBEE"),
+        Job.CANCELLED: QColor("#EEEEEE")
+    }
+
+    def __init__(self, queue: JobQueue, parent=None):
+        super().__init__(parent)
+        self.queue = queue
+        self._ids: List[int] = []
+        queue.job_added.connect(self._job_added)
+        queue.job_changed.connect(self._job_changed)
+        queue.job_removed.connect(self._job_removed)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        job = self.queue.jobs[self._ids[index.row()]]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return job.audio_path.name
+            if column == 1:
+                return PRIORITY_NAMES[job.priority]
+            if column == 2:
+                return job.state.title()
+            if column == 3:
+                return f"{job.progress:.0f}%"
+            if column == 4:
+                return _format_seconds(job.wait_time)
+            if column == 5:
+                return _format_seconds(job.run_time)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return job.error or str(job.audio_path)
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return self.STATE_COLORS.get(job.state)
+        if role == self.JobIdRole:
+            return job.id
+        return None
+
+    def job_id(self, row: int) -> int:
+        """Get the job shown in a row."""
+        return self._ids[row]
+
+    def refresh_times(self):
+        """Repaint the timing columns of active jobs."""
+        for row, job_id in enumerate(self._ids):
+            if self.queue.jobs[job_id].active:
+                self.dataChanged.emit(self.index(row, 4), self.index(row, 5))
+
+    def _job_added(self, job_id: int):
+        row = len(self._ids)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._ids.append(job_id)
+        self.endInsertRows()
+
+    def _job_changed(self, job_id: int):
+        row = self._ids.index(job_id)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.COLUMNS) - 1))
+
+    def _job_removed(self, job_id: int):
+        row = self._ids.index(job_id)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._ids[row]
+        self.endRemoveRows()
+
+class QueueView(QWidget):
+    """Widget for managing the job queue and opening finished jobs."""
+    job_activated = pyqtSignal(int)
+
+    def __init__(self, queue: JobQueue):
+        super().__init__()
+        self.queue = queue
+        self.model = JobTableModel(queue, self)
+        self._init_ui()
+
+        # Waiting and running times tick while jobs are active
+        self.clock = QTimer(self)
+        self.clock.setInterval(1000)
+        self.clock.timeout.connect(self.model.refresh_times)
+        self.clock.start()
+
+    def _init_ui(self):
+        """Initialize the user interface."""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        # Add toolbar
+        toolbar = QHBoxLayout()
+        layout.addLayout(toolbar)
+
+        toolbar.addWidget(QLabel("Priority:"))
+        self.priority_combo = QComboBox()
+        for priority in (PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW):
+            self.priority_combo.addItem(PRIORITY_NAMES[priority], priority)
+        self.priority_combo.setCurrentIndex(1)
+        self.priority_combo.setToolTip("Priority for new jobs and the selected queued jobs")
+        self.priority_combo.activated.connect(self._apply_priority)
+        toolbar.addWidget(self.priority_combo)
+
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.clicked.connect(self._cancel_selected)
+        toolbar.addWidget(self.cancel_btn)
+
+        self.clear_btn = QPushButton("Clear Finished")
+        self.clear_btn.clicked.connect(self.queue.clear_finished)
+        toolbar.addWidget(self.clear_btn)
+
+        toolbar.addStretch()
+
+        toolbar.addWidget(QLabel("Workers:"))
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, 8)
+        self.workers_spin.setValue(self.queue.max_concurrent)
+        self.workers_spin.valueChanged.connect(self.queue.set_max_concurrent)
+        toolbar.addWidget(self.workers_spin)
+
+        # Add job table
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.table.verticalHeader().hide()
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for column in range(1, len(JobTableModel.COLUMNS)):
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.ResizeToContents)
+        self.table.clicked.connect(lambda index: self.job_activated.emit(self.model.job_id(index.row())))
+        layout.addWidget(self.table)
+
+    @property
+    def priority(self) -> int:
+        """Priority chosen for new jobs."""
+        return self.priority_combo.currentData()
+
+    def selected_jobs(self) -> List[int]:
+        """Get the IDs of the selected jobs."""
+        rows = {index.row() for index in self.table.selectionModel().selectedRows()}
+        return [self.model.job_id(row) for row in sorted(rows)]
+
+    def _apply_priority(self):
+        for job_id in self.selected_jobs():
+            self.queue.set_priority(job_id, self.priority)
+
+    def _cancel_selected(self):
+        for job_id in self.selected_jobs():
+            self.queue.cancel(job_id)
@@ -2,90 +2,477 @@
 Widget for displaying conversation timeline.
 """
 
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QGraphicsView, QGraphicsScene
-from PyQt6.QtCore import Qt, QRectF
-from PyQt6.QtGui import QPen, QBrush, QColor
+import math
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from PyQt6.QtWidgets import QWidget, QVBoxLayout
+from PyQt6.QtCore import Qt, QRectF, QPointF, QLineF
+from PyQt6.QtGui import QPainter, QPen, QBrush, QColor, QPixmap
 
-class TimelineView(QWidget):
-    """Widget for displaying conversation timeline visualization."""
+from src.transcription.segment_store import SegmentStore
+from src.transcription.interval_index import IntervalIndex
+from src.transcription.peaks import PeakPyramid
+from src.utils.audio_store import AudioStore
+
+SPEAKERS = ["salesperson", "customer"]
+TILE_WIDTH = 512  # pixels
+TILE_HEIGHT = 100
+BASE_WIDTH = 1024  # Pixels spanning the whole call at zoom level 0
+MAX_CACHED_TILES = 128
+MIN_VIEW_SPAN = 2.0  # Deepest zoom (seconds across the widget)
+
+class SegmentLayer:
+    """
+    Speaker blocks at several levels of detail.
     
-    def __init__(self):
-        super().__init__()
-        self.results = None
-        self._init_ui()
+    Level 0 holds the segments themselves; each coarser level merges
+    same-speaker blocks separated by less than a growing gap, so zoomed-out
+    views draw a few thousand blocks instead of every segment.
+    """
+    
+    def __init__(self, segments: SegmentStore, base_gap: float = 0.5, max_blocks: int = 2000):
+        """
+        Build the levels.
         
-    def _init_ui(self):
-        """Initialize the user interface."""
-        layout = QVBoxLayout(self)
+        Args:
+            segments: Classified segments
+            base_gap: Merge gap of the first coarse level (seconds)
+            max_blocks: Stop adding levels once a level has this few blocks
+        """
+        self.base_gap = base_gap
+        self.max_blocks = max_blocks
+        self.levels: List[Tuple[float, Dict[str, np.ndarray]]] = [
+            (0.0, self._sorted(*self._blocks(segments)))
+        ]
+        self._add_levels()
+    
+    def append(self, segments: SegmentStore) -> float:
+        """
+        Add segments that start no earlier than the ones already shown.
+        
+        Live segments arrive in time order, so level 0 only gains blocks at
+        the end and each coarse level only re-merges its last block of each
+        speaker with the new ones. The cost follows the number of new
+        segments, not the length of the call. Segments that arrive out of
+        order rebuild every level.
+        
+        Args:
+            segments: Newly committed segments
+            
+        Returns:
+            Time from which the drawing changed; 0 if every tile changed
+        """
+        starts, ends, speakers, overlaps = self._blocks(segments)
+        if not len(starts):
+            return math.inf
         
-        # Create graphics view
-        self.view = QGraphicsView()
-        self.scene = QGraphicsScene()
-        self.view.setScene(self.scene)
-        layout.addWidget(self.view)
+        base = self.levels[0][1]
+        new = self._sorted(starts, ends, speakers, overlaps)
+        levels = len(self.levels)
+        if len(base["start"]) and new["start"][0] < base["start"][-1]:
+            self.levels = [(0.0, self._sorted(*(
+                np.concatenate((base[name], new[name])) for name in ("start", "end", "speaker", "overlap")
+            )))]
+            self._add_levels()
+            return 0.0
+        
+        changed = float(new["start"][0])
+        self.levels[0] = (0.0, self._splice(base, len(base["start"]), new))
+        for level, (gap, blocks) in enumerate(self.levels[1:], 1):
+            # Earlier blocks of a speaker are closed: a later block of theirs exists
+            last = blocks["last"][np.unique(new["speaker"])]
+            keep = int(last[last >= 0].min()) if (last >= 0).any() else len(blocks["start"])
+            tail = {
+                name: np.concatenate((blocks[name][keep:], new[name]))
+                for name in ("start", "end", "speaker", "overlap")
+            }
+            self.levels[level] = (gap, self._splice(blocks, keep, self._merge(tail, gap)))
+            if keep < len(blocks["start"]):
+                changed = min(changed, float(blocks["start"][keep]))
+        
+        self._add_levels()
+        # A new level changes which blocks every zoomed-out tile draws
+        return changed if len(self.levels) == levels else 0.0
+    
+    def level_for(self, seconds_per_pixel: float) -> Dict[str, np.ndarray]:
+        """Get the coarsest level whose merges are invisible at this scale."""
+        chosen = self.levels[0][1]
+        for gap, blocks in self.levels:
+            if gap <= 2 * seconds_per_pixel:
+                chosen = blocks
+        return chosen
+    
+    @staticmethod
+    def blocks_in(blocks: Dict[str, np.ndarray], start: float, end: float) -> np.ndarray:
+        """Get indices of blocks intersecting [start, end)."""
+        return blocks["index"].query(start, end)
+    
+    def _add_levels(self):
+        """Add coarse levels until the coarsest one is small enough to draw."""
+        base = self.levels[0][1]
+        duration = float(base["end"].max()) if len(base["end"]) else 0.0
+        gap = self.levels[-1][0] * 4 if len(self.levels) > 1 else self.base_gap
+        while len(self.levels[-1][1]["start"]) > self.max_blocks and gap < duration:
+            self.levels.append((gap, self._merge(base, gap)))
+            gap *= 4
+    
+    @staticmethod
+    def _blocks(segments: SegmentStore) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Get the start, end, lane and overlap flag of segments shown on a lane."""
+        # Map the store's speaker ids onto timeline lanes
+        lanes = np.array([
+            SPEAKERS.index(label) if label in SPEAKERS else -1 for label in segments.speakers
+        ] + [-1], dtype=np.int8)[segments.speaker]
+        shown = lanes >= 0
+        return (
+            segments.start[shown],
+            segments.end[shown],
+            lanes[shown],
+            ~np.isnan(segments.overlap_duration[shown])
+        )
+    
+    @staticmethod
+    def _last_blocks(speakers: np.ndarray) -> np.ndarray:
+        """Get the position of each lane's last block, or -1."""
+        last = np.full(len(SPEAKERS), -1, dtype=np.int64)
+        for code in range(len(SPEAKERS)):
+            found = np.flatnonzero(speakers == code)
+            if len(found):
+                last[code] = found[-1]
+        return last
+    
+    @staticmethod
+    def _sorted(starts, ends, speakers, overlaps) -> Dict[str, np.ndarray]:
+        order = np.argsort(starts, kind="stable")
+        return {
+            "start": starts[order],
+            "end": ends[order],
+            "speaker": speakers[order],
+            "overlap": overlaps[order],
+            "index": IntervalIndex(starts[order], ends[order]),
+            "last": SegmentLayer._last_blocks(speakers[order])
+        }
+    
+    @staticmethod
+    def _splice(blocks: Dict[str, np.ndarray], keep: int, tail: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Replace the blocks after the first `keep` with sorted blocks starting no earlier."""
+        last = np.where(tail["last"] >= 0, tail["last"] + keep, blocks["last"])
+        return {
+            **{
+                name: np.concatenate((blocks[name][:keep], tail[name]))
+                for name in ("start", "end", "speaker", "overlap")
+            },
+            "index": blocks["index"].splice(keep, tail["start"], tail["end"]),
+            "last": last
+        }
+    
+    @classmethod
+    def _merge(cls, blocks: Dict[str, np.ndarray], gap: float) -> Dict[str, np.ndarray]:
+        """Merge same-speaker blocks separated by at most `gap` seconds."""
+        merged = []
+        for code in range(len(SPEAKERS)):
+            mask = blocks["speaker"] == code
+            starts, ends, overlaps = blocks["start"][mask], blocks["end"][mask], blocks["overlap"][mask]
+            if not len(starts):
+                continue
+            reach = np.maximum.accumulate(ends)
+            boundaries = np.flatnonzero(starts[1:] > reach[:-1] + gap) + 1
+            groups = np.concatenate(([0], boundaries))
+            merged.append((
+                starts[groups],
+                np.maximum.reduceat(ends, groups),
+                np.full(len(groups), code, dtype=np.int8),
+                np.logical_or.reduceat(overlaps, groups)
+            ))
+        if not merged:
+            return cls._sorted(blocks["start"], blocks["end"], blocks["speaker"], blocks["overlap"])
+        return cls._sorted(*(np.concatenate(parts) for parts in zip(*merged)))
+
+class TimelineCanvas(QWidget):
+    """Paints the timeline from cached tiles; supports wheel zoom and drag to pan."""
+    
+    def __init__(self):
+        super().__init__()
+        self.layer: Optional[SegmentLayer] = None
+        self.peaks: Optional[PeakPyramid] = None
+        self.duration = 0.0
+        # Seconds the zoom level 0 tiles span; live calls grow into it
+        self._grid_span = 0.0
+        self.view_start = 0.0
+        self.view_span = 0.0
+        self._tiles: "OrderedDict[Tuple[int, int], QPixmap]" = OrderedDict()
+        self._drag_x: Optional[float] = None
+        self.setMinimumHeight(TILE_HEIGHT)
         
         # Set up colors
         self.colors = {
             "salesperson": QColor("#4CAF50"),
             "customer": QColor("#2196F3")
         }
+        self.waveform_color = QColor("#CFD8DC")
+    
+    def set_peaks(self, peaks: Optional[PeakPyramid]):
+        """
+        Show a waveform behind the speaker lanes.
         
-    def set_results(self, results):
+        Args:
+            peaks: Peak pyramid of the recording, or None to hide the waveform
         """
-        Set and display timeline results.
+        self.peaks = peaks
+        self._tiles.clear()
+        self.update()
+    
+    def set_layer(self, layer: Optional[SegmentLayer], duration: float, keep_view: bool = False):
+        """
+        Show a new segment layer.
         
         Args:
-            results: Dictionary containing transcription results
+            layer: Segment layer, or None to clear
+            duration: Length of the recording in seconds
+            keep_view: Keep the current zoom, e.g. when live segments arrive
         """
-        self.results = results
-        self._update_display()
+        self.layer = layer
+        self._grid_span = duration
+        self._tiles.clear()
+        self._set_duration(duration, keep_view)
+    
+    def extend_layer(self, duration: float, changed: float):
+        """
+        Redraw after segments were appended to the current layer.
+        
+        The tile grid only changes when the call outgrows it, and then
+        doubles, so cached tiles stay valid and only those reaching past
+        `changed` are drawn again.
+        
+        Args:
+            duration: Length of the recording so far in seconds
+            changed: Time from which the layer's drawing changed
+        """
+        if self._grid_span <= 0:
+            self._grid_span = duration
+        while self._grid_span < duration:
+            self._grid_span *= 2
+            # Level n of the old grid is level n + 1 of the doubled one
+            self._tiles = OrderedDict(
+                ((level + 1, tile), pixmap) for (level, tile), pixmap in self._tiles.items()
+            )
+        
+        grid_spp = self._grid_span / BASE_WIDTH
+        stale = [
+            (level, tile) for level, tile in self._tiles
+            if (tile + 1) * TILE_WIDTH * grid_spp / 2 ** level > changed
+        ]
+        for key in stale:
+            del self._tiles[key]
+        self._set_duration(duration, keep_view=True)
+    
+    def _set_duration(self, duration: float, keep_view: bool):
+        """Update the call length and reset or follow the view."""
+        following = self.view_start + self.view_span >= self.duration - 1e-6
+        previous_duration = self.duration
+        self.duration = duration
         
-    def _update_display(self):
-        """Update the timeline display."""
-        if not self.results:
+        if not keep_view or not self.view_span or self.view_span >= previous_duration:
+            self.view_start, self.view_span = 0.0, duration
+        elif following:
+            # Keep the live edge in view
+            self.view_start = max(0.0, duration - self.view_span)
+        self.update()
+    
+    def zoom(self, factor: float, anchor_x: Optional[float] = None):
+        """
+        Zoom around a point.
+        
+        Args:
+            factor: Values above 1 zoom in
+            anchor_x: Widget x coordinate kept fixed; the centre if omitted
+        """
+        if not self.duration:
+            return
+        if anchor_x is None:
+            anchor_x = self.width() / 2
+        anchor_time = self.view_start + anchor_x / self.width() * self.view_span
+        span = min(self.duration, max(MIN_VIEW_SPAN, self.view_span / factor))
+        self.view_start = anchor_time - anchor_x / self.width() * span
+        self.view_span = span
+        self._clamp()
+        self.update()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), Qt.GlobalColor.white)
+        if not self.layer or not self.duration or not self.view_span:
             return
-            
-        self.scene.clear()
         
-        # Calculate dimensions
-        duration = self.results["duration"]
-        height = 100
-        width = max(self.width() - 20, 600)
-        scale = width / duration
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        seconds_per_pixel = self.view_span / self.width()
+        
+        # Tiles at the nearest finer level are scaled down, so resizes and
+        # zoom steps between levels only rescale cached pixmaps; level 0 is
+        # at least as fine as BASE_WIDTH across the call
+        grid_spp = self._grid_span / BASE_WIDTH
+        finest = min(seconds_per_pixel, self.duration / BASE_WIDTH)
+        level = max(0, math.ceil(math.log2(grid_spp / finest) - 1e-9))
+        tile_spp = grid_spp / 2 ** level
+        tile_span = TILE_WIDTH * tile_spp
+        
+        view_end = self.view_start + self.view_span
+        y_scale = self.height() / TILE_HEIGHT
+        for tile in range(int(self.view_start // tile_span), int(view_end // tile_span) + 1):
+            tile_start = tile * tile_span
+            target = QRectF(
+                (tile_start - self.view_start) / seconds_per_pixel, 0,
+                tile_span / seconds_per_pixel, TILE_HEIGHT * y_scale
+            )
+            painter.drawPixmap(target, self._tile(level, tile, tile_spp), QRectF(0, 0, TILE_WIDTH, TILE_HEIGHT))
+    
+    def wheelEvent(self, event):
+        steps = event.angleDelta().y() / 120
+        self.zoom(1.25 ** steps, event.position().x())
+    
+    def mousePressEvent(self, event):
+        self._drag_x = event.position().x()
+    
+    def mouseMoveEvent(self, event):
+        if self._drag_x is None or not self.duration:
+            return
+        x = event.position().x()
+        self.view_start -= (x - self._drag_x) * self.view_span / self.width()
+        self._drag_x = x
+        self._clamp()
+        self.update()
+    
+    def mouseReleaseEvent(self, event):
+        self._drag_x = None
+    
+    def mouseDoubleClickEvent(self, event):
+        """Reset to the whole call."""
+        self.view_start, self.view_span = 0.0, self.duration
+        self.update()
+    
+    def _clamp(self):
+        self.view_start = min(max(0.0, self.view_start), max(0.0, self.duration - self.view_span))
+    
+    def _tile(self, level: int, tile: int, seconds_per_pixel: float) -> QPixmap:
+        """Get a cached tile, rendering it on first use."""
+        key = (level, tile)
+        pixmap = self._tiles.get(key)
+        if pixmap is not None:
+            self._tiles.move_to_end(key)
+            return pixmap
+        
+        pixmap = self._render_tile(tile * TILE_WIDTH * seconds_per_pixel, seconds_per_pixel)
+        self._tiles[key] = pixmap
+        if len(self._tiles) > MAX_CACHED_TILES:
+            self._tiles.popitem(last=False)
+        return pixmap
+    
+    def _render_tile(self, start: float, seconds_per_pixel: float) -> QPixmap:
+        """Draw the waveform and blocks of one tile."""
+        pixmap = QPixmap(TILE_WIDTH, TILE_HEIGHT)
+        pixmap.fill(Qt.GlobalColor.white)
+        painter = QPainter(pixmap)
+        height = TILE_HEIGHT
+        end = start + TILE_WIDTH * seconds_per_pixel
+        
+        # Draw waveform from about one peak bucket per pixel
+        if self.peaks is not None:
+            mins, maxs = self.peaks.envelope(start, end, TILE_WIDTH)
+            shown = np.flatnonzero(~np.isnan(maxs))
+            tops = (height/2 - maxs[shown] * 0.45 * height).tolist()
+            bottoms = (height/2 - mins[shown] * 0.45 * height).tolist()
+            painter.setPen(QPen(self.waveform_color))
+            painter.drawLines([
+                QLineF(x + 0.5, top, x + 0.5, bottom)
+                for x, top, bottom in zip(shown.tolist(), tops, bottoms)
+            ])
         
         # Draw timeline base
-        self.scene.addLine(0, height/2, width, height/2, QPen(Qt.GlobalColor.gray))
+        painter.setPen(QPen(Qt.GlobalColor.gray))
+        painter.drawLine(QPointF(0, height/2), QPointF(TILE_WIDTH, height/2))
         
-        # Draw segments
-        for segment in self.results["segments"]:
-            if "speaker" not in segment:
-                continue
-                
-            x = segment["start"] * scale
-            w = (segment["end"] - segment["start"]) * scale
-            y = height/4 if segment["speaker"] == "salesperson" else height/2
+        blocks = self.layer.level_for(seconds_per_pixel)
+        for i in SegmentLayer.blocks_in(blocks, start, end):
+            speaker = SPEAKERS[blocks["speaker"][i]]
+            x = (blocks["start"][i] - start) / seconds_per_pixel
+            w = max(1.0, (blocks["end"][i] - blocks["start"][i]) / seconds_per_pixel)
+            y = height/4 if speaker == "salesperson" else height/2
             
             # Draw segment block
-            rect = self.scene.addRect(
-                x, y, w, height/4,
-                QPen(self.colors[segment["speaker"]]),
-                QBrush(self.colors[segment["speaker"]].lighter())
-            )
+            painter.setPen(QPen(self.colors[speaker]))
+            painter.setBrush(QBrush(self.colors[speaker].lighter()))
+            painter.drawRect(QRectF(x, y, w, height/4))
             
             # Add overlap indicator if present
-            if "overlap" in segment:
-                self.scene.addRect(
-                    x + w - 5, y, 5, height/4,
-                    QPen(Qt.GlobalColor.red),
-                    QBrush(Qt.GlobalColor.red)
-                )
-                
-        # Update view
-        self.view.setSceneRect(QRectF(0, 0, width, height))
-        self.view.fitInView(self.scene.sceneRect(), Qt.AspectRatioMode.KeepAspectRatio)
-        
-    def resizeEvent(self, event):
-        """Handle resize events."""
-        super().resizeEvent(event)
-        if self.results:
-            self._update_display()
\ No newline at end of file
+            if blocks["overlap"][i]:
+                painter.setPen(QPen(Qt.GlobalColor.red))
+                painter.setBrush(QBrush(Qt.GlobalColor.red))
+                painter.drawRect(QRectF(x + w - min(5.0, w), y, min(5.0, w), height/4))
+        
+        painter.end()
+        return pixmap
+
+class TimelineView(QWidget):
+    """Widget for displaying conversation timeline visualization."""
+    
+    def __init__(self):
+        super().__init__()
+        self.results = None
+        self._init_ui()
+    
+    def _init_ui(self):
+        """Initialize the user interface."""
+        layout = QVBoxLayout(self)
+        
+        # Create timeline canvas; scroll to zoom, drag to pan, double-click to reset
+        self.canvas = TimelineCanvas()
+        self.canvas.setToolTip("Scroll to zoom, drag to pan, double-click to show the whole call")
+        layout.addWidget(self.canvas)
+    
+    def set_results(self, results):
+        """
+        Set and display timeline results.
+        
+        Args:
+            results: Dictionary containing transcription results
+        """
+        self.results = results
+        
+        # Waveform peaks were saved next to the decoded audio during preprocessing
+        peaks = None
+        if results and results.get("audio_key"):
+            peaks = PeakPyramid.load(AudioStore().sidecar(results["audio_key"], "peaks.npz"))
+        self.canvas.set_peaks(peaks)
+        self._update_display()
+    
+    def append_segments(self, segments, duration):
+        """
+        Add live segments to the timeline.
+        
+        Args:
+            segments: Newly committed segments
+            duration: Seconds of audio received so far
+        """
+        if self.results is None:
+            self.results = {"segments": SegmentStore(), "statistics": {}, "language": None, "duration": 0}
+        segments = SegmentStore.from_dicts(segments)
+        self.results["segments"] = SegmentStore.from_dicts(self.results["segments"])
+        self.results["segments"].extend(segments)
+        self.results["duration"] = duration
+        
+        # Only the new blocks are merged and only tiles they reach are redrawn
+        if self.canvas.layer is None or not duration:
+            self._update_display(keep_view=True)
+        else:
+            self.canvas.extend_layer(duration, self.canvas.layer.append(segments))
+    
+    def _update_display(self, keep_view=False):
+        """Build the segment layer; drawing happens lazily per visible tile."""
+        if not self.results or not self.results["duration"]:
+            self.canvas.set_layer(None, 0.0)
+            return
+        
+        self.results["segments"] = SegmentStore.from_dicts(self.results["segments"])
+        layer = SegmentLayer(self.results["segments"])
+        self.canvas.set_layer(layer, self.results["duration"], keep_view)
@@ -0,0 +1,157 @@
+"""
+List model for transcript segments.
+"""
+
+import numpy as np
+from typing import List, Optional, Set
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt6.QtGui import QColor
+
+from src.transcription.segment_store import SegmentStore
+
+class TranscriptModel(QAbstractListModel):
+    """
+    Exposes transcript segments as rows; views only ask for visible ones.
+
+    Rows are read straight from a SegmentStore. Speaker filtering swaps in
+    a precomputed array of row indexes instead of re-evaluating every
+    segment, so it stays instant on long calls.
+    """
+
+    SpeakerRole = Qt.ItemDataRole.UserRole + 1
+    SegmentRole = Qt.ItemDataRole.UserRole + 2
+
+    SPEAKER_COLORS = {
+        "salesperson": QColor("#E8F5E9"),
+        "customer": QColor("#E3F2FD")
+    }
+    MATCH_COLOR = QColor("#FFF59D")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.store = SegmentStore()
+        self.speaker: Optional[str] = None
+        self._rows = np.zeros(0, dtype=np.int64)
+        self._lowered: List[str] = []
+        self._matches: Set[int] = set()
+        self._query = ""
+
+    def set_store(self, store: SegmentStore):
+        """Show the segments of a store; the store is shared, not copied."""
+        self.beginResetModel()
+        self.store = store
+        self._rows = self._visible_rows(0)
+        self._lowered = []
+        self._matches = set()
+        self._query = ""
+        self.endResetModel()
+
+    def rows_appended(self, first: int):
+        """
+        Show segments appended to the store, e.g. by live transcription.
+
+        Args:
+            first: Index of the first new segment
+        """
+        new_rows = self._visible_rows(first)
+        if self._lowered:
+            texts = [text.lower() for text in self.store.texts()[first:]]
+            self._lowered.extend(texts)
+            if self._query:
+                self._matches.update(
+                    first + i for i, text in enumerate(texts) if self._query in text
+                )
+        if len(new_rows):
+            count = len(self._rows)
+            self.beginInsertRows(QModelIndex(), count, count + len(new_rows) - 1)
+            self._rows = np.concatenate((self._rows, new_rows))
+            self.endInsertRows()
+
+    def set_speaker(self, speaker: Optional[str]):
+        """
+        Show only one speaker's segments.
+
+        Args:
+            speaker: Speaker label, or None to show everyone
+        """
+        self.beginResetModel()
+        self.speaker = speaker
+        self._rows = self._visible_rows(0)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = int(self._rows[index.row()])
+        store = self.store
+        code = store.speaker[row]
+        speaker = store.speakers[code] if code >= 0 else None
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            start = int(store.start[row])
+            label = (speaker or "unknown").title()
+            return f"[{start//60}:{start%60:02d}] {label}: {store.text(row)}"
+        if role == Qt.ItemDataRole.BackgroundRole:
+            if row in self._matches:
+                return self.MATCH_COLOR
+            return self.SPEAKER_COLORS.get(speaker)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"{store.start[row]:.1f}s - {store.end[row]:.1f}s"
+        if role == self.SpeakerRole:
+            return speaker or ""
+        if role == self.SegmentRole:
+            return store[row]
+        return None
+
+    def search(self, query: str) -> List[int]:
+        """
+        Find visible segments containing the query and highlight them.
+
+        Extending the previous query only rescans its matches, so typing
+        stays fast on long transcripts.
+
+        Args:
+            query: Case-insensitive text to find
+
+        Returns:
+            Sorted visible rows that match
+        """
+        query = query.lower()
+        if query and not self._lowered:
+            self._lowered = [text.lower() for text in self.store.texts()]
+
+        if not query:
+            matches = set()
+        elif self._query and query.startswith(self._query):
+            matches = {row for row in self._matches if query in self._lowered[row]}
+        else:
+            matches = {row for row, text in enumerate(self._lowered) if query in text}
+
+        changed = bool(matches or self._matches)
+        self._query = query
+        self._matches = matches
+
+        if changed and self.rowCount():
+            # Views only repaint the visible part of the range
+            self.dataChanged.emit(
+                self.index(0),
+                self.index(self.rowCount() - 1),
+                [Qt.ItemDataRole.BackgroundRole]
+            )
+
+        if not matches:
+            return []
+        return np.flatnonzero(np.isin(self._rows, list(matches))).tolist()
+
+    def _visible_rows(self, first: int) -> np.ndarray:
+        """Get indexes of segments from `first` on that pass the speaker filter."""
+        if self.speaker is None:
+            return np.arange(first, len(self.store))
+        if self.speaker not in self.store.speakers:
+            return np.zeros(0, dtype=np.int64)
+        code = self.store.speakers.index(self.speaker)
+        return first + np.flatnonzero(self.store.speaker[first:] == code)
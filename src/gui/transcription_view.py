@@ -3,13 +3,80 @@ Widget for displaying transcription results.
 """
 
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QTextEdit, QComboBox,
-    QPushButton, QHBoxLayout, QFileDialog, QMessageBox
+    QWidget, QVBoxLayout, QListView, QComboBox, QLineEdit, QLabel,
+    QPushButton, QHBoxLayout, QFileDialog, QMessageBox, QProgressBar,
+    QStyledItemDelegate
 )
 from pathlib import Path
-from src.utils.export_utils import export_transcript
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QTextCharFormat, QColor, QTextCursor
+from src.utils.export_utils import export_transcript, compression_for
+from src.gui.transcript_model import TranscriptModel
+from src.transcription.segment_store import SegmentStore
+from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal
+from config import EXPORT_FORMATS
+
+class ExportWorker(QThread):
+    """Worker thread that writes an export without blocking the UI."""
+    progress = pyqtSignal(float)
+    finished = pyqtSignal(str)
+    error = pyqtSignal(str)
+    
+    def __init__(self, results, output_path: Path, format: str, compression=None):
+        super().__init__()
+        # Snapshot the segments so live updates cannot change them mid-export
+        self.results = {**results, "segments": results["segments"].copy()}
+        self.output_path = output_path
+        self.format = format
+        self.compression = compression
+        
+    def run(self):
+        try:
+            export_transcript(
+                self.results,
+                self.output_path,
+                self.format,
+                compression=self.compression,
+                progress_callback=self.progress.emit
+            )
+            self.finished.emit(str(self.output_path))
+            
+        except Exception as e:
+            self.error.emit(str(e))
+
+class TranscriptDelegate(QStyledItemDelegate):
+    """
+    Draws wrapped transcript rows and remembers their heights.
+    
+    With word wrap the rows differ in height, so the list measures every
+    row, not just the visible ones, whenever it lays them out, and
+    measuring a row means wrapping its text. Heights are kept per row until
+    the width or the rows change, so repeated layouts, e.g. after live
+    appends or search highlighting, only measure new rows.
+    """
+    
+    # The list asks at a few slightly different widths (layout, scroll bar shown)
+    MAX_WIDTHS = 4
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._heights = {}
+        
+    def sizeHint(self, option, index):
+        width = option.rect.width()
+        heights = self._heights.get(width)
+        if heights is None:
+            if len(self._heights) >= self.MAX_WIDTHS:
+                # Forget the width measured first; dicts keep insertion order
+                del self._heights[next(iter(self._heights))]
+            heights = self._heights[width] = {}
+        size = heights.get(index.row())
+        if size is None:
+            size = super().sizeHint(option, index)
+            heights[index.row()] = size
+        return size
+        
+    def clear(self):
+        """Forget all measured heights."""
+        self._heights.clear()
 
 class TranscriptionView(QWidget):
     """Widget for displaying and interacting with transcription results."""
@@ -17,6 +84,9 @@ class TranscriptionView(QWidget):
     def __init__(self):
         super().__init__()
         self.results = None
+        self.matches = []
+        self.match_position = -1
+        self.export_worker = None
         self._init_ui()
         
     def _init_ui(self):
@@ -33,16 +103,56 @@ class TranscriptionView(QWidget):
         self.filter_combo.currentTextChanged.connect(self._filter_changed)
         toolbar.addWidget(self.filter_combo)
         
+        # Add search box; searching waits for a pause in typing
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search transcript")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(lambda: self.search_timer.start())
+        self.search_edit.returnPressed.connect(self._next_match)
+        toolbar.addWidget(self.search_edit)
+        
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self._search)
+        
+        prev_btn = QPushButton("Previous")
+        prev_btn.clicked.connect(self._previous_match)
+        toolbar.addWidget(prev_btn)
+        
+        next_btn = QPushButton("Next")
+        next_btn.clicked.connect(self._next_match)
+        toolbar.addWidget(next_btn)
+        
+        self.match_label = QLabel()
+        toolbar.addWidget(self.match_label)
+        
         # Add export button
         export_btn = QPushButton("Export")
         export_btn.clicked.connect(self._export_transcript)
         toolbar.addWidget(export_btn)
         
+        self.export_progress = QProgressBar()
+        self.export_progress.setRange(0, 100)
+        self.export_progress.setMaximumWidth(120)
+        self.export_progress.hide()
+        toolbar.addWidget(self.export_progress)
+        
         toolbar.addStretch()
         
-        # Add transcript display
-        self.transcript = QTextEdit()
-        self.transcript.setReadOnly(True)
+        # Add transcript display; rows are measured in batches so long calls
+        # stay responsive, and only visible rows are painted
+        self.model = TranscriptModel(self)
+        self.delegate = TranscriptDelegate(self)
+        self.model.modelReset.connect(self.delegate.clear)
+        
+        self.transcript = QListView()
+        self.transcript.setModel(self.model)
+        self.transcript.setItemDelegate(self.delegate)
+        self.transcript.setWordWrap(True)
+        self.transcript.setLayoutMode(QListView.LayoutMode.Batched)
+        self.transcript.setBatchSize(200)
+        self.transcript.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
         layout.addWidget(self.transcript)
         
     def set_results(self, results):
@@ -52,55 +162,73 @@ class TranscriptionView(QWidget):
         Args:
             results: Dictionary containing transcription results
         """
+        if results is not None:
+            results["segments"] = SegmentStore.from_dicts(results["segments"])
         self.results = results
-        self._update_display()
+        self.model.set_store(results["segments"] if results else SegmentStore())
+        self._search()
         
-    def _update_display(self):
-        """Update the transcript display."""
-        if not self.results:
-            return
-            
-        self.transcript.clear()
-        cursor = self.transcript.textCursor()
-        
-        # Format for timestamps
-        time_format = QTextCharFormat()
-        time_format.setForeground(QColor("gray"))
-        
-        # Format for speakers
-        speaker_formats = {
-            "salesperson": QTextCharFormat(),
-            "customer": QTextCharFormat()
-        }
-        speaker_formats["salesperson"].setBackground(QColor("#E8F5E9"))
-        speaker_formats["customer"].setBackground(QColor("#E3F2FD"))
-        
-        filter_text = self.filter_combo.currentText().lower()
-        
-        for segment in self.results["segments"]:
-            if filter_text != "all speakers" and segment["speaker"] != filter_text:
-                continue
-                
-            # Add timestamp
-            cursor.insertText(
-                f"[{int(segment['start'])//60}:{int(segment['start'])%60:02d}] ",
-                time_format
-            )
-            
-            # Add speaker and text
-            speaker_format = speaker_formats.get(segment["speaker"], QTextCharFormat())
-            cursor.insertText(
-                f"{segment['speaker'].title()}: {segment['text']}\n",
-                speaker_format
-            )
+    def append_segments(self, segments, duration):
+        """
+        Append live segments without rebuilding the transcript.
+        
+        Args:
+            segments: Newly committed segments
+            duration: Seconds of audio received so far
+        """
+        if self.results is None:
+            self.set_results({"segments": SegmentStore(), "statistics": {}, "language": None, "duration": 0})
+        store = self.results["segments"]
+        first = len(store)
+        store.extend(segments)
+        self.results["duration"] = duration
+        
+        # Follow the live edge unless the user has scrolled up
+        scroll_bar = self.transcript.verticalScrollBar()
+        at_bottom = scroll_bar.value() == scroll_bar.maximum()
+        self.model.rows_appended(first)
+        if at_bottom:
+            self.transcript.scrollToBottom()
             
     def _filter_changed(self, filter_text):
         """Handle filter changes."""
-        self._update_display()
+        speaker = None if filter_text == "All Speakers" else filter_text.lower()
+        self.model.set_speaker(speaker)
+        self._search()
+        
+    def _search(self):
+        """Highlight segments matching the search text."""
+        self.matches = self.model.search(self.search_edit.text())
+        self.match_position = -1
+        
+        if self.search_edit.text():
+            self.match_label.setText(f"{len(self.matches)} matches")
+            self._next_match()
+        else:
+            self.match_label.clear()
+            
+    def _next_match(self):
+        """Scroll to the next search match."""
+        self._step_match(1)
+        
+    def _previous_match(self):
+        """Scroll to the previous search match."""
+        self._step_match(-1)
+        
+    def _step_match(self, step):
+        """Select the match `step` positions from the current one."""
+        if not self.matches:
+            return
+            
+        self.match_position = (self.match_position + step) % len(self.matches)
+        index = self.model.index(self.matches[self.match_position])
+        self.transcript.setCurrentIndex(index)
+        self.transcript.scrollTo(index, QListView.ScrollHint.PositionAtCenter)
+        self.match_label.setText(f"{self.match_position + 1} of {len(self.matches)} matches")
         
     def _export_transcript(self):
-        """Export transcript to file."""
-        if not self.results:
+        """Export transcript to file in the background."""
+        if not self.results or (self.export_worker and self.export_worker.isRunning()):
             return
             
         # Create file dialog
@@ -108,34 +236,42 @@ class TranscriptionView(QWidget):
             self,
             "Export Transcript",
             "",
-            "Text Files (*.txt);;CSV Files (*.csv);;JSON Files (*.json)"
+            "Text Files (*.txt);;CSV Files (*.csv);;JSON Files (*.json);;"
+            "JSON Lines (*.jsonl *.jsonl.gz *.jsonl.zst);;Parquet Files (*.parquet)"
         )
         
         if not file_path:
             return
             
-        try:
-            # Determine format from selected filter
-            format = "txt"
-            if file_path.endswith(".csv"):
-                format = "csv"
-            elif file_path.endswith(".json"):
-                format = "json"
-                
-            # Export using utility function
-            export_transcript(self.results, Path(file_path), format)
-            
-            # Show success message
-            QMessageBox.information(
-                self,
-                "Export Complete",
-                f"Transcript exported successfully to {file_path}"
-            )
-            
-        except Exception as e:
-            # Show error message
-            QMessageBox.critical(
-                self,
-                "Export Error",
-                f"Failed to export transcript: {str(e)}"
-            )
\ No newline at end of file
+        # Determine format and compression from the file name
+        path = Path(file_path)
+        compression = compression_for(path)
+        suffix = (path.with_suffix("") if compression else path).suffix.lstrip(".").lower()
+        format = suffix if suffix in EXPORT_FORMATS else "txt"
+        
+        # Export using utility function off the UI thread
+        self.export_progress.setValue(0)
+        self.export_progress.show()
+        self.export_worker = ExportWorker(self.results, path, format, compression)
+        self.export_worker.progress.connect(lambda value: self.export_progress.setValue(int(value * 100)))
+        self.export_worker.finished.connect(self._export_finished)
+        self.export_worker.error.connect(self._export_error)
+        self.export_worker.start()
+        
+    def _export_finished(self, file_path):
+        """Show success message."""
+        self.export_progress.hide()
+        QMessageBox.information(
+            self,
+            "Export Complete",
+            f"Transcript exported successfully to {file_path}"
+        )
+        
+    def _export_error(self, error):
+        """Show error message."""
+        self.export_progress.hide()
+        QMessageBox.critical(
+            self,
+            "Export Error",
+            f"Failed to export transcript: {error}"
+        )
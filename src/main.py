@@ -11,12 +11,11 @@ project_root = Path(__file__).resolve().parent.parent
 sys.path.append(str(project_root))
 
 from src.gui import MainWindow
-from config import BASE_DIR, MODELS_DIR, OUTPUT_DIR, TEMP_DIR
+from config import BASE_DIR, MODELS_DIR, OUTPUT_DIR, TEMP_DIR, MIN_RAM, MIN_STORAGE
 
 def check_system_requirements():
     """Verify that the system meets minimum requirements."""
     import psutil
-    import torch
     
     # Check RAM
     available_ram = psutil.virtual_memory().total
@@ -28,12 +27,7 @@ def check_system_requirements():
     if free_storage < MIN_STORAGE:
         raise RuntimeError(f"Insufficient storage space. Required: {MIN_STORAGE/1024/1024/1024:.1f}GB, Available: {free_storage/1024/1024/1024:.1f}GB")
     
-    # Check GPU
-    if torch.cuda.is_available():
-        gpu_info = torch.cuda.get_device_properties(0)
-        print(f"GPU detected: {gpu_info.name} ({gpu_info.total_memory/1024/1024/1024:.1f}GB)")
-    else:
-        print("No GPU detected. Using CPU for processing.")
+    # GPU detection needs torch, so it is reported by the background model warm-up
         
     # Check Python version
     import sys
@@ -49,23 +43,8 @@ def initialize_application():
         for directory in [MODELS_DIR, OUTPUT_DIR, TEMP_DIR]:
             directory.mkdir(exist_ok=True)
             
-        # Download Whisper model if not exists
-        model_path = MODELS_DIR / WHISPER_MODEL
-        if not model_path.exists():
-            print(f"Downloading Whisper model '{WHISPER_MODEL}'...")
-            import whisper
-            whisper.load_model(WHISPER_MODEL, download_root=str(MODELS_DIR))
-            
-        # Initialize speaker classification model
-        classifier_path = MODELS_DIR / "speaker_classifier"
-        if not classifier_path.exists():
-            print("Downloading speaker classification model...")
-            from transformers import AutoTokenizer, AutoModelForSequenceClassification
-            tokenizer = AutoTokenizer.from_pretrained("distilbert-base-uncased")
-            model = AutoModelForSequenceClassification.from_pretrained("distilbert-base-uncased")
-            tokenizer.save_pretrained(classifier_path)
-            model.save_pretrained(classifier_path)
-            
+        # Models are downloaded and loaded by the main window's background
+        # warm-up, so the window can be shown immediately
         print("Application initialized successfully.")
         return True
         
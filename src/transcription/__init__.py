@@ -1,5 +1,14 @@
 from .transcriber import AudioTranscriber
 from .processor import AudioProcessor
 from .classifier import SpeakerClassifier
+from .diarization import AcousticDiarizer
+from .model_registry import ModelRegistry, get_model_registry, set_inference_threads
+from .pipeline import TranscriptionPipeline
+from .vad import VoiceActivityDetector
+from .progress import CancellationToken, JobCancelledError, ProgressTracker
+from .segment_store import SegmentStore, SegmentView
+from .interval_index import IntervalIndex
+from .peaks import PeakPyramid
+from .streaming import StreamingTranscriber, GrowingFileSource, MicrophoneSource
 
-__all__ = ['AudioTranscriber', 'AudioProcessor', 'SpeakerClassifier']
\ No newline at end of file
+__all__ = ['AudioTranscriber', 'AudioProcessor', 'SpeakerClassifier', 'AcousticDiarizer', 'ModelRegistry', 'get_model_registry', 'set_inference_threads', 'TranscriptionPipeline', 'VoiceActivityDetector', 'CancellationToken', 'JobCancelledError', 'ProgressTracker', 'StreamingTranscriber', 'GrowingFileSource', 'MicrophoneSource', 'SegmentStore', 'SegmentView', 'IntervalIndex', 'PeakPyramid']
\ No newline at end of file
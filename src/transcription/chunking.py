@@ -0,0 +1,263 @@
+"""
+Splits long recordings into chunks transcribed concurrently across processes.
+"""
+
+import os
+import threading
+import multiprocessing
+import numpy as np
+from collections import Counter
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import (
+    MIN_SAMPLE_RATE,
+    PARALLEL_CHUNK_SECONDS,
+    PARALLEL_CHUNK_OVERLAP,
+    PARALLEL_SPLIT_SEARCH_SECONDS
+)
+
+# Transcriber held by each chunk worker process
+_worker_transcriber = None
+
+# Pools are kept alive between files so workers keep their models loaded
+_pools: Dict[Tuple, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+def find_split_points(audio: np.ndarray, chunk_seconds: float = PARALLEL_CHUNK_SECONDS,
+                      search_seconds: float = PARALLEL_SPLIT_SEARCH_SECONDS,
+                      sample_rate: int = MIN_SAMPLE_RATE) -> List[int]:
+    """
+    Choose chunk boundaries at the quietest point near each target length.
+
+    Args:
+        audio: Mono float32 audio
+        chunk_seconds: Target chunk length
+        search_seconds: How far either side of the target to look for a quiet point
+        sample_rate: Sample rate of the audio
+
+    Returns:
+        Sample boundaries, starting with 0 and ending with len(audio)
+    """
+    frame = int(0.05 * sample_rate)
+    num_frames = len(audio) // frame
+    if num_frames == 0 or len(audio) < 1.5 * chunk_seconds * sample_rate:
+        return [0, len(audio)]
+
+    # Frame energy computed in blocks so memory-mapped audio is not loaded at once
+    energy = np.empty(num_frames, dtype=np.float32)
+    block = 1200
+    for first in range(0, num_frames, block):
+        last = min(first + block, num_frames)
+        frames = np.asarray(audio[first * frame:last * frame], dtype=np.float32).reshape(-1, frame)
+        energy[first:last] = np.mean(frames ** 2, axis=1)
+
+    chunk_frames = int(chunk_seconds * sample_rate / frame)
+    search_frames = int(search_seconds * sample_rate / frame)
+
+    boundaries = [0]
+    target = chunk_frames
+    # Leave the remainder as part of the last chunk when it would be short
+    while target < num_frames - chunk_frames // 2:
+        lo = max(boundaries[-1] // frame + 1, target - search_frames)
+        hi = min(num_frames, target + search_frames + 1)
+        best = lo + int(np.argmin(energy[lo:hi]))
+        boundaries.append(best * frame + frame // 2)
+        target = best + chunk_frames
+
+    boundaries.append(len(audio))
+    return boundaries
+
+def merge_chunk_segments(chunks: List[Tuple[int, int, int, int, List[Dict]]],
+                         sample_rate: int = MIN_SAMPLE_RATE) -> List[Dict]:
+    """
+    Merge per-chunk segments onto the full timeline.
+
+    Each chunk owns the span between its boundaries; segments decoded in the
+    overlap context are kept only by the chunk owning their midpoint.
+
+    Args:
+        chunks: Tuples of (owned_start, owned_end, decoded_start, decoded_end, segments)
+            in samples, with segment times relative to decoded_start
+        sample_rate: Sample rate of the audio
+
+    Returns:
+        Segments in time order with absolute timestamps
+    """
+    merged = []
+    for owned_start, owned_end, decoded_start, decoded_end, segments in chunks:
+        offset = decoded_start / sample_rate
+        lo, hi = owned_start / sample_rate, owned_end / sample_rate
+        for segment in segments:
+            start = segment["start"] + offset
+            end = min(segment["end"] + offset, decoded_end / sample_rate)
+            if lo <= (start + end) / 2 < hi:
+                merged.append({**segment, "start": start, "end": end})
+
+    merged.sort(key=lambda segment: segment["start"])
+    return merged
+
+def transcribe_in_chunks(audio: np.ndarray, model_name: str, device: str, num_workers: int,
+                         on_progress: Optional[Callable[[float], None]] = None,
+                         checkpoint=None) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Transcribe chunks of one recording concurrently.
+
+    Workers read their chunk directly instead of receiving pickled copies:
+    audio memory-mapped from a file, such as the audio store, is mapped by
+    the workers too, and other audio is placed in shared memory once.
+
+    Args:
+        audio: Mono float32 audio at MIN_SAMPLE_RATE
+        model_name: Whisper model used by the workers
+        device: Device the workers load the model on
+        num_workers: Number of worker processes
+        on_progress: Called with the completed fraction as chunks finish; may
+            raise to abandon the remaining chunks
+        checkpoint: JobCheckpoint holding chunks finished by an interrupted
+            run; each newly finished chunk is added to it
+
+    Returns:
+        Tuple of (merged segments, most common detected language)
+    """
+    boundaries = find_split_points(audio)
+    overlap = int(PARALLEL_CHUNK_OVERLAP * MIN_SAMPLE_RATE)
+
+    state = checkpoint.load("chunks") if checkpoint is not None else None
+    if state is None or state["boundaries"] != boundaries:
+        state = {"boundaries": boundaries, "chunks": [], "languages": Counter()}
+
+    mapped = _mapped_file(audio)
+    shm = None
+    if mapped is None:
+        shm = shared_memory.SharedMemory(create=True, size=max(1, audio.nbytes))
+    try:
+        if shm is not None:
+            shared = np.ndarray(audio.shape, dtype=np.float32, buffer=shm.buf)
+            shared[:] = audio
+            del shared
+
+        pool = _get_pool(model_name, device, num_workers)
+        finished = {chunk[0] for chunk in state["chunks"]}
+        jobs = []
+        for owned_start, owned_end in zip(boundaries[:-1], boundaries[1:]):
+            if owned_start in finished:
+                continue
+            decoded_start = max(0, owned_start - overlap)
+            decoded_end = min(len(audio), owned_end + overlap)
+            if mapped is not None:
+                future = pool.submit(_transcribe_mapped_chunk, *mapped, len(audio), decoded_start, decoded_end)
+            else:
+                future = pool.submit(_transcribe_shared_chunk, shm.name, len(audio), decoded_start, decoded_end)
+            jobs.append((owned_start, owned_end, decoded_start, decoded_end, future))
+
+        chunks = state["chunks"]
+        languages = state["languages"]
+        pending = {job[-1]: job[:-1] for job in jobs}
+        completed = sum(chunk[1] - chunk[0] for chunk in chunks)
+        try:
+            while pending:
+                done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                if mapped is not None:
+                    # Keep the file most recently used so the audio store does not evict it
+                    os.utime(mapped[0])
+                for future in done:
+                    owned_start, owned_end, decoded_start, decoded_end = pending.pop(future)
+                    segments, language = future.result()
+                    chunks.append((owned_start, owned_end, decoded_start, decoded_end, segments))
+                    completed += owned_end - owned_start
+                    if language:
+                        languages[language] += owned_end - owned_start
+                if done and checkpoint is not None:
+                    checkpoint.save("chunks", state)
+                if on_progress is not None:
+                    on_progress(completed / max(1, len(audio)))
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+    language = languages.most_common(1)[0][0] if languages else None
+    return merge_chunk_segments(sorted(chunks, key=lambda chunk: chunk[0])), language
+
+def shutdown_pools():
+    """Stop all chunk worker pools."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _pools.clear()
+
+def _get_pool(model_name: str, device: str, num_workers: int) -> ProcessPoolExecutor:
+    """Get or create the worker pool for a model."""
+    key = (model_name, device, num_workers)
+    with _pools_lock:
+        if key not in _pools:
+            num_threads = max(1, (os.cpu_count() or 1) // num_workers)
+            _pools[key] = ProcessPoolExecutor(
+                max_workers=num_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_chunk_worker,
+                initargs=(model_name, device, num_threads)
+            )
+        return _pools[key]
+
+def _init_chunk_worker(model_name: str, device: str, num_threads: int):
+    """Load the model once per worker process."""
+    from .transcriber import AudioTranscriber
+    from .model_registry import set_inference_threads
+
+    global _worker_transcriber
+    set_inference_threads(num_threads)
+    # Chunks only run the first pass; the parent re-decodes weak segments
+    _worker_transcriber = AudioTranscriber(model_name=model_name, device=device,
+                                           parallel=False, cascade=False)
+
+def _mapped_file(audio: np.ndarray) -> Optional[Tuple[str, int]]:
+    """Get the file and byte offset of float32 audio memory-mapped from a whole file."""
+    if not isinstance(audio, np.memmap) or audio.filename is None or audio.dtype != np.float32:
+        return None
+    try:
+        size = os.path.getsize(audio.filename)
+    except OSError:
+        return None
+    # Slices keep the file's offset, so only the full array matches the file size
+    if audio.offset + audio.nbytes != size or not audio.flags.c_contiguous:
+        return None
+    return audio.filename, audio.offset
+
+def _transcribe_mapped_chunk(filename: str, offset: int, length: int, start: int,
+                             end: int) -> Tuple[List[Dict], Optional[str]]:
+    """Transcribe one chunk read from a memory-mapped audio file."""
+    audio = np.memmap(filename, dtype=np.float32, mode="r", offset=offset, shape=(length,))
+    result = _worker_transcriber.transcribe(np.array(audio[start:end]))
+    return result["segments"], result["language"]
+
+def _transcribe_shared_chunk(shm_name: str, length: int, start: int,
+                             end: int) -> Tuple[List[Dict], Optional[str]]:
+    """Transcribe one chunk read from shared memory."""
+    try:
+        # The parent owns the segment; keep this process from unlinking it
+        shm = shared_memory.SharedMemory(name=shm_name, track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=shm_name)
+
+    audio = np.ndarray((length,), dtype=np.float32, buffer=shm.buf)
+    error = None
+    try:
+        result = _worker_transcriber.transcribe(audio[start:end])
+    except Exception as e:
+        # Keep no frames referencing the shared buffer alive past close()
+        error = str(e)
+
+    del audio
+    shm.close()
+
+    if error is not None:
+        raise RuntimeError(error)
+    return result["segments"], result["language"]
@@ -2,51 +2,83 @@
 Handles speaker classification in transcribed audio.
 """
 
-import torch
+import time
 import numpy as np
 from pathlib import Path
-from typing import Dict, List, Tuple
-from transformers import pipeline
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from config import (
+    SPEAKER_MODEL,
     SPEAKER_CLASSES,
     CLASSIFICATION_CONFIDENCE_THRESHOLD,
     MIN_SEGMENT_LENGTH,
-    DEVICE
+    BATCH_SIZE,
+    SPEAKER_QUANTIZED,
+    CHECKPOINT_INTERVAL_SECONDS,
+    get_device
 )
+from src.utils.checkpoint import JobCheckpoint
+from .model_registry import get_model_registry
+from .progress import CancellationToken
+from .segment_store import SegmentStore
 
 class SpeakerClassifier:
     """Handles speaker classification in transcribed segments."""
     
-    def __init__(self):
-        """Initialize the speaker classifier."""
-        # Load pretrained text classification model
-        self.classifier = pipeline(
-            "text-classification",
-            model="distilbert-base-uncased",
-            device=0 if DEVICE == "cuda" else -1
+    def __init__(self, quantized: bool = SPEAKER_QUANTIZED):
+        """
+        Initialize the speaker classifier.
+        
+        Args:
+            quantized: Use the int8 model on CPU; the fp32 model is used on GPU
+        """
+        device = get_device()
+        self.quantized = quantized and device == "cpu"
+        
+        # Use the shared pretrained text classification model
+        options = {"quantized": True} if self.quantized else {}
+        self.classifier = get_model_registry().get(
+            "text-classification", SPEAKER_MODEL, device, **options
+        )
+        self._inference_lock = get_model_registry().inference_lock(
+            "text-classification", SPEAKER_MODEL, device, **options
         )
+        self.last_run_stats = {"segments": 0, "seconds": 0.0, "segments_per_second": 0.0}
         
-    def classify_segments(self, segments: List[Dict]) -> List[Dict]:
+    def classify_segments(self, segments: List[Dict],
+                          progress_callback: Optional[Callable[[float], None]] = None,
+                          cancel_token: Optional[CancellationToken] = None,
+                          checkpoint: Optional[JobCheckpoint] = None) -> SegmentStore:
         """
         Classify speakers in transcribed segments.
         
+        Segments are classified in length-bucketed batches of BATCH_SIZE and
+        returned in their original order.
+        
         Args:
             segments: List of transcription segments
+            progress_callback: Called with the classified fraction after each batch
+            cancel_token: Checked between batches
+            checkpoint: Job checkpoint to resume from and save predictions to
             
         Returns:
-            List of segments with speaker labels
+            Segment store with speaker labels
         """
-        classified_segments = []
+        start_time = time.perf_counter()
         
-        for segment in segments:
-            # Skip segments shorter than minimum length
-            duration = segment["end"] - segment["start"]
-            if duration < MIN_SEGMENT_LENGTH:
-                continue
-                
-            # Classify speaker
-            result = self.classifier(segment["text"])[0]
+        # Skip segments shorter than minimum length
+        candidates = [
+            segment for segment in segments
+            if segment["end"] - segment["start"] >= MIN_SEGMENT_LENGTH
+        ]
+        
+        # Classify speakers
+        predictions = self._classify_texts(
+            [segment["text"] for segment in candidates], progress_callback, cancel_token, checkpoint
+        )
+        
+        classified_segments = []
+        for segment, result in zip(candidates, predictions):
             confidence = result["score"]
             
             # Only include classifications above threshold
@@ -54,59 +86,123 @@ class SpeakerClassifier:
                 segment["speaker"] = result["label"]
                 segment["speaker_confidence"] = confidence
                 classified_segments.append(segment)
+        
+        elapsed = time.perf_counter() - start_time
+        self.last_run_stats = {
+            "segments": len(candidates),
+            "seconds": elapsed,
+            "segments_per_second": len(candidates) / elapsed if elapsed > 0 else 0.0
+        }
             
-        return classified_segments
+        return SegmentStore.from_dicts(classified_segments)
         
-    def detect_speaker_overlap(self, segments: List[Dict]) -> List[Dict]:
+    def _classify_texts(self, texts: List[str],
+                        progress_callback: Optional[Callable[[float], None]] = None,
+                        cancel_token: Optional[CancellationToken] = None,
+                        checkpoint: Optional[JobCheckpoint] = None) -> List[Dict]:
         """
-        Detect and mark potential speaker overlaps.
+        Run texts through the classifier in length-bucketed batches.
+        
+        With a checkpoint, completed predictions are saved at most every
+        CHECKPOINT_INTERVAL_SECONDS and when the job stops, and a resumed
+        run skips the batches already classified. Batches are the same
+        either way, so padding and predictions are too.
         
         Args:
-            segments: List of classified segments
+            texts: Segment texts to classify
+            progress_callback: Called with the classified fraction after each batch
+            cancel_token: Checked between batches
+            checkpoint: Job checkpoint to resume from and save predictions to
             
         Returns:
-            List of segments with overlap information
+            One prediction per text, in input order
         """
-        for i in range(len(segments)-1):
-            current = segments[i]
-            next_seg = segments[i+1]
+        if not texts:
+            return []
             
-            # Check for temporal overlap
-            if current["end"] > next_seg["start"]:
-                overlap_duration = current["end"] - next_seg["start"]
-                current["overlap"] = {
-                    "duration": overlap_duration,
-                    "overlaps_with": i + 1
-                }
-                next_seg["overlap"] = {
-                    "duration": overlap_duration,
-                    "overlaps_with": i
-                }
+        # Sort by token length so each batch pads to a similar length
+        lengths = self._token_lengths(texts)
+        order = sorted(range(len(texts)), key=lambda i: lengths[i])
+        
+        predictions: Optional[List[Dict]] = checkpoint.load("classify") if checkpoint is not None else None
+        if predictions is None or len(predictions) != len(texts):
+            predictions = [None] * len(texts)
+        saved_at = time.monotonic()
+        unsaved = False
+        try:
+            for bucket_start in range(0, len(order), BATCH_SIZE):
+                bucket = order[bucket_start:bucket_start + BATCH_SIZE]
+                if all(predictions[i] is not None for i in bucket):
+                    continue
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                
+                with self._inference_lock:
+                    results = self.classifier(
+                        [texts[i] for i in bucket],
+                        batch_size=len(bucket),
+                        truncation=True
+                    )
+                for i, result in zip(bucket, results):
+                    # Pipelines return a list of labels per input when top_k is set
+                    predictions[i] = result[0] if isinstance(result, list) else result
+                unsaved = True
                 
-        return segments
+                if checkpoint is not None and time.monotonic() - saved_at >= CHECKPOINT_INTERVAL_SECONDS:
+                    checkpoint.save("classify", predictions)
+                    saved_at = time.monotonic()
+                    unsaved = False
+                    
+                if progress_callback is not None:
+                    progress_callback(min(1.0, (bucket_start + len(bucket)) / len(texts)))
+        except BaseException:
+            if checkpoint is not None and unsaved:
+                checkpoint.save("classify", predictions)
+            raise
+            
+        return predictions
+        
+    def _token_lengths(self, texts: List[str]) -> List[int]:
+        """Get the token length of each text, falling back to word counts."""
+        tokenizer = getattr(self.classifier, "tokenizer", None)
+        if tokenizer is None:
+            return [len(text.split()) for text in texts]
+        with self._inference_lock:
+            encoded = tokenizer(texts, truncation=True)
+        return [len(ids) for ids in encoded["input_ids"]]
+        
+    def get_throughput(self) -> float:
+        """Get the segments/sec achieved by the last classification run."""
+        return self.last_run_stats["segments_per_second"]
+        
+    @staticmethod
+    def detect_speaker_overlap(segments: Union[SegmentStore, List[Dict]]) -> SegmentStore:
+        """
+        Detect and mark speaker overlaps.
         
-    def get_speaker_statistics(self, segments: List[Dict]) -> Dict:
+        Every pair of overlapping segments is found, not just neighbours.
+        Each segment's `overlap` holds its longest overlap and `overlaps`
+        lists all of them.
+        
+        Args:
+            segments: Classified segments
+            
+        Returns:
+            Segment store with overlap information
+        """
+        store = SegmentStore.from_dicts(segments)
+        store.set_overlaps(*store.interval_index().overlaps())
+        return store
+        
+    @staticmethod
+    def get_speaker_statistics(segments: Union[SegmentStore, List[Dict]]) -> Dict:
         """
         Calculate statistics about speaker participation.
         
         Args:
-            segments: List of classified segments
+            segments: Classified segments
             
         Returns:
             Dictionary containing speaker statistics
         """
-        stats = {speaker: {
-            "total_time": 0.0,
-            "segment_count": 0,
-            "word_count": 0
-        } for speaker in SPEAKER_CLASSES}
-        
-        for segment in segments:
-            if "speaker" in segment:
-                speaker = segment["speaker"]
-                duration = segment["end"] - segment["start"]
-                stats[speaker]["total_time"] += duration
-                stats[speaker]["segment_count"] += 1
-                stats[speaker]["word_count"] += len(segment["text"].split())
-                
-        return stats
\ No newline at end of file
+        return SegmentStore.from_dicts(segments).speaker_statistics()
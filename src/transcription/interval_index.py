@@ -0,0 +1,112 @@
+"""
+Sorted interval index for overlap detection and time-range queries.
+"""
+
+import numpy as np
+from typing import Tuple
+
+class IntervalIndex:
+    """
+    Intervals sorted by start time.
+
+    Building costs one sort. Range queries binary-search the starts and use
+    a running maximum of the ends to skip intervals that finished before
+    the range, so they touch only the intervals they return plus those
+    that start inside the range.
+    """
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray):
+        """
+        Build the index.
+
+        Args:
+            starts: Interval start times
+            ends: Interval end times
+        """
+        self.order = np.argsort(starts, kind="stable")
+        self.starts = np.asarray(starts, dtype=np.float64)[self.order]
+        self.ends = np.asarray(ends, dtype=np.float64)[self.order]
+        self._reach = np.maximum.accumulate(self.ends) if len(self.ends) else self.ends
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def splice(self, keep: int, starts: np.ndarray, ends: np.ndarray) -> "IntervalIndex":
+        """
+        Index the first `keep` intervals in start order followed by new ones.
+
+        Only the new intervals are sorted and scanned, so appending to a
+        growing index costs about as much as the intervals appended. New
+        intervals must start no earlier than the kept ones and are numbered
+        from `keep` on, which matches an index built from intervals already
+        in start order.
+
+        Args:
+            keep: Number of intervals kept, in start order
+            starts: Start times of the new intervals
+            ends: End times of the new intervals
+
+        Returns:
+            New index; this one is unchanged
+        """
+        tail = IntervalIndex(starts, ends)
+        if len(tail) and keep and tail.starts[0] < self.starts[keep - 1]:
+            raise ValueError("Spliced intervals must start after the kept ones")
+
+        index = IntervalIndex.__new__(IntervalIndex)
+        index.order = np.concatenate((self.order[:keep], tail.order + keep))
+        index.starts = np.concatenate((self.starts[:keep], tail.starts))
+        index.ends = np.concatenate((self.ends[:keep], tail.ends))
+        reach = tail._reach
+        if keep and len(reach):
+            reach = np.maximum(reach, self._reach[keep - 1])
+        index._reach = np.concatenate((self._reach[:keep], reach))
+        return index
+
+    def query(self, start: float, end: float) -> np.ndarray:
+        """
+        Find intervals active in [start, end).
+
+        Args:
+            start: Range start
+            end: Range end
+
+        Returns:
+            Original indices of intersecting intervals, in start order
+        """
+        last = np.searchsorted(self.starts, end, side="left")
+        # Everything before `first` ended at or before `start`
+        first = np.searchsorted(self._reach[:last], start, side="right")
+        candidates = np.arange(first, last)
+        return self.order[candidates[self.ends[candidates] > start]]
+
+    def at(self, time: float) -> np.ndarray:
+        """Find intervals active at a point in time."""
+        return self.query(time, np.nextafter(time, np.inf))
+
+    def overlaps(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find all pairs of overlapping intervals with a sort-and-sweep.
+
+        Each interval is paired with every later-starting interval that
+        starts before it ends, so the cost is O(n log n + k) for k pairs.
+
+        Returns:
+            Tuple of (first indices, second indices, overlap durations),
+            with original indices and first starting no later than second
+        """
+        n = len(self.order)
+        if n < 2:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0)
+
+        # Intervals i+1 .. bound[i]-1 start before interval i ends
+        bounds = np.searchsorted(self.starts, self.ends, side="left")
+        counts = np.maximum(bounds - np.arange(1, n + 1), 0)
+        first = np.repeat(np.arange(n), counts)
+        steps = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        second = first + 1 + steps
+
+        durations = np.minimum(self.ends[first], self.ends[second]) - self.starts[second]
+        keep = durations > 0
+        return self.order[first[keep]], self.order[second[keep]], durations[keep]
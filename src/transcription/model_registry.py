@@ -0,0 +1,291 @@
+"""
+Process-wide registry of loaded models shared between transcription jobs.
+"""
+
+import os
+import tempfile
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from config import MODELS_DIR, MODEL_CACHE_MAX_ENTRIES, MODEL_CACHE_MEMORY_BUDGET, INFERENCE_THREADS
+
+def set_inference_threads(num_threads: int = INFERENCE_THREADS):
+    """
+    Set the intra-op CPU threads torch uses in this process.
+
+    The setting is process-wide and applies to every model, so each
+    process sets it once at startup, before its first model is loaded.
+
+    Args:
+        num_threads: Thread count; should not exceed the available cores
+    """
+    import torch
+    torch.set_num_threads(num_threads)
+
+def _load_whisper(name: str, device: str, **options) -> Any:
+    """Load a Whisper speech recognition model."""
+    import whisper
+    return whisper.load_model(name, device=device, download_root=str(MODELS_DIR))
+
+def _load_text_classifier(name: str, device: str, quantized: bool = False, **options) -> Any:
+    """
+    Load a transformers text classification pipeline.
+
+    Args:
+        name: Model name or path
+        device: "cuda" or "cpu"
+        quantized: Use int8 linear layers; ignored on GPU
+    """
+    from transformers import pipeline
+
+    if quantized and device == "cpu":
+        from transformers import AutoTokenizer
+        return pipeline(
+            "text-classification",
+            model=load_quantized_classifier(name),
+            tokenizer=AutoTokenizer.from_pretrained(name),
+            device=-1
+        )
+
+    return pipeline(
+        "text-classification",
+        model=name,
+        device=0 if device == "cuda" else -1
+    )
+
+def quantize_linear_layers(model: Any) -> Any:
+    """
+    Apply dynamic int8 quantization to a model's linear layers.
+
+    Weights are stored as int8 and activations are quantized on the fly,
+    which speeds up CPU inference and shrinks the linear weights fourfold.
+
+    Args:
+        model: A torch module in eval mode
+
+    Returns:
+        The quantized module
+    """
+    import torch
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def load_quantized_classifier(name: str, cache_dir: Path = MODELS_DIR / "quantized") -> Any:
+    """
+    Load an int8 sequence classification model, quantizing it on first use.
+
+    The quantized module is pickled under MODELS_DIR, so later loads skip
+    both the fp32 load and the quantization pass. Entries are keyed by the
+    torch and transformers versions because neither the packed weights nor
+    the pickled classes are stable across releases.
+
+    Args:
+        name: Model name or path
+        cache_dir: Directory for quantized models
+
+    Returns:
+        The quantized model
+    """
+    import torch
+    import transformers
+    from transformers import AutoModelForSequenceClassification
+
+    versions = f"torch{torch.__version__.split('+')[0]}-transformers{transformers.__version__}"
+    path = Path(cache_dir) / f"{name.strip('/').replace('/', '--')}-int8-{versions}.pt"
+
+    if path.exists():
+        # Trusted local file written below; full modules need weights_only=False
+        return torch.load(path, weights_only=False)
+
+    model = quantize_linear_layers(AutoModelForSequenceClassification.from_pretrained(name).eval())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Unique temporary name so processes quantizing at once do not clash
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            torch.save(model, f)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+    return model
+
+def estimate_model_size(model: Any) -> int:
+    """
+    Estimate the memory held by a model's parameters and buffers.
+
+    Args:
+        model: A torch module or an object wrapping one (e.g. a pipeline)
+
+    Returns:
+        Size in bytes, or 0 if it cannot be determined
+    """
+    module = getattr(model, "model", model)
+    if not hasattr(module, "parameters"):
+        return 0
+
+    size = sum(p.numel() * p.element_size() for p in module.parameters())
+    if hasattr(module, "buffers"):
+        size += sum(b.numel() * b.element_size() for b in module.buffers())
+    return size
+
+class ModelRegistry:
+    """Loads each model once per process and hands the same instance to every job."""
+
+    def __init__(self, max_entries: int = MODEL_CACHE_MAX_ENTRIES,
+                 memory_budget: int = MODEL_CACHE_MEMORY_BUDGET):
+        """
+        Initialize the registry.
+
+        Args:
+            max_entries: Maximum number of models kept resident
+            memory_budget: Maximum total estimated model size in bytes
+        """
+        self.max_entries = max_entries
+        self.memory_budget = memory_budget
+        self._loaders: Dict[str, Callable] = {
+            "whisper": _load_whisper,
+            "text-classification": _load_text_classifier
+        }
+        self._models: "OrderedDict[Tuple, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._load_locks: Dict[Tuple, threading.Lock] = {}
+        self._inference_locks: Dict[Tuple, threading.Lock] = {}
+
+    def register_loader(self, kind: str, loader: Callable):
+        """
+        Register or replace the loader used for a model kind.
+
+        Args:
+            kind: Model kind (e.g. "whisper")
+            loader: Callable taking (name, device, **options) and returning a model
+        """
+        with self._lock:
+            self._loaders[kind] = loader
+
+    def get(self, kind: str, name: str, device: str, **options) -> Any:
+        """
+        Return a loaded model, loading it on first use.
+
+        Args:
+            kind: Model kind registered with a loader
+            name: Model name passed to the loader
+            device: Device the model is placed on
+            **options: Extra hashable loader options, part of the cache key
+
+        Returns:
+            The shared model instance
+        """
+        key = self._make_key(kind, name, device, options)
+
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key][0]
+            if kind not in self._loaders:
+                raise ValueError(f"No loader registered for model kind: {kind}")
+            loader = self._loaders[kind]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Load outside the registry lock so other models stay available,
+        # while concurrent requests for the same model wait for one load
+        with load_lock:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    return self._models[key][0]
+
+            model = loader(name, device, **options)
+            size = estimate_model_size(model)
+
+            with self._lock:
+                self._models[key] = (model, size)
+                self._evict(keep=key)
+                self._load_locks.pop(key, None)
+
+        return model
+
+    def inference_lock(self, kind: str, name: str, device: str, **options) -> threading.Lock:
+        """
+        Get the lock serializing inference on a shared model.
+
+        Whisper installs forward hooks on the model for each decode and
+        fast tokenizers refuse concurrent use, so jobs sharing a model take
+        turns on it while their other stages run in parallel.
+
+        Returns:
+            The same lock for every caller of the same model
+        """
+        key = self._make_key(kind, name, device, options)
+        with self._lock:
+            return self._inference_locks.setdefault(key, threading.Lock())
+
+    def contains(self, kind: str, name: str, device: str, **options) -> bool:
+        """Check whether a model is currently resident."""
+        key = self._make_key(kind, name, device, options)
+        with self._lock:
+            return key in self._models
+
+    def evict(self, kind: str, name: str, device: str, **options) -> bool:
+        """
+        Drop a model from the registry.
+
+        Returns:
+            True if the model was resident
+        """
+        key = self._make_key(kind, name, device, options)
+        with self._lock:
+            return self._models.pop(key, None) is not None
+
+    def clear(self):
+        """Drop all resident models."""
+        with self._lock:
+            self._models.clear()
+
+    def memory_usage(self) -> int:
+        """Get the total estimated size of resident models in bytes."""
+        with self._lock:
+            return sum(size for _, size in self._models.values())
+
+    def get_statistics(self) -> Dict:
+        """Get a summary of resident models."""
+        with self._lock:
+            return {
+                "models": [
+                    {"kind": key[0], "name": key[1], "device": key[2], "size": size}
+                    for key, (_, size) in self._models.items()
+                ],
+                "memory_usage": sum(size for _, size in self._models.values()),
+                "memory_budget": self.memory_budget,
+                "max_entries": self.max_entries
+            }
+
+    def _evict(self, keep: Hashable):
+        """Evict least recently used models until limits are met."""
+        while len(self._models) > 1:
+            over_count = len(self._models) > self.max_entries
+            over_budget = sum(size for _, size in self._models.values()) > self.memory_budget
+            if not (over_count or over_budget):
+                break
+
+            oldest = next(iter(self._models))
+            if oldest == keep:
+                break
+            del self._models[oldest]
+
+    @staticmethod
+    def _make_key(kind: str, name: str, device: str, options: Dict) -> Tuple:
+        """Build the cache key for a model."""
+        return (kind, name, device, tuple(sorted(options.items())))
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_model_registry() -> ModelRegistry:
+    """Get the process-wide model registry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
@@ -0,0 +1,190 @@
+"""
+Multi-resolution min/max peaks for drawing waveforms at any zoom level.
+"""
+
+import os
+import uuid
+import numpy as np
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from config import MIN_SAMPLE_RATE, PEAK_BUCKET_SAMPLES
+
+class PeakPyramid:
+    """
+    Minimum and maximum sample of each bucket at power-of-two bucket sizes.
+
+    Level 0 covers PEAK_BUCKET_SAMPLES samples per bucket and each level
+    above merges pairs of buckets of the one below, down to a single
+    bucket. Peaks are stored as int8 with the minimum rounded down and the
+    maximum rounded up, so the drawn envelope never clips a peak. Drawing
+    any time range reads the level with about one bucket per pixel, so
+    the cost follows the width in pixels rather than the recording length.
+    """
+
+    def __init__(self, levels: List[np.ndarray], samples: int,
+                 bucket: int = PEAK_BUCKET_SAMPLES, sample_rate: int = MIN_SAMPLE_RATE):
+        """
+        Initialize from computed levels.
+
+        Args:
+            levels: Arrays of shape (buckets, 2) holding int8 (min, max), finest first
+            samples: Length of the audio in samples
+            bucket: Samples per level 0 bucket
+            sample_rate: Sample rate of the audio
+        """
+        self.levels = levels
+        self.samples = samples
+        self.bucket = bucket
+        self.sample_rate = sample_rate
+
+    @property
+    def duration(self) -> float:
+        """Length of the audio in seconds."""
+        return self.samples / self.sample_rate
+
+    @classmethod
+    def from_audio(cls, audio: np.ndarray, bucket: int = PEAK_BUCKET_SAMPLES,
+                   sample_rate: int = MIN_SAMPLE_RATE, block_seconds: float = 60.0) -> "PeakPyramid":
+        """
+        Compute the pyramid of normalized audio.
+
+        Level 0 is computed block by block, so memory-mapped audio is never
+        loaded at once; the coarser levels are built from level 0 alone.
+
+        Args:
+            audio: Mono float32 audio in [-1, 1]
+            bucket: Samples per level 0 bucket
+            sample_rate: Sample rate of the audio
+            block_seconds: Audio reduced per step
+
+        Returns:
+            The peak pyramid
+        """
+        samples = len(audio)
+        block = max(1, int(block_seconds * sample_rate) // bucket) * bucket
+        parts = []
+        for start in range(0, samples, block):
+            chunk = np.asarray(audio[start:start + block], dtype=np.float32)
+            if len(chunk) % bucket:
+                # Pad the last bucket with its own final sample
+                chunk = np.pad(chunk, (0, bucket - len(chunk) % bucket), mode="edge")
+            frames = chunk.reshape(-1, bucket)
+            parts.append(np.stack((frames.min(axis=1), frames.max(axis=1)), axis=1))
+
+        peaks = np.concatenate(parts) if parts else np.zeros((0, 2), dtype=np.float32)
+        level = np.empty(peaks.shape, dtype=np.int8)
+        level[:, 0] = np.clip(np.floor(peaks[:, 0] * 127), -127, 127)
+        level[:, 1] = np.clip(np.ceil(peaks[:, 1] * 127), -127, 127)
+
+        levels = [level]
+        while len(levels[-1]) > 1:
+            previous = levels[-1]
+            if len(previous) % 2:
+                previous = np.concatenate((previous, previous[-1:]))
+            pairs = previous.reshape(-1, 2, 2)
+            levels.append(np.stack((pairs[:, :, 0].min(axis=1), pairs[:, :, 1].max(axis=1)), axis=1))
+        return cls(levels, samples, bucket, sample_rate)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["PeakPyramid"]:
+        """
+        Load a saved pyramid.
+
+        Args:
+            path: File written by save()
+
+        Returns:
+            The peak pyramid, or None if the file is missing or unreadable
+        """
+        try:
+            with np.load(path) as data:
+                offsets = data["offsets"]
+                peaks = data["peaks"]
+                samples, bucket, sample_rate = (int(value) for value in data["meta"])
+        except (OSError, KeyError, ValueError, EOFError):
+            return None
+        levels = [peaks[first:last] for first, last in zip(offsets[:-1], offsets[1:])]
+        return cls(levels, samples, bucket, sample_rate)
+
+    def save(self, path: Path):
+        """
+        Save the pyramid atomically as one uncompressed .npz file.
+
+        Args:
+            path: Destination file
+        """
+        path = Path(path)
+        offsets = np.cumsum([0] + [len(level) for level in self.levels])
+        tmp_path = path.parent / f".tmp_{uuid.uuid4().hex}.npz"
+        try:
+            np.savez(
+                tmp_path,
+                peaks=np.concatenate(self.levels),
+                offsets=offsets,
+                meta=np.array([self.samples, self.bucket, self.sample_rate], dtype=np.int64)
+            )
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            raise
+
+    def level_for(self, seconds_per_pixel: float) -> int:
+        """Get the coarsest level with at least one bucket per pixel."""
+        samples_per_pixel = seconds_per_pixel * self.sample_rate
+        if samples_per_pixel < self.bucket:
+            return 0
+        return min(len(self.levels) - 1, int(np.log2(samples_per_pixel / self.bucket)))
+
+    def envelope(self, start: float, end: float, columns: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the waveform envelope of a time range.
+
+        Args:
+            start: Range start in seconds
+            end: Range end in seconds
+            columns: Number of pixel columns across the range
+
+        Returns:
+            Tuple of (minimum, maximum) per column in [-1, 1]; NaN where
+            a column has no audio
+        """
+        mins = np.full(columns, np.nan, dtype=np.float32)
+        maxs = np.full(columns, np.nan, dtype=np.float32)
+        if columns <= 0 or end <= start or not self.samples:
+            return mins, maxs
+
+        level = self.level_for((end - start) / columns)
+        peaks = self.levels[level]
+        bucket_seconds = self.bucket * 2 ** level / self.sample_rate
+
+        # Bucket range of every column; only these buckets are read
+        positions = (start + np.arange(columns + 1) * ((end - start) / columns)) / bucket_seconds
+        edges = np.clip(np.floor(positions), 0, len(peaks)).astype(np.int64)
+        if bucket_seconds > (end - start) / columns:
+            # Zoomed in past level 0: each column shows the bucket it starts in
+            index = edges[:-1]
+            shown = index < len(peaks)
+            mins[shown] = peaks[index[shown], 0] / 127
+            maxs[shown] = peaks[index[shown], 1] / 127
+        else:
+            first, last = edges[0], edges[-1]
+            filled = edges[1:] > edges[:-1]
+            if first >= last or not filled.any():
+                return mins, maxs
+
+            window = peaks[first:last]
+            offsets = edges[:-1][filled] - first
+            mins[filled] = np.minimum.reduceat(window[:, 0], offsets) / 127
+            maxs[filled] = np.maximum.reduceat(window[:, 1], offsets) / 127
+
+        # A column ending part way into a bucket also shows that bucket, so
+        # its samples are drawn in every column they fall in
+        index = edges[1:]
+        straddles = (positions[1:] > index) & (index < len(peaks)) & ~np.isnan(mins)
+        mins[straddles] = np.minimum(mins[straddles], peaks[index[straddles], 0] / 127)
+        maxs[straddles] = np.maximum(maxs[straddles], peaks[index[straddles], 1] / 127)
+        return mins, maxs
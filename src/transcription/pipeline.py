@@ -0,0 +1,268 @@
+"""
+Runs the full transcription pipeline for a single audio file.
+"""
+
+import numpy as np
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from config import (
+    MIN_SAMPLE_RATE,
+    VAD_ENABLED,
+    VAD_FRAME_MS,
+    VAD_ENERGY_MARGIN_DB,
+    VAD_MIN_SPEECH_DURATION,
+    VAD_MIN_SILENCE_DURATION,
+    VAD_PADDING,
+    PARALLEL_CHUNK_SECONDS,
+    SPEAKER_MODEL,
+    CLASSIFICATION_CONFIDENCE_THRESHOLD,
+    MIN_SEGMENT_LENGTH,
+    CASCADE_CONFIDENCE_THRESHOLD,
+    CASCADE_MERGE_GAP,
+    CASCADE_PADDING,
+    SPEAKER_DIARIZATION,
+    DIARIZATION_FRAME_MS,
+    DIARIZATION_HOP_MS,
+    DIARIZATION_NUM_MFCC,
+    DIARIZATION_CONFIDENCE_THRESHOLD,
+    CHECKPOINT_ENABLED,
+    CHECKPOINT_WINDOW_SECONDS
+)
+from src.utils.artifact_cache import ArtifactCache, hash_file
+from src.utils.checkpoint import JobCheckpoint
+from src.utils.audio_store import AudioStore
+from src.utils.metrics import PipelineMetrics, MetricsSink
+from .processor import AudioProcessor
+from .transcriber import AudioTranscriber
+from .classifier import SpeakerClassifier
+from .diarization import AcousticDiarizer
+from .vad import VoiceActivityDetector, summarize_activity
+from .progress import CancellationToken, ProgressTracker
+
+class TranscriptionPipeline:
+    """Chains preprocessing, transcription and speaker classification."""
+
+    def __init__(self, cache: Optional[ArtifactCache] = None,
+                 metrics_sink: Optional[MetricsSink] = None,
+                 diarization: str = SPEAKER_DIARIZATION,
+                 checkpoints: bool = CHECKPOINT_ENABLED,
+                 audio_store: Optional[AudioStore] = None):
+        """
+        Initialize the pipeline stages with the shared models.
+
+        Args:
+            cache: Artifact cache for stage outputs; a default one if omitted
+            metrics_sink: Destination for per-file metrics; configured default if omitted
+            diarization: "text" to classify speakers from the transcript,
+                "acoustic" to cluster voices without loading the text model
+            checkpoints: Save progress under TEMP_DIR/jobs so an interrupted
+                job resumes where it stopped when run again
+            audio_store: Store for decoded audio; a default one if omitted
+        """
+        if diarization not in ("text", "acoustic"):
+            raise ValueError(f"Unknown speaker diarization mode: {diarization}")
+        self.diarization = diarization
+        self.processor = AudioProcessor()
+        self.transcriber = AudioTranscriber()
+        self.classifier = SpeakerClassifier() if diarization == "text" else None
+        self.diarizer = AcousticDiarizer() if diarization == "acoustic" else None
+        self.vad = VoiceActivityDetector()
+        self.cache = cache if cache is not None else ArtifactCache()
+        self.metrics_sink = metrics_sink if metrics_sink is not None else MetricsSink()
+        self.checkpoints = checkpoints
+        self.audio_store = audio_store if audio_store is not None else AudioStore()
+
+    def process(self, audio_path: Path,
+                progress_callback: Optional[Callable[[float], None]] = None,
+                cancel_token: Optional[CancellationToken] = None) -> Dict:
+        """
+        Process an audio file end to end.
+
+        Stages whose inputs and parameters are unchanged are loaded from
+        the artifact cache instead of re-run. With checkpoints enabled, a
+        job interrupted earlier resumes from its last saved progress.
+
+        Args:
+            audio_path: Path to the audio file
+            progress_callback: Called with overall progress from 0 to 100
+            cancel_token: Checked between stages, decoding windows and batches
+
+        Returns:
+            Dictionary containing segments, statistics, language, duration
+            and per-stage metrics
+
+        Raises:
+            JobCancelledError: If the job was cancelled
+        """
+        tracker = ProgressTracker(progress_callback, cancel_token)
+        metrics = PipelineMetrics()
+
+        # Validate file
+        tracker.begin("validate")
+        with metrics.stage("validate_file"):
+            valid, error = self.processor.validate_file(audio_path)
+        if not valid:
+            raise ValueError(error)
+
+        params = self._stage_params()
+        # One sequential read of the file; the hash names the cache entries,
+        # the checkpoint and the decoded audio, so it is needed even with
+        # caching and checkpoints off
+        with metrics.stage("hash_file"):
+            file_hash = hash_file(audio_path)
+        keys = self._stage_keys(file_hash, params)
+        audio_key = self.audio_store.key(file_hash)
+
+        checkpoint = None
+        if self.checkpoints:
+            JobCheckpoint.prune()
+            checkpoint = JobCheckpoint.for_file(file_hash, params, cancel_token=cancel_token)
+
+        try:
+            # Transcribe audio
+            audio = None
+            transcription = self.cache.get("transcribe", keys["transcribe"])
+            if transcription is None and checkpoint is not None:
+                transcription = checkpoint.load("transcription")
+            if transcription is None:
+                tracker.begin("preprocess")
+                audio = self._load_audio(audio_path, audio_key, metrics)
+                transcription = self._transcribe(audio, tracker, metrics, checkpoint)
+                self.cache.put("transcribe", keys["transcribe"], transcription)
+                if checkpoint is not None:
+                    checkpoint.save("transcription", transcription)
+
+            # Label speakers
+            tracker.begin("classify")
+            segments = self.cache.get("classify", keys["classify"])
+            if segments is None:
+                if self.diarizer is not None:
+                    if audio is None:
+                        audio = self._load_audio(audio_path, audio_key, metrics)
+                    with metrics.stage("diarize_segments"):
+                        segments = self.diarizer.diarize(
+                            audio, transcription["segments"], tracker.update, cancel_token
+                        )
+                else:
+                    with metrics.stage("classify_segments"):
+                        segments = self.classifier.classify_segments(
+                            transcription["segments"], tracker.update, cancel_token, checkpoint
+                        )
+                self.cache.put("classify", keys["classify"], segments)
+
+            # The timeline draws the waveform from the peaks sidecar; eviction
+            # may have removed it even when every stage above was cached
+            if audio is None and not self.audio_store.sidecar(audio_key, "peaks.npz").exists():
+                audio = self._load_audio(audio_path, audio_key, metrics)
+
+            # Detect overlaps
+            with metrics.stage("detect_speaker_overlap"):
+                segments = SpeakerClassifier.detect_speaker_overlap(segments)
+
+            # Get statistics
+            with metrics.stage("get_speaker_statistics"):
+                stats = SpeakerClassifier.get_speaker_statistics(segments)
+
+            results = {
+                "segments": segments,
+                "statistics": stats,
+                "language": transcription["language"],
+                "duration": transcription["duration"],
+                # Views open the decoded audio from the store by this key
+                "audio_key": audio_key
+            }
+            if "vad" in transcription:
+                results["vad"] = transcription["vad"]
+            if "cascade" in transcription:
+                results["cascade"] = transcription["cascade"]
+
+            metrics.audio_duration = transcription["duration"]
+            results["metrics"] = metrics.to_dict()
+            if "cascade" in transcription:
+                results["metrics"]["cascade"] = transcription["cascade"]
+            self.metrics_sink.write(audio_path, results["metrics"])
+
+            if checkpoint is not None:
+                checkpoint.complete()
+        finally:
+            # Failed or cancelled jobs keep their state for a later run
+            if checkpoint is not None:
+                checkpoint.release()
+
+        tracker.end()
+        return results
+
+    def _load_audio(self, audio_path: Path, audio_key: str,
+                    metrics: PipelineMetrics) -> np.ndarray:
+        """Memory-map the decoded audio, decoding the file into the audio store if needed."""
+        with metrics.stage("preprocess_audio"):
+            return self.processor.load_decoded(audio_path, self.audio_store, audio_key)
+
+    def _transcribe(self, audio: np.ndarray, tracker: ProgressTracker,
+                    metrics: PipelineMetrics, checkpoint: Optional[JobCheckpoint] = None) -> Dict:
+        """Detect speech and transcribe preprocessed audio."""
+        # Find speech so silence and hold music are not transcribed
+        tracker.begin("vad")
+        speech_regions = None
+        if VAD_ENABLED:
+            with metrics.stage("detect_speech"):
+                speech_regions = self.vad.detect(audio)
+
+        tracker.begin("transcribe")
+        with metrics.stage("transcribe"):
+            transcription = self.transcriber.transcribe(
+                audio, speech_regions, tracker.update, tracker.cancel_token, checkpoint
+            )
+
+        if speech_regions is not None:
+            transcription["vad"] = summarize_activity(speech_regions, transcription["duration"])
+
+        return transcription
+
+    def _stage_params(self) -> Dict[str, Dict]:
+        """Get the parameters of each stage that affect its output."""
+        windowed = self.checkpoints and not self.transcriber.parallel
+        transcribe = {
+            "model": self.transcriber.model_name,
+            # Whisper decodes in fp16 on CUDA and fp32 on CPU, and the text differs
+            "device": self.transcriber.device,
+            "vad": [VAD_FRAME_MS, VAD_ENERGY_MARGIN_DB, VAD_MIN_SPEECH_DURATION,
+                    VAD_MIN_SILENCE_DURATION, VAD_PADDING] if VAD_ENABLED else None,
+            "chunk_seconds": PARALLEL_CHUNK_SECONDS if self.transcriber.parallel else None,
+            "cascade": [self.transcriber.refine_model_name, CASCADE_CONFIDENCE_THRESHOLD,
+                        CASCADE_MERGE_GAP, CASCADE_PADDING] if self.transcriber.cascade else None
+        }
+        if windowed:
+            # Checkpointed decoding splits the audio into windows, which changes the text
+            transcribe["window_seconds"] = CHECKPOINT_WINDOW_SECONDS
+        if self.diarization == "acoustic":
+            classify = {
+                "diarization": "acoustic",
+                "features": [DIARIZATION_FRAME_MS, DIARIZATION_HOP_MS, DIARIZATION_NUM_MFCC],
+                "threshold": DIARIZATION_CONFIDENCE_THRESHOLD,
+                "min_segment_length": MIN_SEGMENT_LENGTH
+            }
+        else:
+            classify = {
+                "model": SPEAKER_MODEL,
+                "quantized": self.classifier.quantized,
+                "threshold": CLASSIFICATION_CONFIDENCE_THRESHOLD,
+                "min_segment_length": MIN_SEGMENT_LENGTH
+            }
+        return {"preprocess": {"sample_rate": MIN_SAMPLE_RATE}, "transcribe": transcribe, "classify": classify}
+
+    def _stage_keys(self, file_hash: Optional[str], params: Dict[str, Dict]) -> Dict[str, Optional[str]]:
+        """
+        Build cache keys for each stage.
+
+        Each key chains the previous stage's key, so changing a stage's
+        parameters invalidates it and everything downstream only.
+        """
+        if not self.cache.enabled:
+            return {"preprocess": None, "transcribe": None, "classify": None}
+
+        preprocess = self.cache.make_key("preprocess", file_hash, params["preprocess"])
+        transcribe = self.cache.make_key("transcribe", preprocess, params["transcribe"])
+        classify = self.cache.make_key("classify", transcribe, params["classify"])
+        return {"preprocess": preprocess, "transcribe": transcribe, "classify": classify}
@@ -3,18 +3,25 @@ Handles audio preprocessing and validation.
 """
 
 import os
-import librosa
+import uuid
+import soxr
 import numpy as np
 import soundfile as sf
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, Iterator, Optional, Tuple
 
 from config import (
     SUPPORTED_FORMATS,
     MAX_FILE_SIZE,
     MIN_SAMPLE_RATE,
+    SAVE_PROCESSED_AUDIO,
+    STREAMING_THRESHOLD,
+    STREAM_BLOCK_SECONDS,
     TEMP_DIR
 )
+from src.utils.artifact_cache import hash_file
+from src.utils.audio_store import AudioStore, npy_header
+from .peaks import PeakPyramid
 
 class AudioProcessor:
     """Handles audio file preprocessing and validation."""
@@ -56,41 +63,176 @@ class AudioProcessor:
             
         return True, ""
         
-    def preprocess_audio(self, file_path: Path) -> Path:
+    def preprocess_audio(self, file_path: Path, save_copy: bool = SAVE_PROCESSED_AUDIO,
+                         output_path: Optional[Path] = None) -> np.ndarray:
         """
         Preprocess audio file for optimal transcription.
         
+        Audio is decoded once and handed to the transcriber in memory. Files
+        larger than STREAMING_THRESHOLD are decoded block by block into a
+        memory-mapped array instead.
+        
         Args:
             file_path: Path to input audio file
+            save_copy: Also write the processed audio to the temp directory
+            output_path: Also write the audio to this float32 .npy file; large
+                files are decoded straight into it
             
         Returns:
-            Path to processed audio file
+            Mono float32 audio at MIN_SAMPLE_RATE
+        """
+        if file_path.stat().st_size > STREAMING_THRESHOLD and self._can_stream(file_path):
+            audio = self.preprocess_audio_streaming(file_path, output_path=output_path)
+        else:
+            # librosa is slow to import, so load it only when needed
+            import librosa
+            
+            # Load audio, resampling and downmixing during decode
+            audio, _ = librosa.load(file_path, sr=MIN_SAMPLE_RATE, mono=True, dtype=np.float32)
+            
+            # Normalize audio
+            audio = librosa.util.normalize(audio).astype(np.float32, copy=False)
+            if output_path is not None:
+                np.save(output_path, audio, allow_pickle=False)
+            
+        # Save processed file for debugging; unique so jobs for same-named files do not collide
+        if save_copy:
+            copy_path = self.temp_dir / f"processed_{file_path.stem}_{uuid.uuid4().hex[:8]}.wav"
+            sf.write(copy_path, audio, MIN_SAMPLE_RATE)
+        
+        return audio
+        
+    def load_decoded(self, file_path: Path, store: AudioStore, key: Optional[str] = None) -> np.memmap:
         """
-        # Load audio
-        audio, sr = librosa.load(file_path, sr=None)
-        
-        # Resample if needed
-        if sr != MIN_SAMPLE_RATE:
-            audio = librosa.resample(audio, orig_sr=sr, target_sr=MIN_SAMPLE_RATE)
-            sr = MIN_SAMPLE_RATE
-            
-        # Convert to mono if stereo
-        if len(audio.shape) > 1:
-            audio = librosa.to_mono(audio)
-            
-        # Normalize audio
-        audio = librosa.util.normalize(audio)
-            
-        # Save processed file
-        output_path = self.temp_dir / f"processed_{file_path.name}"
-        sf.write(output_path, audio, sr)
-        
-        return output_path
-        
-    def cleanup(self):
-        """Clean up temporary files."""
-        for file in self.temp_dir.glob("processed_*"):
-            try:
-                file.unlink()
-            except Exception:
-                pass
\ No newline at end of file
+        Memory-map a file's decoded audio, decoding it into the store first if needed.
+        
+        The waveform peak pyramid is computed alongside and saved next to
+        the audio, so the timeline never reads the samples themselves.
+        
+        Args:
+            file_path: Path to input audio file
+            store: Audio store holding decoded recordings
+            key: Store key of the file; computed from its contents if omitted
+            
+        Returns:
+            Read-only memory-mapped mono float32 audio at MIN_SAMPLE_RATE
+        """
+        key = key or store.key(hash_file(file_path))
+        audio = store.open(key)
+        if audio is None:
+            with store.reserve(key) as output_path:
+                # Large files are decoded straight into the store entry
+                self.preprocess_audio(file_path, output_path=output_path)
+            audio = store.open(key)
+            
+        peaks_path = store.sidecar(key, "peaks.npz")
+        if audio is not None and not peaks_path.exists():
+            # Computed while the decoded samples are still in the page cache
+            PeakPyramid.from_audio(audio).save(peaks_path)
+        return audio
+        
+    def iter_audio_blocks(self, file_path: Path,
+                          block_seconds: float = STREAM_BLOCK_SECONDS) -> Iterator[np.ndarray]:
+        """
+        Decode, downmix and resample audio block by block.
+        
+        Memory use is bounded by the block size regardless of file length.
+        Blocks are not normalized.
+        
+        Args:
+            file_path: Path to input audio file
+            block_seconds: Length of each decoded block in seconds
+            
+        Yields:
+            Mono float32 blocks at MIN_SAMPLE_RATE
+        """
+        info = sf.info(file_path)
+        block_frames = max(1, int(block_seconds * info.samplerate))
+        
+        # Stateful resampler so block edges do not introduce artifacts
+        resampler = None
+        if info.samplerate != MIN_SAMPLE_RATE:
+            resampler = soxr.ResampleStream(info.samplerate, MIN_SAMPLE_RATE, 1, dtype="float32")
+            
+        for block in sf.blocks(str(file_path), blocksize=block_frames, dtype="float32", always_2d=True):
+            mono = block.mean(axis=1, dtype=np.float32)
+            if resampler is not None:
+                mono = resampler.resample_chunk(mono)
+            if mono.size:
+                yield mono
+                
+        if resampler is not None:
+            tail = resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True)
+            if tail.size:
+                yield tail
+                
+    def preprocess_audio_streaming(self, file_path: Path,
+                                   block_seconds: float = STREAM_BLOCK_SECONDS,
+                                   output_path: Optional[Path] = None) -> np.memmap:
+        """
+        Preprocess audio with bounded memory into a memory-mapped array.
+        
+        The first pass decodes to a .npy file while tracking the peak, the
+        second normalizes the mapped samples in place block by block.
+        
+        Args:
+            file_path: Path to input audio file
+            block_seconds: Length of each decoded block in seconds
+            output_path: File to decode into; a unique scratch file in the
+                temp directory, owned by the caller, if omitted
+            
+        Returns:
+            Memory-mapped mono float32 audio at MIN_SAMPLE_RATE
+        """
+        if output_path is None:
+            output_path = self.temp_dir / f"processed_{uuid.uuid4().hex}.npy"
+        
+        # First pass: decode to disk and track the peak; the length goes in the header last
+        peak = 0.0
+        length = 0
+        with open(output_path, "wb") as f:
+            f.write(npy_header(0))
+            for block in self.iter_audio_blocks(file_path, block_seconds):
+                peak = max(peak, float(np.max(np.abs(block))))
+                length += block.size
+                f.write(block.tobytes())
+            f.seek(0)
+            f.write(npy_header(length))
+                
+        if length == 0:
+            self.cleanup(output_path)
+            raise ValueError("Audio file contains no samples")
+            
+        audio = np.load(output_path, mmap_mode="r+")
+        
+        # Second pass: normalize in place
+        if peak > np.finfo(np.float32).tiny:
+            block_size = max(1, int(block_seconds * MIN_SAMPLE_RATE))
+            for start in range(0, length, block_size):
+                audio[start:start + block_size] /= peak
+            audio.flush()
+            
+        return audio
+        
+    def _can_stream(self, file_path: Path) -> bool:
+        """Check whether soundfile can decode the file block by block."""
+        try:
+            sf.info(file_path)
+            return True
+        except Exception:
+            return False
+        
+    def cleanup(self, file_path: Path):
+        """
+        Remove a scratch file.
+        
+        Only the given file is removed; other jobs' files in the temp
+        directory are left alone.
+        
+        Args:
+            file_path: Processed file to remove
+        """
+        try:
+            file_path.unlink()
+        except Exception:
+            pass
\ No newline at end of file
@@ -0,0 +1,155 @@
+"""
+Progress reporting and cooperative cancellation for pipeline jobs.
+"""
+
+import types
+import importlib
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+# Share of total job time spent in each stage, used to weight progress
+STAGE_WEIGHTS = {
+    "validate": 0.01,
+    "preprocess": 0.09,
+    "vad": 0.03,
+    "transcribe": 0.77,
+    "classify": 0.10
+}
+
+class JobCancelledError(Exception):
+    """Raised inside a job when its cancellation token has been triggered."""
+
+class CancellationToken:
+    """Thread-safe flag checked by long-running stages between units of work."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        """Request cancellation."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation has been requested."""
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        """Raise JobCancelledError if cancellation has been requested."""
+        if self._event.is_set():
+            raise JobCancelledError("Job cancelled")
+
+class ProgressTracker:
+    """Combines per-stage progress into one weighted job percentage."""
+
+    def __init__(self, callback: Optional[Callable[[float], None]] = None,
+                 cancel_token: Optional[CancellationToken] = None,
+                 weights: Optional[Dict[str, float]] = None):
+        """
+        Initialize the tracker.
+
+        Args:
+            callback: Called with overall progress from 0 to 100
+            cancel_token: Token checked on every update
+            weights: Relative stage weights; STAGE_WEIGHTS if omitted
+        """
+        self.callback = callback
+        self.cancel_token = cancel_token
+        self.weights = weights or STAGE_WEIGHTS
+        self._total = sum(self.weights.values())
+        self._done = 0.0
+        self._stage: Optional[str] = None
+        self.progress = 0.0
+
+    def begin(self, stage: str):
+        """Start a stage, completing any stage still in progress."""
+        if self._stage is not None:
+            self.end()
+        self._stage = stage
+        self.update(0.0)
+
+    def update(self, fraction: float):
+        """
+        Report progress within the current stage.
+
+        Args:
+            fraction: Stage completion from 0 to 1
+
+        Raises:
+            JobCancelledError: If the job has been cancelled
+        """
+        if self.cancel_token is not None:
+            self.cancel_token.raise_if_cancelled()
+
+        current = self.weights.get(self._stage, 0.0) * min(max(fraction, 0.0), 1.0)
+        self.progress = min(100.0, 100.0 * (self._done + current) / self._total)
+        if self.callback is not None:
+            self.callback(self.progress)
+
+    def end(self):
+        """Complete the current stage."""
+        if self._stage is None:
+            return
+        self.update(1.0)
+        self._done += self.weights.get(self._stage, 0.0)
+        self._stage = None
+
+_local = threading.local()
+
+class _DecodingProgressBar:
+    """Stand-in for tqdm inside Whisper's decoding loop."""
+
+    def __init__(self, total=None, *args, **kwargs):
+        self.total = total or 0
+        self.n = 0
+        self._hook = getattr(_local, "hook", None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def update(self, n=1):
+        """Called by Whisper after each decoded 30 second window."""
+        self.n += n
+        if self._hook is not None and self.total:
+            self._hook(self.n / self.total)
+
+    def close(self):
+        pass
+
+def _install_whisper_hook():
+    """Route Whisper's progress bar through the calling thread's hook."""
+    # whisper.transcribe is shadowed by the function of the same name
+    try:
+        whisper_transcribe = importlib.import_module("whisper.transcribe")
+    except ImportError:
+        # Stub models, e.g. the offline benchmarks, run without Whisper and
+        # report no progress within a decode
+        return
+    if not getattr(whisper_transcribe.tqdm, "_decoding_hook", False):
+        whisper_transcribe.tqdm = types.SimpleNamespace(
+            tqdm=_DecodingProgressBar,
+            _decoding_hook=True
+        )
+
+@contextmanager
+def decoding_progress(hook: Optional[Callable[[float], None]]):
+    """
+    Receive Whisper decoding progress on the current thread.
+
+    The hook is called with the decoded fraction after every window and may
+    raise JobCancelledError to stop decoding between windows.
+
+    Args:
+        hook: Callable taking the decoded fraction from 0 to 1
+    """
+    _install_whisper_hook()
+    previous = getattr(_local, "hook", None)
+    _local.hook = hook
+    try:
+        yield
+    finally:
+        _local.hook = previous
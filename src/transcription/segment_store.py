@@ -0,0 +1,415 @@
+"""
+Columnar storage for transcript segments.
+"""
+
+import numpy as np
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from config import SPEAKER_CLASSES
+from .interval_index import IntervalIndex
+
+_FIELDS = ["start", "end", "text", "confidence", "speaker", "speaker_confidence", "overlap", "overlaps"]
+
+class SegmentView(MutableMapping):
+    """
+    Dict-compatible view of one segment in a SegmentStore.
+
+    Reads and writes go straight to the store's arrays, so existing code
+    using segment["start"], segment.get("speaker") or "overlap" in segment
+    keeps working. "overlaps" is derived from the overlap pairs and is
+    read-only; use SegmentStore.set_overlaps() instead.
+    """
+
+    __slots__ = ("store", "index")
+
+    def __init__(self, store: "SegmentStore", index: int):
+        self.store = store
+        self.index = index
+
+    def __getitem__(self, key):
+        store, i = self.store, self.index
+        if key == "start":
+            return float(store.start[i])
+        if key == "end":
+            return float(store.end[i])
+        if key == "text":
+            return store.text(i)
+        if key == "confidence" and not np.isnan(store.confidence[i]):
+            return float(store.confidence[i])
+        if key == "speaker" and store.speaker[i] >= 0:
+            return store.speakers[store.speaker[i]]
+        if key == "speaker_confidence" and not np.isnan(store.speaker_confidence[i]):
+            return float(store.speaker_confidence[i])
+        if key == "overlap" and not np.isnan(store.overlap_duration[i]):
+            return {
+                "duration": float(store.overlap_duration[i]),
+                "overlaps_with": int(store.overlap_with[i])
+            }
+        if key == "overlaps":
+            overlaps = store.segment_overlaps(i)
+            if overlaps:
+                return overlaps
+        extras = store.extras.get(i)
+        if extras and key in extras:
+            return extras[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        store, i = self.store, self.index
+        if key in ("start", "end"):
+            getattr(store, key)[i] = value
+            store._interval_index = None
+        elif key in ("confidence", "speaker_confidence"):
+            getattr(store, key)[i] = value
+        elif key == "speaker":
+            store.speaker[i] = store.speaker_code(value)
+        elif key == "overlap":
+            store.overlap_duration[i] = value["duration"]
+            store.overlap_with[i] = value["overlaps_with"]
+        elif key == "text":
+            store.set_text(i, value)
+        elif key == "overlaps":
+            raise TypeError("Segment overlaps are read-only; use SegmentStore.set_overlaps()")
+        else:
+            store.extras.setdefault(i, {})[key] = value
+
+    def __delitem__(self, key):
+        store, i = self.store, self.index
+        if key == "overlap":
+            store.overlap_duration[i] = np.nan
+            store.overlap_with[i] = -1
+        elif key == "speaker":
+            store.speaker[i] = -1
+        elif key in ("confidence", "speaker_confidence"):
+            getattr(store, key)[i] = np.nan
+        elif key in store.extras.get(i, {}):
+            del store.extras[i][key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in _FIELDS:
+            if key in self:
+                yield key
+        yield from self.store.extras.get(self.index, {})
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+class SegmentStore:
+    """
+    Struct-of-arrays container for transcript segments.
+
+    Times, confidences and speaker ids live in NumPy arrays and all texts in
+    one string with offsets, which takes a fraction of the memory of a list
+    of dicts and lets statistics and range queries run vectorized. Indexing
+    and iteration yield SegmentView objects for dict-style callers.
+    """
+
+    def __init__(self, speakers: Optional[List[str]] = None):
+        """
+        Create an empty store.
+
+        Args:
+            speakers: Speaker labels; SPEAKER_CLASSES if omitted
+        """
+        self.speakers: List[str] = list(speakers or SPEAKER_CLASSES)
+        self.start = np.zeros(0, dtype=np.float64)
+        self.end = np.zeros(0, dtype=np.float64)
+        self.confidence = np.zeros(0, dtype=np.float64)
+        self.speaker = np.zeros(0, dtype=np.int8)
+        self.speaker_confidence = np.zeros(0, dtype=np.float64)
+        self.overlap_duration = np.zeros(0, dtype=np.float64)
+        self.overlap_with = np.zeros(0, dtype=np.int32)
+        self.overlap_pairs = np.zeros((0, 2), dtype=np.int64)
+        self.overlap_pair_duration = np.zeros(0, dtype=np.float64)
+        self.word_count = np.zeros(0, dtype=np.int32)
+        self.text_buffer = ""
+        self.text_offsets = np.zeros(1, dtype=np.int64)
+        self.extras: Dict[int, Dict] = {}
+        self._interval_index: Optional[IntervalIndex] = None
+        self._overlap_lookup = None
+
+    @classmethod
+    def from_dicts(cls, segments: Iterable[Dict], speakers: Optional[List[str]] = None) -> "SegmentStore":
+        """
+        Build a store from segment dictionaries.
+
+        Args:
+            segments: Segments as produced by the transcriber or classifier
+            speakers: Speaker labels; SPEAKER_CLASSES if omitted
+
+        Returns:
+            New store
+        """
+        if isinstance(segments, SegmentStore):
+            return segments
+        store = cls(speakers)
+        store.extend(segments)
+        return store
+
+    def extend(self, segments: Union[Iterable[Dict], "SegmentStore"]):
+        """
+        Append segments.
+
+        Args:
+            segments: Another store or segment dictionaries
+        """
+        if not isinstance(segments, SegmentStore):
+            segments = self._build(list(segments))
+        if not len(segments):
+            return
+
+        codes = np.array([self.speaker_code(label) for label in segments.speakers] + [-1], dtype=np.int8)
+        first = len(self)
+        self.start = np.concatenate((self.start, segments.start))
+        self.end = np.concatenate((self.end, segments.end))
+        self.confidence = np.concatenate((self.confidence, segments.confidence))
+        self.speaker = np.concatenate((self.speaker, codes[segments.speaker]))
+        self.speaker_confidence = np.concatenate((self.speaker_confidence, segments.speaker_confidence))
+        self.overlap_duration = np.concatenate((self.overlap_duration, segments.overlap_duration))
+        self.overlap_with = np.concatenate((
+            self.overlap_with,
+            np.where(segments.overlap_with >= 0, segments.overlap_with + first, -1)
+        ))
+        self.overlap_pairs = np.concatenate((self.overlap_pairs, segments.overlap_pairs + first))
+        self.overlap_pair_duration = np.concatenate((self.overlap_pair_duration, segments.overlap_pair_duration))
+        self.word_count = np.concatenate((self.word_count, segments.word_count))
+        self._interval_index = None
+        self._overlap_lookup = None
+        self.text_offsets = np.concatenate((
+            self.text_offsets[:-1], segments.text_offsets + len(self.text_buffer)
+        ))
+        self.text_buffer += segments.text_buffer
+        for index, extras in segments.extras.items():
+            self.extras[first + index] = dict(extras)
+
+    def speaker_code(self, label: Optional[str]) -> int:
+        """Get the id of a speaker label, registering new labels."""
+        if label is None:
+            return -1
+        if label not in self.speakers:
+            self.speakers.append(label)
+        return self.speakers.index(label)
+
+    def text(self, index: int) -> str:
+        """Get the text of one segment."""
+        return self.text_buffer[self.text_offsets[index]:self.text_offsets[index + 1]]
+
+    def set_text(self, index: int, text: str):
+        """
+        Replace the text of one segment.
+
+        The shared text buffer is rebuilt, so each call costs time in
+        proportion to the whole transcript; build a new store for bulk edits.
+
+        Args:
+            index: Segment index
+            text: New text
+        """
+        first, last = int(self.text_offsets[index]), int(self.text_offsets[index + 1])
+        # Replace rather than modify the arrays so copies keep their text
+        offsets = self.text_offsets.copy()
+        offsets[index + 1:] += len(text) - (last - first)
+        word_count = self.word_count.copy()
+        word_count[index] = len(text.split())
+        self.text_buffer = self.text_buffer[:first] + text + self.text_buffer[last:]
+        self.text_offsets = offsets
+        self.word_count = word_count
+
+    def texts(self) -> List[str]:
+        """Get all texts."""
+        offsets = self.text_offsets.tolist()
+        return [self.text_buffer[a:b] for a, b in zip(offsets[:-1], offsets[1:])]
+
+    def speaker_labels(self) -> List[Optional[str]]:
+        """Get the speaker label of each segment, None if unclassified."""
+        labels = self.speakers + [None]
+        return [labels[code] for code in self.speaker.tolist()]
+
+    def interval_index(self) -> IntervalIndex:
+        """Get the interval index over segment times, building it on first use."""
+        if self._interval_index is None:
+            self._interval_index = IntervalIndex(self.start, self.end)
+        return self._interval_index
+
+    def in_range(self, start: float, end: float) -> np.ndarray:
+        """
+        Find segments active in [start, end).
+
+        Returns:
+            Sorted indices of segments intersecting the range
+        """
+        return np.sort(self.interval_index().query(start, end))
+
+    def set_overlaps(self, first: np.ndarray, second: np.ndarray, durations: np.ndarray):
+        """
+        Record overlapping segment pairs.
+
+        Each segment's `overlap` becomes its longest overlap and `overlaps`
+        lists all of them.
+
+        Args:
+            first: Index of the first segment of each pair
+            second: Index of the second segment of each pair
+            durations: Overlap duration of each pair in seconds
+        """
+        self.overlap_pairs = np.stack((first, second), axis=1).astype(np.int64)
+        self.overlap_pair_duration = np.asarray(durations, dtype=np.float64)
+        self._overlap_lookup = None
+
+        # Longest overlap per segment, from both sides of every pair
+        segments = np.concatenate((first, second))
+        partners = np.concatenate((second, first))
+        both = np.concatenate((durations, durations))
+        order = np.lexsort((-both, segments))
+        unique, positions = np.unique(segments[order], return_index=True)
+        longest = order[positions]
+
+        self.overlap_duration = np.full(len(self), np.nan)
+        self.overlap_with = np.full(len(self), -1, dtype=np.int32)
+        self.overlap_duration[unique] = both[longest]
+        self.overlap_with[unique] = partners[longest]
+
+    def segment_overlaps(self, index: int) -> List[Dict]:
+        """Get every overlap of one segment, longest first."""
+        if not len(self.overlap_pairs):
+            return []
+        if self._overlap_lookup is None:
+            pairs = self.overlap_pairs
+            segments = np.concatenate((pairs[:, 0], pairs[:, 1]))
+            partners = np.concatenate((pairs[:, 1], pairs[:, 0]))
+            durations = np.concatenate((self.overlap_pair_duration, self.overlap_pair_duration))
+            order = np.lexsort((-durations, segments))
+            offsets = np.searchsorted(segments[order], np.arange(len(self) + 1))
+            self._overlap_lookup = (offsets, partners[order], durations[order])
+
+        offsets, partners, durations = self._overlap_lookup
+        return [
+            {"duration": float(duration), "overlaps_with": int(partner)}
+            for partner, duration in zip(
+                partners[offsets[index]:offsets[index + 1]],
+                durations[offsets[index]:offsets[index + 1]]
+            )
+        ]
+
+    def speaker_statistics(self) -> Dict:
+        """
+        Total time, segment count and word count per speaker.
+
+        Returns:
+            Dictionary keyed by speaker label
+        """
+        classified = self.speaker >= 0
+        codes = self.speaker[classified].astype(np.intp)
+        count = len(self.speakers)
+        total_time = np.bincount(codes, weights=(self.end - self.start)[classified], minlength=count)
+        segment_count = np.bincount(codes, minlength=count)
+        word_count = np.bincount(codes, weights=self.word_count[classified], minlength=count)
+        return {
+            label: {
+                "total_time": float(total_time[code]),
+                "segment_count": int(segment_count[code]),
+                "word_count": int(word_count[code])
+            }
+            for code, label in enumerate(self.speakers)
+        }
+
+    def copy(self) -> "SegmentStore":
+        """
+        Get a snapshot that later extend() calls on this store do not affect.
+
+        extend() replaces the arrays rather than resizing them, so the
+        snapshot can share them until either store is modified in place.
+        """
+        snapshot = SegmentStore(self.speakers)
+        snapshot.__dict__.update(self.__dict__)
+        snapshot.speakers = list(self.speakers)
+        snapshot.extras = {index: dict(extras) for index, extras in self.extras.items()}
+        return snapshot
+
+    def to_dicts(self) -> List[Dict]:
+        """Convert to plain segment dictionaries."""
+        return [dict(segment) for segment in self]
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the arrays and text."""
+        arrays = (self.start, self.end, self.confidence, self.speaker, self.speaker_confidence,
+                  self.overlap_duration, self.overlap_with, self.overlap_pairs,
+                  self.overlap_pair_duration, self.word_count, self.text_offsets)
+        return sum(array.nbytes for array in arrays) + len(self.text_buffer.encode("utf-8"))
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def __getitem__(self, index: int) -> SegmentView:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("segment index out of range")
+        return SegmentView(self, index)
+
+    def __iter__(self) -> Iterator[SegmentView]:
+        for index in range(len(self)):
+            yield SegmentView(self, index)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def _build(self, segments: List[Dict]) -> "SegmentStore":
+        """Build a store from dictionaries using this store's speaker labels."""
+        store = SegmentStore(self.speakers)
+        n = len(segments)
+
+        def column(key, dtype, missing):
+            return np.array([segment.get(key, missing) for segment in segments], dtype=dtype)
+
+        store.start = column("start", np.float64, 0.0)
+        store.end = column("end", np.float64, 0.0)
+        store.confidence = column("confidence", np.float64, np.nan)
+        store.speaker = np.array(
+            [store.speaker_code(segment.get("speaker")) for segment in segments], dtype=np.int8
+        ).reshape(n)
+        store.speaker_confidence = column("speaker_confidence", np.float64, np.nan)
+        overlaps = [segment.get("overlap") for segment in segments]
+        store.overlap_duration = np.array(
+            [np.nan if overlap is None else overlap["duration"] for overlap in overlaps], dtype=np.float64
+        ).reshape(n)
+        store.overlap_with = np.array(
+            [-1 if overlap is None else overlap["overlaps_with"] for overlap in overlaps], dtype=np.int32
+        ).reshape(n)
+
+        texts = [segment["text"] for segment in segments]
+        store.word_count = np.array([len(text.split()) for text in texts], dtype=np.int32).reshape(n)
+        store.text_buffer = "".join(texts)
+        store.text_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum([len(text) for text in texts], out=store.text_offsets[1:])
+
+        for index, segment in enumerate(segments):
+            extras = {key: value for key, value in segment.items() if key not in _FIELDS}
+            if extras:
+                store.extras[index] = extras
+
+        # Rebuild the pair list from exported overlap lists
+        pairs = [
+            (index, overlap["overlaps_with"], overlap["duration"])
+            for index, segment in enumerate(segments)
+            for overlap in segment.get("overlaps", [])
+            if index < overlap["overlaps_with"]
+        ]
+        if pairs:
+            first, second, durations = (np.array(column) for column in zip(*pairs))
+            store.set_overlaps(first, second, durations)
+        return store
@@ -0,0 +1,351 @@
+"""
+Live transcription of audio arriving from a microphone or a growing file.
+"""
+
+import time
+import struct
+import queue
+import soxr
+import numpy as np
+import soundfile as sf
+from pathlib import Path
+from typing import Callable, Optional
+
+from config import (
+    MIN_SAMPLE_RATE,
+    STREAM_WINDOW_SECONDS,
+    STREAM_STEP_SECONDS,
+    STREAM_COMMIT_MARGIN,
+    STREAM_BUFFER_SECONDS
+)
+from .transcriber import AudioTranscriber
+from .classifier import SpeakerClassifier
+from .progress import CancellationToken
+from .segment_store import SegmentStore
+
+def wav_data_offset(f) -> int:
+    """
+    Find where the samples start in a WAV file.
+
+    Walks the RIFF chunk list (4-byte id, little-endian uint32 size, data
+    padded to an even length) until the data chunk, so metadata chunks of
+    any size before it are skipped.
+
+    Args:
+        f: WAV file opened in binary mode
+
+    Returns:
+        Byte offset of the first sample
+
+    Raises:
+        ValueError: If the file is not a RIFF WAVE file or has no data chunk
+    """
+    f.seek(0)
+    riff = f.read(12)
+    if len(riff) < 12 or riff[:4] not in (b"RIFF", b"RF64") or riff[8:12] != b"WAVE":
+        raise ValueError("Not a RIFF WAVE file")
+
+    position = 12
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            raise ValueError("WAV data chunk not found")
+        chunk_id, size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+        if chunk_id == b"data":
+            # The data size is not final while the file is being written
+            return position + 8
+        position += 8 + size + (size & 1)
+        f.seek(position)
+
+class GrowingFileSource:
+    """Reads PCM audio appended to a WAV or raw file while it is being written."""
+
+    def __init__(self, file_path: Path, sample_rate: Optional[int] = None,
+                 channels: int = 1, dtype: str = "int16"):
+        """
+        Initialize the source.
+
+        WAV headers are parsed for format and data offset; the header's data
+        length is ignored because recorders only fix it up when they finish.
+
+        Args:
+            file_path: File being written
+            sample_rate: Sample rate of raw files; read from the header for WAV
+            channels: Channel count of raw files
+            dtype: Sample type of raw files ("int16" or "float32")
+        """
+        self.file_path = Path(file_path)
+        self.offset = 0
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.dtype = np.dtype(dtype)
+
+        if self.file_path.suffix.lower() == ".wav":
+            self._read_wav_header()
+        if self.sample_rate is None:
+            raise ValueError("Sample rate is required for raw audio files")
+
+        self._frame_bytes = self.dtype.itemsize * self.channels
+        self._handle = open(self.file_path, "rb")
+        self._handle.seek(self.offset)
+
+    def read(self, timeout: float = 0.5) -> Optional[np.ndarray]:
+        """
+        Read audio appended since the last call.
+
+        Args:
+            timeout: Seconds to wait when no new audio is available
+
+        Returns:
+            Mono float32 samples at the source rate, or None if nothing arrived
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            available = self.file_path.stat().st_size - self._handle.tell()
+            frames = available // self._frame_bytes
+            if frames > 0:
+                data = self._handle.read(frames * self._frame_bytes)
+                samples = np.frombuffer(data, dtype=self.dtype).reshape(-1, self.channels)
+                if self.dtype.kind == "i":
+                    samples = samples.astype(np.float32) / np.iinfo(self.dtype).max
+                return samples.mean(axis=1, dtype=np.float32)
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0.05)
+
+    def close(self):
+        """Close the file."""
+        self._handle.close()
+
+    def _read_wav_header(self):
+        """Get format and data offset from the WAV header."""
+        info = sf.info(self.file_path)
+        self.sample_rate = info.samplerate
+        self.channels = info.channels
+        subtypes = {"PCM_16": "int16", "PCM_32": "int32", "FLOAT": "float32"}
+        if info.subtype not in subtypes:
+            raise ValueError(f"Unsupported WAV subtype for live reading: {info.subtype}")
+        self.dtype = np.dtype(subtypes[info.subtype])
+
+        with open(self.file_path, "rb") as f:
+            self.offset = wav_data_offset(f)
+
+class MicrophoneSource:
+    """Captures audio from a local input device."""
+
+    def __init__(self, device: Optional[int] = None, sample_rate: int = MIN_SAMPLE_RATE):
+        """
+        Initialize and start the capture stream.
+
+        Args:
+            device: Input device index; the system default if omitted
+            sample_rate: Capture sample rate
+        """
+        try:
+            import sounddevice
+        except ImportError:
+            raise RuntimeError("Live microphone capture requires the 'sounddevice' package")
+
+        self.sample_rate = sample_rate
+        self._queue: "queue.Queue[np.ndarray]" = queue.Queue()
+        self._stream = sounddevice.InputStream(
+            device=device,
+            samplerate=sample_rate,
+            channels=1,
+            dtype="float32",
+            callback=self._on_audio
+        )
+        self._stream.start()
+
+    def read(self, timeout: float = 0.5) -> Optional[np.ndarray]:
+        """
+        Read captured audio.
+
+        Args:
+            timeout: Seconds to wait for audio
+
+        Returns:
+            Mono float32 samples, or None if nothing arrived
+        """
+        try:
+            blocks = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return None
+        while not self._queue.empty():
+            blocks.append(self._queue.get_nowait())
+        return np.concatenate(blocks)
+
+    def close(self):
+        """Stop capturing."""
+        self._stream.stop()
+        self._stream.close()
+
+    def _on_audio(self, indata, frames, time_info, status):
+        self._queue.put(indata[:, 0].copy())
+
+class RollingBuffer:
+    """Fixed-capacity audio buffer addressed by absolute sample index."""
+
+    def __init__(self, capacity: int):
+        """
+        Initialize the buffer.
+
+        Args:
+            capacity: Maximum number of samples retained
+        """
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self.end = 0
+
+    @property
+    def start(self) -> int:
+        """Absolute index of the oldest retained sample."""
+        return max(0, self.end - self.capacity)
+
+    def append(self, samples: np.ndarray):
+        """Append samples, discarding the oldest beyond capacity."""
+        samples = samples[-self.capacity:]
+        position = self.end % self.capacity
+        first = min(len(samples), self.capacity - position)
+        self._data[position:position + first] = samples[:first]
+        self._data[:len(samples) - first] = samples[first:]
+        self.end += len(samples)
+
+    def get(self, start: int, end: int) -> np.ndarray:
+        """
+        Copy out samples in [start, end).
+
+        Args:
+            start: Absolute start index, clamped to the retained range
+            end: Absolute end index, clamped to the retained range
+        """
+        start, end = max(start, self.start), min(end, self.end)
+        if end <= start:
+            return np.zeros(0, dtype=np.float32)
+        indices = np.arange(start, end) % self.capacity
+        return self._data[indices]
+
+class StreamingTranscriber:
+    """Transcribes a live stream in overlapping windows and commits stable segments."""
+
+    def __init__(self, transcriber: Optional[AudioTranscriber] = None,
+                 classifier: Optional[SpeakerClassifier] = None,
+                 window_seconds: float = STREAM_WINDOW_SECONDS,
+                 step_seconds: float = STREAM_STEP_SECONDS,
+                 commit_margin: float = STREAM_COMMIT_MARGIN):
+        """
+        Initialize the streaming transcriber.
+
+        Args:
+            transcriber: Transcriber to use; one sharing the registry's model if omitted
+            classifier: Speaker classifier; one sharing the registry's model if omitted
+            window_seconds: Maximum audio re-transcribed per step
+            step_seconds: New audio required before the next step
+            commit_margin: Segments ending this close to the live edge stay provisional
+        """
+        self.transcriber = transcriber or AudioTranscriber(parallel=False)
+        self.classifier = classifier or SpeakerClassifier()
+        self.window_seconds = window_seconds
+        self.step_seconds = step_seconds
+        self.commit_margin = commit_margin
+        self.buffer = RollingBuffer(int(STREAM_BUFFER_SECONDS * MIN_SAMPLE_RATE))
+        self.committed_until = 0.0
+        self.committed = SegmentStore()
+        self._last_step_end = 0
+
+    @property
+    def duration(self) -> float:
+        """Seconds of audio received so far."""
+        return self.buffer.end / MIN_SAMPLE_RATE
+
+    def feed(self, samples: np.ndarray) -> SegmentStore:
+        """
+        Add 16 kHz audio and transcribe if enough new audio has arrived.
+
+        Args:
+            samples: Mono float32 samples at MIN_SAMPLE_RATE
+
+        Returns:
+            Segments committed by this call
+        """
+        self.buffer.append(samples)
+        if (self.buffer.end - self._last_step_end) < self.step_seconds * MIN_SAMPLE_RATE:
+            return SegmentStore()
+        return self.step()
+
+    def step(self, final: bool = False) -> SegmentStore:
+        """
+        Transcribe the uncommitted tail and commit segments that are stable.
+
+        Only audio after the last committed segment is re-transcribed, capped
+        at window_seconds, so the cost per step does not grow with history.
+
+        Args:
+            final: Commit everything, e.g. when the stream ends
+
+        Returns:
+            Newly committed, speaker-classified segments
+        """
+        self._last_step_end = self.buffer.end
+        live_edge = self.duration
+        window_start = max(self.committed_until, live_edge - self.window_seconds)
+        audio = self.buffer.get(int(window_start * MIN_SAMPLE_RATE), self.buffer.end)
+        if not len(audio):
+            return SegmentStore()
+
+        transcription = self.transcriber.transcribe(audio)
+
+        stable_until = live_edge if final else live_edge - self.commit_margin
+        new_segments = []
+        for segment in transcription["segments"]:
+            start = segment["start"] + window_start
+            end = segment["end"] + window_start
+            if end > stable_until:
+                break
+            if start >= self.committed_until - 0.01 and segment["text"]:
+                new_segments.append({**segment, "start": start, "end": end})
+
+        if new_segments:
+            self.committed_until = new_segments[-1]["end"]
+        elif window_start + self.window_seconds <= live_edge + self.step_seconds:
+            # A full window without stable speech: move on so latency stays bounded
+            self.committed_until = max(self.committed_until, stable_until)
+
+        classified = self.classifier.classify_segments(new_segments)
+        self.committed.extend(classified)
+        return classified
+
+    def run(self, source, on_segments: Callable[[SegmentStore], None],
+            cancel_token: Optional[CancellationToken] = None):
+        """
+        Consume a source until cancelled, reporting committed segments.
+
+        Args:
+            source: GrowingFileSource, MicrophoneSource or any object with
+                read(timeout), sample_rate and close()
+            on_segments: Called with each batch of committed segments
+            cancel_token: Stops the stream when cancelled
+        """
+        resampler = None
+        if source.sample_rate != MIN_SAMPLE_RATE:
+            resampler = soxr.ResampleStream(source.sample_rate, MIN_SAMPLE_RATE, 1, dtype="float32")
+
+        try:
+            while cancel_token is None or not cancel_token.cancelled:
+                samples = source.read(timeout=0.5)
+                if samples is None or not len(samples):
+                    continue
+                if resampler is not None:
+                    samples = resampler.resample_chunk(samples)
+                segments = self.feed(samples)
+                if segments:
+                    on_segments(segments)
+
+            # Flush whatever is left once the stream stops
+            if resampler is not None:
+                self.buffer.append(resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True))
+            segments = self.step(final=True)
+            if segments:
+                on_segments(segments)
+        finally:
+            source.close()
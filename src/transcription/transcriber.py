@@ -3,68 +3,411 @@ Handles audio transcription using Whisper model.
 """
 
 import os
-import torch
-import whisper
+import tempfile
+import threading
 import numpy as np
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional, Union
 
-from config import WHISPER_MODEL, DEVICE, MIN_SAMPLE_RATE
+from config import (
+    WHISPER_MODEL,
+    MIN_SAMPLE_RATE,
+    PARALLEL_TRANSCRIPTION,
+    PARALLEL_MIN_DURATION,
+    TRANSCRIPTION_WORKERS,
+    CASCADE_TRANSCRIPTION,
+    CASCADE_FAST_MODEL,
+    CASCADE_ACCURATE_MODEL,
+    CASCADE_CONFIDENCE_THRESHOLD,
+    CASCADE_MERGE_GAP,
+    CASCADE_PADDING,
+    CHECKPOINT_WINDOW_SECONDS,
+    CHECKPOINT_PROMPT_CHARS,
+    TEMP_DIR,
+    get_device
+)
+from src.utils.checkpoint import JobCheckpoint
+from src.utils.audio_store import AudioStore, time_slice
+from .model_registry import get_model_registry
+from .chunking import find_split_points, transcribe_in_chunks
+from .processor import AudioProcessor
+from .vad import extract_speech
+from .progress import CancellationToken, JobCancelledError, decoding_progress
 
 class AudioTranscriber:
     """Handles audio transcription using the Whisper model."""
     
-    def __init__(self):
-        """Initialize the transcriber with Whisper model."""
-        self.model = whisper.load_model(WHISPER_MODEL, device=DEVICE)
+    def __init__(self, model_name: Optional[str] = None, device: Optional[str] = None,
+                 parallel: bool = PARALLEL_TRANSCRIPTION, cascade: bool = CASCADE_TRANSCRIPTION,
+                 refine_model_name: str = CASCADE_ACCURATE_MODEL):
+        """
+        Initialize the transcriber with the shared Whisper model.
+        
+        Args:
+            model_name: Whisper model size; WHISPER_MODEL, or CASCADE_FAST_MODEL
+                in cascade mode, if omitted
+            device: Device to run the model on; detected if omitted
+            parallel: Transcribe long recordings as concurrent chunks
+            cascade: Re-decode low-confidence segments with refine_model_name
+            refine_model_name: Whisper model size for the second pass
+        """
+        self.model_name = model_name or (CASCADE_FAST_MODEL if cascade else WHISPER_MODEL)
+        self.device = device or get_device()
+        self.parallel = parallel
+        self.cascade = cascade
+        self.model = get_model_registry().get("whisper", self.model_name, self.device)
+        self._model_lock = get_model_registry().inference_lock("whisper", self.model_name, self.device)
+        
+        # Both cascade models stay resident in the registry between jobs
+        self.refine_model_name = refine_model_name if cascade else None
+        self.refine_model = None
+        self._refine_lock = None
+        if cascade:
+            self.refine_model = get_model_registry().get("whisper", refine_model_name, self.device)
+            self._refine_lock = get_model_registry().inference_lock("whisper", refine_model_name, self.device)
         self.audio_duration = 0
+        self._progress = 0.0
         
-    def transcribe(self, audio_path: Path) -> Dict:
+    def transcribe(self, audio: Union[np.ndarray, Path],
+                   speech_regions: Optional[List[Tuple[float, float]]] = None,
+                   progress_callback: Optional[Callable[[float], None]] = None,
+                   cancel_token: Optional[CancellationToken] = None,
+                   checkpoint: Optional[JobCheckpoint] = None) -> Dict:
         """
-        Transcribe audio file using Whisper model.
+        Transcribe audio using Whisper model.
+        
+        With a checkpoint, audio is decoded in windows of about
+        CHECKPOINT_WINDOW_SECONDS and progress is saved after each one, so
+        an interrupted job resumes from its last completed window.
         
         Args:
-            audio_path: Path to the audio file
+            audio: Mono float32 audio at MIN_SAMPLE_RATE, or a path to an audio file
+            speech_regions: Optional (start, end) seconds to transcribe; everything
+                else is skipped and timestamps are mapped back to the full audio
+            progress_callback: Called with the decoded fraction after each window
+            cancel_token: Checked between decoding windows
+            checkpoint: Job checkpoint to resume from and save progress to
             
         Returns:
             Dictionary containing transcription segments with timestamps
         """
+        self._progress = 0.0
+        # In cascade mode the first pass reports up to 80%, re-decoding the rest
+        first_pass_share = 0.8 if self.cascade else 1.0
+        
+        def on_window(fraction: float):
+            self._progress = fraction
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            if progress_callback is not None:
+                progress_callback(fraction)
+                
+        speech_path = None
         try:
-            # Load and process audio
-            audio = whisper.load_audio(str(audio_path))
+            # Decode only when given a file, once into the audio store; preprocessed audio is used as-is
+            if not isinstance(audio, np.ndarray):
+                audio = AudioProcessor().load_decoded(Path(audio), AudioStore())
+            audio = audio.astype(np.float32, copy=False)
             self.audio_duration = len(audio) / MIN_SAMPLE_RATE
             
-            # Perform transcription
+            # Keep only speech when voice activity regions are given
+            timeline = None
+            if speech_regions is not None:
+                if not speech_regions:
+                    return {"segments": [], "language": None, "duration": self.audio_duration}
+                if isinstance(audio, np.memmap):
+                    # Keep the speech track on disk as well instead of copying it into memory
+                    fd, speech_path = tempfile.mkstemp(dir=TEMP_DIR, prefix="speech_", suffix=".npy")
+                    os.close(fd)
+                audio, timeline = extract_speech(audio, speech_regions, output_path=speech_path)
+            
+            # Perform transcription, splitting long recordings across processes
+            if self.parallel and len(audio) >= PARALLEL_MIN_DURATION * MIN_SAMPLE_RATE:
+                processed_segments, language = transcribe_in_chunks(
+                    audio, self.model_name, self.device, TRANSCRIPTION_WORKERS,
+                    lambda fraction: on_window(fraction * first_pass_share), checkpoint
+                )
+            elif checkpoint is not None:
+                processed_segments, language = self._transcribe_windows(
+                    audio, checkpoint, lambda fraction: on_window(fraction * first_pass_share)
+                )
+            else:
+                processed_segments, language = self._transcribe_array(
+                    audio, lambda fraction: on_window(fraction * first_pass_share)
+                )
+                
+            cascade_stats = None
+            if self.cascade:
+                processed_segments, cascade_stats = self._refine_segments(
+                    audio, processed_segments, language,
+                    lambda fraction: on_window(first_pass_share + fraction * (1 - first_pass_share)),
+                    checkpoint
+                )
+            
+            if timeline is not None:
+                for segment in processed_segments:
+                    segment["start"] = timeline.to_original(segment["start"])
+                    segment["end"] = timeline.to_original(segment["end"])
+            
+            result = {
+                "segments": processed_segments,
+                "language": language,
+                "duration": self.audio_duration
+            }
+            if cascade_stats is not None:
+                result["cascade"] = cascade_stats
+            return result
+            
+        except JobCancelledError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Transcription failed: {str(e)}")
+        finally:
+            if speech_path is not None:
+                audio = None
+                try:
+                    os.unlink(speech_path)
+                except OSError:
+                    # Still mapped on Windows; the file is left in TEMP_DIR
+                    pass
+            
+    def _transcribe_array(self, audio: np.ndarray,
+                          on_window: Optional[Callable[[float], None]] = None) -> Tuple[List[Dict], str]:
+        """
+        Transcribe audio with a single model call.
+        
+        Args:
+            audio: Mono float32 audio at MIN_SAMPLE_RATE
+            on_window: Called with the decoded fraction after each 30s window
+            
+        Returns:
+            Tuple of (formatted segments, detected language)
+        """
+        waiting = (lambda: on_window(0.0)) if on_window is not None else None
+        with self._acquire(self._model_lock, waiting), decoding_progress(on_window):
             result = self.model.transcribe(
                 audio,
                 task="transcribe",
-                fp16=torch.cuda.is_available(),
+                fp16=self.device == "cuda",
                 language=None,  # Auto-detect language
                 verbose=False
             )
+        
+        # Process and format results
+        segments = [self._format_segment(segment) for segment in result["segments"]]
+        return segments, result["language"]
+            
+    def _transcribe_windows(self, audio: np.ndarray, checkpoint: JobCheckpoint,
+                            on_window: Optional[Callable[[float], None]] = None) -> Tuple[List[Dict], str]:
+        """
+        Transcribe audio window by window, checkpointing after each one.
+        
+        Windows end at quiet points, so no word is cut. The language found
+        in the first window and the tail of the text so far are carried
+        into the next window as decoder state, and saved with the segments.
+        Resuming replays the same windows with the same state, so the
+        result matches an uninterrupted run.
+        
+        Args:
+            audio: Mono float32 audio at MIN_SAMPLE_RATE
+            checkpoint: Job checkpoint to resume from and save progress to
+            on_window: Called with the decoded fraction after each 30s window
+            
+        Returns:
+            Tuple of (formatted segments, detected language)
+        """
+        boundaries = find_split_points(audio, CHECKPOINT_WINDOW_SECONDS)
+        state = checkpoint.load("transcribe")
+        if state is None or state["boundaries"] != boundaries:
+            state = {"boundaries": boundaries, "windows": 0, "segments": [],
+                     "language": None, "prompt": None}
             
-            # Process and format results
-            processed_segments = []
+        total = max(1, len(audio))
+        for index in range(state["windows"], len(boundaries) - 1):
+            start, end = boundaries[index], boundaries[index + 1]
+            offset, limit = start / MIN_SAMPLE_RATE, end / MIN_SAMPLE_RATE
+            
+            window_progress = None
+            if on_window is not None:
+                window_progress = lambda fraction, start=start, end=end: \
+                    on_window((start + fraction * (end - start)) / total)
+                window_progress(0.0)
+                
+            waiting = (lambda: window_progress(0.0)) if window_progress is not None else None
+            with self._acquire(self._model_lock, waiting), decoding_progress(window_progress):
+                result = self.model.transcribe(
+                    np.array(audio[start:end], dtype=np.float32),
+                    task="transcribe",
+                    fp16=self.device == "cuda",
+                    language=state["language"],  # Auto-detected in the first window
+                    initial_prompt=state["prompt"],
+                    verbose=False
+                )
+                
+            segments = []
             for segment in result["segments"]:
-                processed_segments.append({
-                    "start": segment["start"],
-                    "end": segment["end"],
-                    "text": segment["text"].strip(),
-                    "confidence": float(segment["confidence"])
-                })
-            
-            return {
-                "segments": processed_segments,
-                "language": result["language"],
-                "duration": self.audio_duration
-            }
+                segment = self._format_segment(segment)
+                segment["start"] = min(segment["start"] + offset, limit)
+                segment["end"] = min(segment["end"] + offset, limit)
+                segments.append(segment)
+                
+            state["segments"].extend(segments)
+            state["language"] = state["language"] or result["language"]
+            state["prompt"] = self._prompt_context(state["prompt"], segments)
+            state["windows"] = index + 1
+            checkpoint.save("transcribe", state)
             
-        except Exception as e:
-            raise RuntimeError(f"Transcription failed: {str(e)}")
+        return state["segments"], state["language"]
+        
+    @staticmethod
+    def _prompt_context(prompt: Optional[str], segments: List[Dict]) -> Optional[str]:
+        """Append a window's text to the decoder prompt, keeping whole words of the tail."""
+        text = " ".join(filter(None, [prompt] + [segment["text"] for segment in segments]))
+        if len(text) > CHECKPOINT_PROMPT_CHARS:
+            text = text[-CHECKPOINT_PROMPT_CHARS:]
+            text = text[text.find(" ") + 1:] if " " in text else text
+        return text or None
+            
+    def _refine_segments(self, audio: np.ndarray, segments: List[Dict], language: Optional[str],
+                         on_window: Optional[Callable[[float], None]] = None,
+                         checkpoint: Optional[JobCheckpoint] = None) -> Tuple[List[Dict], Dict]:
+        """
+        Re-decode low-confidence segments with the accurate model.
+        
+        Neighbouring low-confidence segments are merged into spans and padded
+        with a little context, without reaching into confident neighbours.
+        Each span's new segments replace the old ones by timestamp.
+        
+        Args:
+            audio: Audio the segments were decoded from
+            segments: First-pass segments, in time order
+            language: Language detected by the first pass
+            on_window: Called with the re-decoded fraction after each span
+            checkpoint: Job checkpoint to resume from and save progress to
+            
+        Returns:
+            Tuple of (merged segments in time order, cascade report)
+        """
+        audio_seconds = len(audio) / MIN_SAMPLE_RATE
+        spans = [span for span in self._low_confidence_spans(segments, audio_seconds)
+                 if span[1] > span[0]]
+        refined_seconds = sum(end - start for start, end, _ in spans)
+        
+        # Spans are replaced back to front, so earlier indices stay valid on resume
+        state = checkpoint.load("refine") if checkpoint is not None else None
+        if state is None or state["segments"] != len(segments):
+            state = {"segments": len(segments), "spans": 0, "merged": list(segments),
+                     "refined_segments": 0, "done": 0.0}
+        merged = state["merged"]
+        refined_segments = state["refined_segments"]
+        done = state["done"]
+        for start, end, replaced in list(reversed(spans))[state["spans"]:]:
+            span_audio = time_slice(audio, start, end)
+            waiting = (lambda: on_window(done / refined_seconds)) if on_window is not None else None
+            with self._acquire(self._refine_lock, waiting):
+                result = self.refine_model.transcribe(
+                    span_audio,
+                    task="transcribe",
+                    fp16=self.device == "cuda",
+                    language=language,
+                    condition_on_previous_text=False,
+                    verbose=None
+                )
+            
+            # Keep new segments centred inside the span; padding belongs to the neighbours
+            first, last = replaced
+            replacement = []
+            for segment in result["segments"]:
+                segment = self._format_segment(segment)
+                segment["start"] = min(segment["start"] + start, end)
+                segment["end"] = min(segment["end"] + start, end)
+                centre = (segment["start"] + segment["end"]) / 2
+                if segment["text"] and segments[first]["start"] <= centre <= segments[last - 1]["end"]:
+                    replacement.append(segment)
+            merged[first:last] = replacement
+            refined_segments += last - first
+            
+            done += end - start
+            if checkpoint is not None:
+                state.update(spans=state["spans"] + 1, refined_segments=refined_segments, done=done)
+                checkpoint.save("refine", state)
+            if on_window is not None:
+                on_window(done / refined_seconds)
+                
+        report = {
+            "fast_model": self.model_name,
+            "accurate_model": self.refine_model_name,
+            "segments": len(segments),
+            "refined_segments": refined_segments,
+            "audio_seconds": audio_seconds,
+            "refined_seconds": refined_seconds,
+            "refined_fraction": refined_seconds / audio_seconds if audio_seconds else 0.0
+        }
+        return merged, report
+        
+    @staticmethod
+    @contextmanager
+    def _acquire(lock: threading.Lock, waiting: Optional[Callable[[], None]] = None):
+        """
+        Hold a model's inference lock, staying cancellable while waiting.
+        
+        Args:
+            lock: Inference lock from the model registry
+            waiting: Called periodically while another job holds the model;
+                may raise JobCancelledError to give up
+        """
+        while not lock.acquire(timeout=0.2):
+            if waiting is not None:
+                waiting()
+        try:
+            yield
+        finally:
+            lock.release()
+        
+    @staticmethod
+    def _low_confidence_spans(segments: List[Dict],
+                              duration: float) -> List[Tuple[float, float, Tuple[int, int]]]:
+        """
+        Group low-confidence segments into padded spans to re-decode.
+        
+        Returns:
+            List of (start, end, (first, last) segment index range) in time order
+        """
+        groups = []
+        for i, segment in enumerate(segments):
+            if segment["confidence"] >= CASCADE_CONFIDENCE_THRESHOLD:
+                continue
+            if groups and groups[-1][1] == i and \
+                    segment["start"] - segments[i - 1]["end"] <= CASCADE_MERGE_GAP:
+                groups[-1][1] = i + 1
+            else:
+                groups.append([i, i + 1])
+                
+        spans = []
+        for first, last in groups:
+            lower = segments[first - 1]["end"] if first > 0 else 0.0
+            upper = segments[last]["start"] if last < len(segments) else duration
+            start = max(lower, segments[first]["start"] - CASCADE_PADDING)
+            end = min(upper, segments[last - 1]["end"] + CASCADE_PADDING)
+            spans.append((start, end, (first, last)))
+        return spans
+        
+    @staticmethod
+    def _format_segment(segment: Dict) -> Dict:
+        """Convert a Whisper segment into the pipeline's segment format."""
+        # Whisper reports the average token log-probability rather than a confidence
+        confidence = segment.get("confidence")
+        if confidence is None:
+            confidence = np.exp(segment["avg_logprob"])
+        return {
+            "start": segment["start"],
+            "end": segment["end"],
+            "text": segment["text"].strip(),
+            "confidence": float(confidence)
+        }
             
     def get_processing_progress(self) -> float:
         """Get the current processing progress as a percentage."""
-        if not self.audio_duration:
-            return 0.0
-        # Progress estimation based on Whisper's processing
-        return min(100.0, (self.model._progress * 100) / self.audio_duration)
\ No newline at end of file
+        # Updated from Whisper's decoding loop after every window
+        return min(100.0, self._progress * 100)
\ No newline at end of file
@@ -0,0 +1,240 @@
+"""
+Energy and spectral voice activity detection.
+"""
+
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config import (
+    MIN_SAMPLE_RATE,
+    VAD_FRAME_MS,
+    VAD_ENERGY_MARGIN_DB,
+    VAD_MIN_SPEECH_DURATION,
+    VAD_MIN_SILENCE_DURATION,
+    VAD_PADDING
+)
+
+# Frames analysed per vectorized block, bounding memory on long recordings
+_FRAMES_PER_BLOCK = 8192
+
+class VoiceActivityDetector:
+    """Finds speech regions so silence, ringing and hold music can be skipped."""
+
+    def __init__(self, sample_rate: int = MIN_SAMPLE_RATE):
+        """
+        Initialize the detector.
+
+        Args:
+            sample_rate: Sample rate of the audio passed to detect()
+        """
+        self.sample_rate = sample_rate
+        self.frame_length = int(sample_rate * VAD_FRAME_MS / 1000)
+        self.frame_duration = self.frame_length / sample_rate
+
+        # Speech energy sits mostly in the telephone band
+        freqs = np.fft.rfftfreq(self.frame_length, 1 / sample_rate)
+        self._speech_band = (freqs >= 300) & (freqs <= 3400)
+
+    def detect(self, audio: np.ndarray) -> List[Tuple[float, float]]:
+        """
+        Detect speech regions.
+
+        Args:
+            audio: Mono float32 audio at the detector's sample rate
+
+        Returns:
+            List of (start, end) times in seconds
+        """
+        features = self.compute_features(audio)
+        if not len(features["energy_db"]):
+            return []
+
+        is_speech = self._classify_frames(features)
+        regions = self._frames_to_regions(is_speech)
+        duration = len(audio) / self.sample_rate
+        return self._smooth_regions(regions, duration)
+
+    def compute_features(self, audio: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Compute per-frame features.
+
+        Args:
+            audio: Mono float32 audio
+
+        Returns:
+            Dictionary of frame energy (dB), speech band ratio and spectral flatness
+        """
+        num_frames = len(audio) // self.frame_length
+        energy_db = np.empty(num_frames, dtype=np.float32)
+        band_ratio = np.empty(num_frames, dtype=np.float32)
+        flatness = np.empty(num_frames, dtype=np.float32)
+        window = np.hanning(self.frame_length).astype(np.float32)
+
+        for first in range(0, num_frames, _FRAMES_PER_BLOCK):
+            last = min(first + _FRAMES_PER_BLOCK, num_frames)
+            frames = np.asarray(
+                audio[first * self.frame_length:last * self.frame_length], dtype=np.float32
+            ).reshape(-1, self.frame_length)
+
+            power = np.abs(np.fft.rfft(frames * window, axis=1)) ** 2 + 1e-12
+            total = power.sum(axis=1)
+
+            energy_db[first:last] = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-12)
+            band_ratio[first:last] = power[:, self._speech_band].sum(axis=1) / total
+            flatness[first:last] = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+
+        return {
+            "energy_db": energy_db,
+            "band_ratio": band_ratio,
+            "flatness": flatness
+        }
+
+    def _classify_frames(self, features: Dict[str, np.ndarray]) -> np.ndarray:
+        """Decide per frame whether it contains speech."""
+        energy_db = features["energy_db"]
+
+        # Threshold relative to the recording's own noise floor
+        noise_floor = np.percentile(energy_db, 10)
+        loud = energy_db > max(noise_floor + VAD_ENERGY_MARGIN_DB, -60.0)
+
+        # Speech is band-limited, neither white noise nor a pure tone
+        voiced_band = features["band_ratio"] > 0.15
+        not_noise = features["flatness"] < 0.45
+        not_tone = features["flatness"] > 0.001
+
+        # Speech energy fluctuates with syllables; music and ringing are steadier
+        modulation = self._moving_std(energy_db, max(1, int(1.0 / self.frame_duration)))
+        fluctuating = modulation > 3.0
+
+        return loud & voiced_band & not_noise & not_tone & fluctuating
+
+    def _frames_to_regions(self, is_speech: np.ndarray) -> List[Tuple[float, float]]:
+        """Convert a frame mask into (start, end) times."""
+        padded = np.concatenate(([False], is_speech, [False])).astype(np.int8)
+        edges = np.diff(padded)
+        starts = np.flatnonzero(edges == 1) * self.frame_duration
+        ends = np.flatnonzero(edges == -1) * self.frame_duration
+        return list(zip(starts.tolist(), ends.tolist()))
+
+    def _smooth_regions(self, regions: List[Tuple[float, float]],
+                        duration: float) -> List[Tuple[float, float]]:
+        """Pad regions, bridge short pauses and drop short blips."""
+        smoothed = []
+        for start, end in regions:
+            start = max(0.0, start - VAD_PADDING)
+            end = min(duration, end + VAD_PADDING)
+            if smoothed and start - smoothed[-1][1] < VAD_MIN_SILENCE_DURATION:
+                smoothed[-1] = (smoothed[-1][0], max(end, smoothed[-1][1]))
+            else:
+                smoothed.append((start, end))
+
+        return [(start, end) for start, end in smoothed if end - start >= VAD_MIN_SPEECH_DURATION]
+
+    @staticmethod
+    def _moving_std(values: np.ndarray, width: int) -> np.ndarray:
+        """Centered moving standard deviation."""
+        if len(values) < 2:
+            return np.zeros_like(values)
+        width = min(width, len(values))
+        kernel = np.ones(width) / width
+        mean = np.convolve(values, kernel, mode="same")
+        mean_sq = np.convolve(values.astype(np.float64) ** 2, kernel, mode="same")
+        return np.sqrt(np.maximum(mean_sq - mean ** 2, 0.0))
+
+class TimelineMap:
+    """Maps times in speech-only audio back to the original recording."""
+
+    def __init__(self, regions: List[Tuple[float, float]], gap: float):
+        """
+        Initialize the map.
+
+        Args:
+            regions: Speech regions in original time, in order
+            gap: Silence inserted between regions in the compacted audio
+        """
+        self.original_starts = np.array([start for start, _ in regions], dtype=np.float64)
+        self.lengths = np.array([end - start for start, end in regions], dtype=np.float64)
+        self.compact_starts = np.concatenate(([0.0], np.cumsum(self.lengths + gap)[:-1]))
+
+    def to_original(self, t: float) -> float:
+        """Convert a compacted time to original time."""
+        if not len(self.original_starts):
+            return t
+        idx = max(0, int(np.searchsorted(self.compact_starts, t, side="right")) - 1)
+        offset = min(max(t - self.compact_starts[idx], 0.0), self.lengths[idx])
+        return float(self.original_starts[idx] + offset)
+
+def extract_speech(audio: np.ndarray, regions: List[Tuple[float, float]],
+                   sample_rate: int = MIN_SAMPLE_RATE,
+                   gap: float = 0.2,
+                   output_path: Optional[Path] = None) -> Tuple[np.ndarray, TimelineMap]:
+    """
+    Concatenate speech regions into one array.
+
+    Without output_path the speech track is built in memory. With it, the
+    track is written region by region to a .npy file and memory-mapped,
+    so memory-mapped input stays on disk.
+
+    Args:
+        audio: Mono float32 audio
+        regions: Speech regions as (start, end) seconds
+        sample_rate: Sample rate of the audio
+        gap: Seconds of silence inserted between regions
+        output_path: Optional .npy file to write the speech track to
+
+    Returns:
+        Tuple of (speech-only audio, map back to original time)
+    """
+    gap_samples = int(gap * sample_rate)
+    # Use sample-aligned regions so the map matches the audio exactly
+    aligned = []
+    for start, end in regions:
+        first = min(len(audio), int(start * sample_rate))
+        last = min(len(audio), max(first, int(end * sample_rate)))
+        aligned.append((first, last))
+
+    total = sum(last - first for first, last in aligned) + gap_samples * max(0, len(aligned) - 1)
+    if output_path is not None:
+        speech = np.lib.format.open_memmap(output_path, mode="w+", dtype=np.float32, shape=(total,))
+    else:
+        speech = np.empty(total, dtype=np.float32)
+
+    position = 0
+    for index, (first, last) in enumerate(aligned):
+        if index:
+            speech[position:position + gap_samples] = 0.0
+            position += gap_samples
+        speech[position:position + last - first] = audio[first:last]
+        position += last - first
+
+    if output_path is not None:
+        speech.flush()
+        del speech
+        speech = np.load(output_path, mmap_mode="r")
+
+    timeline = TimelineMap(
+        [(first / sample_rate, last / sample_rate) for first, last in aligned],
+        gap_samples / sample_rate
+    )
+    return speech, timeline
+
+def summarize_activity(regions: List[Tuple[float, float]], duration: float) -> Dict:
+    """
+    Summarize how much audio was kept and skipped.
+
+    Args:
+        regions: Speech regions as (start, end) seconds
+        duration: Total audio duration in seconds
+
+    Returns:
+        Dictionary of speech and skipped durations
+    """
+    speech = sum(end - start for start, end in regions)
+    skipped = max(0.0, duration - speech)
+    return {
+        "speech_regions": len(regions),
+        "speech_seconds": speech,
+        "skipped_seconds": skipped,
+        "skipped_fraction": skipped / duration if duration else 0.0
+    }
@@ -1,5 +1,9 @@
 from .audio_utils import validate_audio_file, get_audio_info
 from .export_utils import export_transcript
 from .error_handler import ErrorHandler
+from .artifact_cache import ArtifactCache, hash_file
+from .metrics import PipelineMetrics, MetricsSink
+from .checkpoint import JobCheckpoint
+from .audio_store import AudioStore, time_slice
 
-__all__ = ['validate_audio_file', 'get_audio_info', 'export_transcript', 'ErrorHandler']
\ No newline at end of file
+__all__ = ['validate_audio_file', 'get_audio_info', 'export_transcript', 'ErrorHandler', 'ArtifactCache', 'hash_file', 'PipelineMetrics', 'MetricsSink', 'JobCheckpoint', 'AudioStore', 'time_slice']
\ No newline at end of file
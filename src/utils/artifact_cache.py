@@ -0,0 +1,206 @@
+"""
+Content-addressed cache for intermediate pipeline artifacts.
+"""
+
+import os
+import json
+import pickle
+import hashlib
+import tempfile
+import threading
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config import (
+    ARTIFACT_CACHE_ENABLED,
+    ARTIFACT_CACHE_DIR,
+    ARTIFACT_CACHE_MAX_SIZE,
+    PIPELINE_VERSION
+)
+
+def hash_file(file_path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Hash a file's contents.
+
+    Args:
+        file_path: Path to the file
+        chunk_size: Bytes read per step
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ArtifactCache:
+    """Stores stage outputs keyed by input content and stage parameters."""
+
+    def __init__(self, cache_dir: Path = ARTIFACT_CACHE_DIR,
+                 max_size: int = ARTIFACT_CACHE_MAX_SIZE,
+                 enabled: bool = ARTIFACT_CACHE_ENABLED):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cached artifacts
+            max_size: Maximum total size in bytes before LRU eviction
+            enabled: When False every lookup misses and nothing is stored
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        self.enabled = enabled
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        if self.enabled:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def make_key(self, stage: str, upstream: str, params: Dict) -> Optional[str]:
+        """
+        Build the key for a stage output.
+
+        Args:
+            stage: Stage name
+            upstream: Content hash of the input or key of the previous stage
+            params: Parameters that affect the stage output
+
+        Returns:
+            Hex key, or None when the cache is disabled
+        """
+        if not self.enabled:
+            return None
+        payload = json.dumps(
+            {"stage": stage, "upstream": upstream, "params": params, "version": PIPELINE_VERSION},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, stage: str, key: Optional[str]) -> Optional[Any]:
+        """
+        Load a cached artifact.
+
+        Arrays are memory-mapped read-only rather than loaded.
+
+        Args:
+            stage: Stage name, used for hit/miss counters
+            key: Key from make_key()
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        if key is None:
+            return None
+
+        for path in (self._path(key, ".npy"), self._path(key, ".pkl")):
+            try:
+                if path.suffix == ".npy":
+                    value = np.load(path, mmap_mode="r")
+                else:
+                    with open(path, "rb") as f:
+                        value = pickle.load(f)
+            except (FileNotFoundError, EOFError, ValueError, pickle.UnpicklingError):
+                continue
+
+            # Touch the entry so eviction treats it as recently used
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            self._count(stage, "hits")
+            return value
+
+        self._count(stage, "misses")
+        return None
+
+    def put(self, stage: str, key: Optional[str], value: Any):
+        """
+        Store an artifact atomically.
+
+        The value is written to a temporary file in the cache directory and
+        renamed into place, so concurrent workers never see partial entries.
+
+        Args:
+            stage: Stage name
+            key: Key from make_key()
+            value: Array or picklable object
+        """
+        if key is None:
+            return
+
+        is_array = isinstance(value, np.ndarray)
+        path = self._path(key, ".npy" if is_array else ".pkl")
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp_", suffix=path.suffix)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                if is_array:
+                    np.save(f, np.asarray(value), allow_pickle=False)
+                else:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, path)
+        except Exception:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+
+        self._evict()
+
+    def get_statistics(self) -> Dict:
+        """Get per-stage hit/miss counters and the current cache size."""
+        with self._lock:
+            counters = {stage: dict(counts) for stage, counts in self._counters.items()}
+        return {
+            "stages": counters,
+            "size": sum(size for _, size, _ in self._entries()) if self.enabled else 0,
+            "max_size": self.max_size
+        }
+
+    def clear(self):
+        """Remove all cached artifacts."""
+        for path, _, _ in self._entries():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _path(self, key: str, suffix: str) -> Path:
+        """Get the file path for a key."""
+        return self.cache_dir / f"{key}{suffix}"
+
+    def _entries(self):
+        """List cache entries as (path, size, last_used)."""
+        entries = []
+        for path in self.cache_dir.glob("*"):
+            if path.name.startswith(".tmp_"):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self):
+        """Delete least recently used entries until the size cap is met."""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_size:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                # Another worker removed it first
+                pass
+
+    def _count(self, stage: str, outcome: str):
+        """Increment a hit/miss counter."""
+        with self._lock:
+            counts = self._counters.setdefault(stage, {"hits": 0, "misses": 0})
+            counts[outcome] += 1
@@ -0,0 +1,246 @@
+"""
+Disk store of decoded audio shared by every stage through memory maps.
+"""
+
+import os
+import json
+import uuid
+import struct
+import hashlib
+import numpy as np
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from config import (
+    AUDIO_STORE_DIR,
+    AUDIO_STORE_MAX_SIZE,
+    MIN_SAMPLE_RATE,
+    PIPELINE_VERSION
+)
+
+_NPY_HEADER_SIZE = 128
+
+def npy_header(length: int) -> bytes:
+    """
+    Build a fixed-size .npy header for a 1-D float32 array.
+
+    The size does not depend on the length, so a writer can reserve the
+    header, stream samples after it and fill in the length at the end.
+
+    Args:
+        length: Number of samples
+
+    Returns:
+        Header bytes, _NPY_HEADER_SIZE long
+    """
+    header = "{'descr': '<f4', 'fortran_order': False, 'shape': (%d,), }" % length
+    header = header.ljust(_NPY_HEADER_SIZE - 10 - 1) + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1")
+
+def time_slice(audio: np.ndarray, start: float, end: float,
+               sample_rate: int = MIN_SAMPLE_RATE) -> np.ndarray:
+    """
+    Get the samples between two times without copying.
+
+    Args:
+        audio: Mono audio, usually memory-mapped from the store
+        start: Start time in seconds
+        end: End time in seconds
+        sample_rate: Sample rate of the audio
+
+    Returns:
+        View of the audio; pages are read from disk only when accessed
+    """
+    first = min(len(audio), max(0, int(start * sample_rate)))
+    last = min(len(audio), max(first, int(end * sample_rate)))
+    return audio[first:last]
+
+class AudioStore:
+    """
+    Decoded recordings as float32 .npy files, opened read-only with np.memmap.
+
+    Entries are named after the recording's content hash, so jobs for
+    different files never collide even when the file names match, and
+    jobs for the same recording share one decoded copy. Entries are
+    written under a temporary name and renamed into place, and the least
+    recently opened ones are deleted once the store exceeds its budget.
+    """
+
+    def __init__(self, store_dir: Path = AUDIO_STORE_DIR,
+                 max_size: int = AUDIO_STORE_MAX_SIZE,
+                 sample_rate: int = MIN_SAMPLE_RATE):
+        """
+        Initialize the store.
+
+        Args:
+            store_dir: Directory holding decoded audio
+            max_size: Maximum total size in bytes before LRU eviction
+            sample_rate: Sample rate of the stored audio
+        """
+        self.store_dir = Path(store_dir)
+        self.max_size = max_size
+        self.sample_rate = sample_rate
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+
+    def key(self, file_hash: str) -> str:
+        """
+        Build the key of a recording's decoded audio.
+
+        Args:
+            file_hash: Content hash of the recording
+
+        Returns:
+            Hex key
+        """
+        payload = json.dumps(
+            {"file": file_hash, "sample_rate": self.sample_rate, "version": PIPELINE_VERSION},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path(self, key: str) -> Path:
+        """Get the file holding a key's audio."""
+        return self.store_dir / f"{key}.npy"
+
+    def sidecar(self, key: str, name: str) -> Path:
+        """
+        Get the path of a file derived from a key's audio.
+
+        Sidecar files are deleted together with the audio they belong to.
+
+        Args:
+            key: Key from key()
+            name: File name suffix, e.g. "peaks.npz"
+        """
+        return self.store_dir / f"{key}.{name}"
+
+    def open(self, key: Optional[str]) -> Optional[np.memmap]:
+        """
+        Memory-map stored audio.
+
+        Args:
+            key: Key from key()
+
+        Returns:
+            Read-only memory-mapped audio, or None if it is not stored
+        """
+        if key is None:
+            return None
+
+        path = self.path(key)
+        try:
+            audio = np.load(path, mmap_mode="r")
+        except (FileNotFoundError, ValueError, EOFError):
+            return None
+
+        # Touch the entry so eviction treats it as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return audio
+
+    @contextmanager
+    def reserve(self, key: str) -> Iterator[Path]:
+        """
+        Write a new entry.
+
+        Yields a temporary path for the caller to write a .npy file to. On
+        success the file is renamed into place and older entries are
+        evicted; on error it is deleted.
+
+        Args:
+            key: Key from key()
+        """
+        tmp_path = self.store_dir / f".tmp_{uuid.uuid4().hex}.npy"
+        try:
+            yield tmp_path
+            os.replace(tmp_path, self.path(key))
+        except BaseException:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            raise
+
+        self._evict(keep=self.path(key))
+
+    def put(self, key: str, audio: np.ndarray) -> np.memmap:
+        """
+        Store decoded audio and map it back.
+
+        Args:
+            key: Key from key()
+            audio: Mono float32 audio
+
+        Returns:
+            Read-only memory-mapped copy of the audio
+        """
+        with self.reserve(key) as tmp_path:
+            np.save(tmp_path, np.asarray(audio, dtype=np.float32), allow_pickle=False)
+        return self.open(key)
+
+    def get_statistics(self) -> Dict:
+        """Get the number of entries and the current store size."""
+        entries = self._entries()
+        return {
+            "entries": len(entries),
+            "size": sum(size for _, size, _ in entries),
+            "max_size": self.max_size
+        }
+
+    def clear(self):
+        """Remove all stored audio and sidecar files."""
+        for path, _, _ in self._entries():
+            self._remove(path)
+
+    def _entries(self):
+        """List store entries as (path, size, last_used); sizes include sidecar files."""
+        sizes = {}
+        for path in self.store_dir.iterdir():
+            if path.name.startswith(".tmp_"):
+                continue
+            try:
+                size = path.stat().st_size
+            except OSError:
+                continue
+            key = path.name.split(".", 1)[0]
+            sizes[key] = sizes.get(key, 0) + size
+
+        entries = []
+        for key, size in sizes.items():
+            path = self.path(key)
+            try:
+                stat = path.stat()
+            except OSError:
+                # Sidecars without their audio are removed with it, or never written
+                continue
+            entries.append((path, size, stat.st_mtime))
+        return entries
+
+    def _evict(self, keep: Optional[Path] = None):
+        """Delete least recently used entries until the size cap is met."""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_size:
+                break
+            if path == keep:
+                continue
+            if self._remove(path):
+                total -= size
+
+    def _remove(self, path: Path) -> bool:
+        """Delete an entry and its sidecar files; returns whether the audio was deleted."""
+        try:
+            # Readers keep their mapping; on Windows mapped files cannot be deleted yet
+            path.unlink()
+        except OSError:
+            return False
+        for sidecar in self.store_dir.glob(f"{path.stem}.*"):
+            try:
+                sidecar.unlink()
+            except OSError:
+                pass
+        return True
@@ -0,0 +1,218 @@
+"""
+Per-job checkpoints so interrupted transcriptions resume instead of restarting.
+"""
+
+import os
+import json
+import time
+import pickle
+import shutil
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+from config import CHECKPOINT_DIR, CHECKPOINT_MAX_AGE, PIPELINE_VERSION
+
+_LOCK_NAME = ".lock"
+_LOCK_POLL_SECONDS = 0.2
+
+def _try_lock(job_dir: Path, create: bool = True):
+    """
+    Take a job directory's exclusive lock without waiting.
+
+    Args:
+        job_dir: Job directory
+        create: Create the directory if it does not exist
+
+    Returns:
+        The open lock file, or None if another job holds the lock or the
+        directory was deleted meanwhile
+    """
+    if create:
+        job_dir.mkdir(parents=True, exist_ok=True)
+    lock_path = job_dir / _LOCK_NAME
+    try:
+        handle = open(lock_path, "a+b")
+    except FileNotFoundError:
+        return None
+
+    try:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        handle.close()
+        return None
+
+    # The previous holder may have deleted the directory before releasing
+    # the lock, in which case this lock no longer guards anything
+    try:
+        current = os.path.samestat(os.fstat(handle.fileno()), os.stat(lock_path))
+    except OSError:
+        current = False
+    if not current:
+        _unlock(handle)
+        return None
+    return handle
+
+def _unlock(handle):
+    """Release a lock taken by _try_lock()."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+    except OSError:
+        pass
+    handle.close()
+
+class JobCheckpoint:
+    """
+    Incremental state of one job, stored in its own directory under TEMP_DIR.
+
+    The directory is named after the recording's content hash and the
+    parameters of every stage, so a restarted job finds the state of the
+    interrupted one and a job with different settings never does. Every
+    write is atomic, so a crash mid-write leaves the previous checkpoint.
+
+    A job holds an exclusive lock on its directory until it completes or
+    releases it. A second job for the same recording and settings waits
+    for the lock, so it never reads half-written state and the directory
+    is never deleted while another job uses it. The operating system drops
+    the lock if the process dies.
+    """
+
+    def __init__(self, job_dir: Path, cancel_token=None):
+        """
+        Open the checkpoint, waiting while another job holds it.
+
+        Args:
+            job_dir: Directory holding the job's state
+            cancel_token: Checked while waiting for the lock
+
+        Raises:
+            JobCancelledError: If the job is cancelled while waiting
+        """
+        self.job_dir = Path(job_dir)
+        self._lock = _try_lock(self.job_dir)
+        while self._lock is None:
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            time.sleep(_LOCK_POLL_SECONDS)
+            self._lock = _try_lock(self.job_dir)
+        # Touch so pruning measures age from the last run, not the first
+        os.utime(self.job_dir)
+
+    @classmethod
+    def for_file(cls, file_hash: str, params: Dict,
+                 root: Path = CHECKPOINT_DIR, cancel_token=None) -> "JobCheckpoint":
+        """
+        Open the checkpoint of a recording processed with given parameters.
+
+        Args:
+            file_hash: Content hash of the recording
+            params: Parameters of every stage that affect the results
+            root: Directory holding all job directories
+            cancel_token: Checked while another job holds the checkpoint
+
+        Returns:
+            The job's checkpoint, empty if the job has not run before
+        """
+        payload = json.dumps(
+            {"file": file_hash, "params": params, "version": PIPELINE_VERSION},
+            sort_keys=True,
+            default=str
+        )
+        return cls(Path(root) / hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32], cancel_token)
+
+    def load(self, name: str) -> Optional[Any]:
+        """
+        Load saved state.
+
+        Args:
+            name: State name
+
+        Returns:
+            The saved value, or None if there is none
+        """
+        try:
+            with open(self.job_dir / f"{name}.pkl", "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def save(self, name: str, value: Any):
+        """
+        Save state, replacing the previous value atomically.
+
+        Args:
+            name: State name
+            value: Picklable value
+        """
+        fd, tmp_name = tempfile.mkstemp(dir=self.job_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, self.job_dir / f"{name}.pkl")
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def complete(self):
+        """Delete the job's state once its results are delivered, then release it."""
+        if self._lock is not None:
+            # Delete while holding the lock; a waiting job then sees the
+            # lock file is gone and starts a fresh directory
+            shutil.rmtree(self.job_dir, ignore_errors=True)
+        self.release()
+
+    def release(self):
+        """Release the lock, keeping the state for a later run to resume."""
+        if self._lock is not None:
+            _unlock(self._lock)
+            self._lock = None
+
+    @staticmethod
+    def prune(root: Path = CHECKPOINT_DIR, max_age: float = CHECKPOINT_MAX_AGE) -> int:
+        """
+        Delete checkpoints of jobs abandoned longer than max_age.
+
+        Directories locked by a running job are kept however old they are.
+
+        Args:
+            root: Directory holding all job directories
+            max_age: Age in seconds since a job last ran
+
+        Returns:
+            Number of job directories removed
+        """
+        root = Path(root)
+        if not root.exists():
+            return 0
+
+        removed = 0
+        cutoff = time.time() - max_age
+        for job_dir in root.iterdir():
+            try:
+                if not job_dir.is_dir() or job_dir.stat().st_mtime >= cutoff:
+                    continue
+            except OSError:
+                continue
+            lock = _try_lock(job_dir, create=False)
+            if lock is None:
+                continue
+            shutil.rmtree(job_dir, ignore_errors=True)
+            _unlock(lock)
+            removed += 1
+        return removed
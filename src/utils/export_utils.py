@@ -2,70 +2,224 @@
 Utilities for exporting transcription results.
 """
 
+import io
+import os
 import json
 import csv
+import gzip
+import tempfile
+from datetime import date
 from pathlib import Path
-from typing import Dict, List
+import numpy as np
+from collections.abc import Mapping
+from typing import Callable, Dict, List, Optional
 
-def export_transcript(results: Dict, output_path: Path, format: str = "txt"):
+from config import EXPORT_CHUNK_SIZE
+
+COMPRESSIONS = [None, "gzip", "zstd"]
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
+
+def export_transcript(results: Dict, output_path: Path, format: str = "txt",
+                      compression: Optional[str] = None,
+                      progress_callback: Optional[Callable[[float], None]] = None):
     """
     Export transcription results to file.
     
     Args:
         results: Dictionary containing transcription results
         output_path: Path to save the export
-        format: Export format (txt, csv, or json)
+        format: Export format (txt, csv, json, jsonl or parquet)
+        compression: None, "gzip" or "zstd"; Parquet compresses its pages instead
+        progress_callback: Called with the exported fraction from 0 to 1
     """
-    if format == "txt":
-        _export_txt(results, output_path)
-    elif format == "csv":
-        _export_csv(results, output_path)
-    elif format == "json":
-        _export_json(results, output_path)
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unsupported compression: {compression}")
+        
+    if format == "parquet":
+        _export_parquet(results, output_path, compression, progress_callback)
+    elif format in ("txt", "csv", "json", "jsonl"):
+        exporters = {
+            "txt": _export_txt,
+            "csv": _export_csv,
+            "json": _export_json,
+            "jsonl": _export_jsonl
+        }
+        with _open_text(output_path, compression) as f:
+            exporters[format](results, f, progress_callback)
     else:
         raise ValueError(f"Unsupported export format: {format}")
-
-def _export_txt(results: Dict, output_path: Path):
-    """Export results as formatted text file."""
-    with open(output_path, 'w', encoding='utf-8') as f:
-        # Write header
-        f.write("Sales Conversation Transcript\n")
-        f.write("="*30 + "\n\n")
         
-        # Write segments
-        for segment in results["segments"]:
-            start = f"{int(segment['start'])//60}:{int(segment['start'])%60:02d}"
-            if "speaker" in segment:
-                f.write(f"[{start}] {segment['speaker'].title()}: {segment['text']}\n")
-            else:
-                f.write(f"[{start}] {segment['text']}\n")
+    if progress_callback is not None:
+        progress_callback(1.0)
+
+def export_to_dataset(results: Dict, dataset_dir: Path, call_id: str,
+                      partition: Optional[str] = None) -> Path:
+    """
+    Append one call to a Hive-partitioned Parquet dataset.
+    
+    Each call is written as its own file under `date=<partition>/`, so many
+    processes can add calls concurrently and the dataset can be read in one
+    go with `pyarrow.dataset.dataset(dataset_dir, partitioning="hive")`.
+    
+    Args:
+        results: Dictionary containing transcription results
+        dataset_dir: Root directory of the dataset
+        call_id: Identifier stored with every row and used as the file name
+        partition: Partition value, usually the call date; today if omitted
         
-        # Write statistics
-        if "statistics" in results:
-            f.write("\nConversation Statistics\n")
-            f.write("="*30 + "\n")
-            for speaker, stats in results["statistics"].items():
-                f.write(f"\n{speaker.title()}:\n")
-                f.write(f"- Total speaking time: {stats['total_time']:.1f}s\n")
-                f.write(f"- Number of segments: {stats['segment_count']}\n")
-                f.write(f"- Word count: {stats['word_count']}\n")
+    Returns:
+        Path of the written file
+    """
+    output_path = dataset_path_for(dataset_dir, call_id, partition)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    # Readers may scan the dataset at any time, so never expose a partial file
+    fd, tmp_name = tempfile.mkstemp(dir=output_path.parent, prefix=".", suffix=".parquet")
+    os.close(fd)
+    try:
+        _export_parquet(results, Path(tmp_name), "zstd", call_id=call_id)
+        os.replace(tmp_name, output_path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return output_path
+
+def dataset_path_for(dataset_dir: Path, call_id: str, partition: Optional[str] = None) -> Path:
+    """Get the file a call is stored in within a partitioned dataset."""
+    partition = partition or date.today().isoformat()
+    return Path(dataset_dir) / f"date={partition}" / f"{call_id}.parquet"
 
-def _export_csv(results: Dict, output_path: Path):
+def compression_for(output_path: Path) -> Optional[str]:
+    """Infer compression from a .gz or .zst suffix."""
+    return COMPRESSION_SUFFIXES.get(Path(output_path).suffix.lower())
+
+def _open_text(output_path: Path, compression: Optional[str]):
+    """Open a text file for writing, optionally compressed."""
+    if compression == "gzip":
+        return gzip.open(output_path, "wt", encoding="utf-8", newline="")
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("zstd compression requires the 'zstandard' package")
+        raw = open(output_path, "wb")
+        writer = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+        return io.TextIOWrapper(writer, encoding="utf-8", newline="")
+    return open(output_path, "w", encoding="utf-8", newline="")
+
+def _report(progress_callback: Optional[Callable[[float], None]], done: int, total: int):
+    """Report progress every EXPORT_CHUNK_SIZE segments."""
+    if progress_callback is not None and total and done % EXPORT_CHUNK_SIZE == 0:
+        progress_callback(done / total)
+
+def _export_txt(results: Dict, f, progress_callback=None):
+    """Export results as formatted text file."""
+    # Write header
+    f.write("Sales Conversation Transcript\n")
+    f.write("="*30 + "\n\n")
+    
+    # Write segments
+    total = len(results["segments"])
+    for done, segment in enumerate(results["segments"], 1):
+        start = f"{int(segment['start'])//60}:{int(segment['start'])%60:02d}"
+        if "speaker" in segment:
+            f.write(f"[{start}] {segment['speaker'].title()}: {segment['text']}\n")
+        else:
+            f.write(f"[{start}] {segment['text']}\n")
+        _report(progress_callback, done, total)
+    
+    # Write statistics
+    if "statistics" in results:
+        f.write("\nConversation Statistics\n")
+        f.write("="*30 + "\n")
+        for speaker, stats in results["statistics"].items():
+            f.write(f"\n{speaker.title()}:\n")
+            f.write(f"- Total speaking time: {stats['total_time']:.1f}s\n")
+            f.write(f"- Number of segments: {stats['segment_count']}\n")
+            f.write(f"- Word count: {stats['word_count']}\n")
+
+def _export_csv(results: Dict, f, progress_callback=None):
     """Export results as CSV file."""
-    with open(output_path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(["Start", "End", "Speaker", "Text", "Confidence"])
-        
-        for segment in results["segments"]:
-            writer.writerow([
-                f"{int(segment['start'])//60}:{int(segment['start'])%60:02d}",
-                f"{int(segment['end'])//60}:{int(segment['end'])%60:02d}",
-                segment.get("speaker", ""),
-                segment["text"],
-                segment.get("confidence", "")
-            ])
+    writer = csv.writer(f)
+    writer.writerow(["Start", "End", "Speaker", "Text", "Confidence"])
+    
+    total = len(results["segments"])
+    for done, segment in enumerate(results["segments"], 1):
+        writer.writerow([
+            f"{int(segment['start'])//60}:{int(segment['start'])%60:02d}",
+            f"{int(segment['end'])//60}:{int(segment['end'])%60:02d}",
+            segment.get("speaker", ""),
+            segment["text"],
+            segment.get("confidence", "")
+        ])
+        _report(progress_callback, done, total)
 
-def _export_json(results: Dict, output_path: Path):
+def _export_json(results: Dict, f, progress_callback=None):
     """Export results as JSON file."""
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
\ No newline at end of file
+    json.dump(results, f, indent=2, ensure_ascii=False, default=_json_default)
+
+def _json_default(value):
+    """Serialize segment stores and views as plain lists and dicts."""
+    if isinstance(value, Mapping):
+        return dict(value)
+    if hasattr(value, "to_dicts"):
+        return value.to_dicts()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _export_jsonl(results: Dict, f, progress_callback=None):
+    """Export one compact JSON object per segment, streamed line by line."""
+    total = len(results["segments"])
+    for done, segment in enumerate(results["segments"], 1):
+        f.write(json.dumps(dict(segment), ensure_ascii=False, separators=(",", ":")))
+        f.write("\n")
+        _report(progress_callback, done, total)
+
+def _export_parquet(results: Dict, output_path: Path, compression: Optional[str] = None,
+                    progress_callback=None, call_id: Optional[str] = None):
+    """Export segments as a columnar Parquet file, one row group per chunk."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export requires the 'pyarrow' package")
+    from src.transcription.segment_store import SegmentStore
+        
+    schema = pa.schema([
+        ("call_id", pa.dictionary(pa.int32(), pa.string())),
+        ("start", pa.float64()),
+        ("end", pa.float64()),
+        ("speaker", pa.dictionary(pa.int8(), pa.string())),
+        ("text", pa.string()),
+        ("confidence", pa.float32()),
+        ("speaker_confidence", pa.float32()),
+        ("overlap", pa.float32())
+    ], metadata={
+        "language": str(results.get("language") or ""),
+        "duration": str(results.get("duration") or 0),
+        "statistics": json.dumps(results.get("statistics", {}))
+    })
+    
+    # Columns come straight from the store's arrays
+    store = SegmentStore.from_dicts(results["segments"])
+    speakers = pa.array(store.speakers, pa.string())
+    texts = store.texts()
+    with pq.ParquetWriter(output_path, schema, compression=compression or "snappy") as writer:
+        for first in range(0, len(store), EXPORT_CHUNK_SIZE):
+            last = min(first + EXPORT_CHUNK_SIZE, len(store))
+            codes = store.speaker[first:last]
+            columns = [
+                pa.DictionaryArray.from_arrays(
+                    pa.array(np.zeros(last - first, dtype=np.int32), mask=np.full(last - first, call_id is None)),
+                    pa.array([call_id or ""], pa.string())
+                ),
+                pa.array(store.start[first:last]),
+                pa.array(store.end[first:last]),
+                pa.DictionaryArray.from_arrays(pa.array(codes, mask=codes < 0), speakers),
+                pa.array(texts[first:last], pa.string()),
+                pa.array(store.confidence[first:last], pa.float32(), from_pandas=True),
+                pa.array(store.speaker_confidence[first:last], pa.float32(), from_pandas=True),
+                pa.array(store.overlap_duration[first:last], pa.float32(), from_pandas=True)
+            ]
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+            if progress_callback is not None:
+                progress_callback(last / len(store))
\ No newline at end of file
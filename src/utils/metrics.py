@@ -0,0 +1,243 @@
+"""
+Per-stage timing and resource metrics for processed files.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import tempfile
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from config import METRICS_SINK, METRICS_DIR
+
+def peak_rss() -> int:
+    """
+    Get the peak resident set size of this process.
+
+    Returns:
+        Peak RSS in bytes, or 0 if unavailable
+    """
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        pass
+
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss)
+    except ImportError:
+        return 0
+
+def current_rss() -> int:
+    """
+    Get the current resident set size of this process.
+
+    Returns:
+        RSS in bytes, or 0 if psutil is unavailable
+    """
+    try:
+        import psutil
+    except ImportError:
+        return 0
+    return psutil.Process().memory_info().rss
+
+class PipelineMetrics:
+    """
+    Records wall time, CPU time and memory use for each pipeline stage.
+
+    The peak RSS is a high-water mark over the whole process lifetime, so
+    it is only reported for the file as a whole. Each stage records the
+    RSS when it ends and how much it changed while the stage ran.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.audio_duration: Optional[float] = None
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Time a stage.
+
+        CPU time and RSS are process-wide, so they include model thread
+        pools but also any other jobs running in the same process.
+
+        Args:
+            name: Stage name
+        """
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        rss_start = current_rss()
+        try:
+            yield
+        finally:
+            entry = self.stages.setdefault(name, {"wall_time": 0.0, "cpu_time": 0.0, "rss_delta": 0})
+            entry["wall_time"] += time.perf_counter() - wall_start
+            entry["cpu_time"] += time.process_time() - cpu_start
+            entry["rss_end"] = current_rss()
+            entry["rss_delta"] += entry["rss_end"] - rss_start
+
+    def to_dict(self) -> Dict:
+        """
+        Summarize the recorded stages.
+
+        Real-time factor is processing seconds per second of audio.
+
+        Returns:
+            Dictionary of per-stage and total metrics
+        """
+        stages = {}
+        for name, entry in self.stages.items():
+            stages[name] = dict(entry)
+            stages[name]["rtf"] = self._rtf(entry["wall_time"])
+
+        wall_time = sum(entry["wall_time"] for entry in self.stages.values())
+        return {
+            "audio_duration": self.audio_duration,
+            "stages": stages,
+            "total": {
+                "wall_time": wall_time,
+                "cpu_time": sum(entry["cpu_time"] for entry in self.stages.values()),
+                "peak_rss": peak_rss(),
+                "rtf": self._rtf(wall_time)
+            }
+        }
+
+    def _rtf(self, seconds: float) -> Optional[float]:
+        """Convert processing seconds into a real-time factor."""
+        if not self.audio_duration:
+            return None
+        return seconds / self.audio_duration
+
+class MetricsSink:
+    """Appends per-file metrics to a JSONL log or a Prometheus textfile."""
+
+    def __init__(self, kind: Optional[str] = METRICS_SINK, directory: Path = METRICS_DIR):
+        """
+        Initialize the sink.
+
+        Args:
+            kind: "jsonl", "prometheus" or None to disable
+            directory: Directory the metrics files are written to
+        """
+        if kind not in (None, "jsonl", "prometheus"):
+            raise ValueError(f"Unsupported metrics sink: {kind}")
+        self.kind = kind
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+
+    def write(self, file_path: Path, metrics: Dict):
+        """
+        Record metrics for a processed file.
+
+        Args:
+            file_path: Path of the processed recording
+            metrics: Output of PipelineMetrics.to_dict()
+        """
+        if self.kind is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        with self._lock:
+            if self.kind == "jsonl":
+                self._write_jsonl(file_path, metrics)
+            else:
+                self._write_prometheus(metrics)
+
+    def _write_jsonl(self, file_path: Path, metrics: Dict):
+        """Append one JSON record per file."""
+        record = {
+            "timestamp": time.time(),
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "file": str(file_path),
+            **metrics
+        }
+        # A single write per line keeps records intact across worker processes
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with open(self.directory / "metrics.jsonl", "a", encoding="utf-8") as f:
+            f.write(line)
+
+    def _write_prometheus(self, metrics: Dict):
+        """
+        Rewrite this process's textfile with the latest file's gauges.
+
+        Each process writes its own metrics_<pid>.prom and labels its series
+        with the pid, so batch workers do not overwrite each other and the
+        textfile collector sees no duplicate series. Files of processes
+        that have exited are removed.
+        """
+        pid = os.getpid()
+        process = f'pid="{pid}"'
+        lines = [
+            "# HELP transcription_stage_seconds Wall time of the last file per stage.",
+            "# TYPE transcription_stage_seconds gauge"
+        ]
+        for name, entry in metrics["stages"].items():
+            lines.append(f'transcription_stage_seconds{{stage="{name}",{process}}} {entry["wall_time"]:.6f}')
+
+        lines += [
+            "# HELP transcription_stage_cpu_seconds CPU time of the last file per stage.",
+            "# TYPE transcription_stage_cpu_seconds gauge"
+        ]
+        for name, entry in metrics["stages"].items():
+            lines.append(f'transcription_stage_cpu_seconds{{stage="{name}",{process}}} {entry["cpu_time"]:.6f}')
+
+        lines += [
+            "# HELP transcription_stage_rss_delta_bytes Change in resident memory during each stage of the last file.",
+            "# TYPE transcription_stage_rss_delta_bytes gauge"
+        ]
+        for name, entry in metrics["stages"].items():
+            lines.append(f'transcription_stage_rss_delta_bytes{{stage="{name}",{process}}} {entry["rss_delta"]}')
+
+        total = metrics["total"]
+        lines += [
+            "# HELP transcription_peak_rss_bytes Peak resident memory of the processing process.",
+            "# TYPE transcription_peak_rss_bytes gauge",
+            f"transcription_peak_rss_bytes{{{process}}} {total['peak_rss']}",
+            "# HELP transcription_audio_seconds Duration of the last processed file.",
+            "# TYPE transcription_audio_seconds gauge",
+            f"transcription_audio_seconds{{{process}}} {metrics['audio_duration'] or 0}"
+        ]
+        if "cascade" in metrics:
+            lines += [
+                "# HELP transcription_cascade_refined_fraction Share of audio re-decoded by the accurate model.",
+                "# TYPE transcription_cascade_refined_fraction gauge",
+                f"transcription_cascade_refined_fraction{{{process}}} {metrics['cascade']['refined_fraction']:.6f}"
+            ]
+        if total["rtf"] is not None:
+            lines += [
+                "# HELP transcription_realtime_factor Processing seconds per audio second.",
+                "# TYPE transcription_realtime_factor gauge",
+                f"transcription_realtime_factor{{{process}}} {total['rtf']:.6f}"
+            ]
+
+        # node_exporter may read at any time, so replace the file atomically
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, prefix=".metrics_", suffix=".prom")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_name, self.directory / f"metrics_{pid}.prom")
+        self._remove_exited()
+
+    def _remove_exited(self):
+        """Delete the textfiles of processes that are no longer running."""
+        try:
+            import psutil
+        except ImportError:
+            return
+        for path in self.directory.glob("metrics_*.prom"):
+            other = path.stem[len("metrics_"):]
+            if other.isdigit() and not psutil.pid_exists(int(other)):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
@@ -0,0 +1,9 @@
+"""
+Shared pytest setup.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
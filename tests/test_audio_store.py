@@ -0,0 +1,67 @@
+"""
+Tests for the decoded audio store.
+"""
+
+import os
+import time
+
+import numpy as np
+
+from src.utils.audio_store import AudioStore, time_slice
+
+def _put(store, name, samples, age):
+    """Store audio and make it look last used `age` seconds ago."""
+    key = store.key(name)
+    store.put(key, np.full(samples, 0.5, dtype=np.float32))
+    used = time.time() - age
+    os.utime(store.path(key), (used, used))
+    return key
+
+def test_put_and_open(tmp_path):
+    store = AudioStore(tmp_path)
+    key = store.key("abc")
+    audio = np.linspace(-1, 1, 1000, dtype=np.float32)
+    store.put(key, audio)
+
+    mapped = store.open(key)
+    assert isinstance(mapped, np.memmap)
+    np.testing.assert_array_equal(mapped, audio)
+    assert store.open(store.key("missing")) is None
+    assert store.key("abc") != AudioStore(tmp_path, sample_rate=8000).key("abc")
+
+def test_evicts_least_recently_used(tmp_path):
+    store = AudioStore(tmp_path, max_size=3 * 4000 + 3 * 256)
+    oldest = _put(store, "a", 1000, age=300)
+    recent = _put(store, "b", 1000, age=200)
+    store.open(oldest)
+    newest = _put(store, "c", 1000, age=0)
+    # Opening "a" made "b" the least recently used entry
+    _put(store, "d", 1000, age=0)
+
+    assert store.open(recent) is None
+    assert store.open(oldest) is not None
+    assert store.open(newest) is not None
+    assert store.get_statistics()["entries"] == 3
+
+def test_new_entry_is_kept_over_budget(tmp_path):
+    store = AudioStore(tmp_path, max_size=1000)
+    old = _put(store, "a", 1000, age=100)
+    new = _put(store, "b", 1000, age=0)
+
+    assert store.open(old) is None
+    assert store.open(new) is not None
+
+def test_clear(tmp_path):
+    store = AudioStore(tmp_path)
+    _put(store, "a", 100, age=0)
+    store.clear()
+    assert store.get_statistics()["entries"] == 0
+
+def test_time_slice():
+    audio = np.arange(16000 * 3, dtype=np.float32)
+    view = time_slice(audio, 1.0, 2.0)
+
+    assert view.base is audio
+    assert view[0] == 16000 and len(view) == 16000
+    assert len(time_slice(audio, 2.5, 10.0)) == 8000
+    assert len(time_slice(audio, 5.0, 6.0)) == 0
@@ -0,0 +1,19 @@
+"""
+Tests for batch output naming.
+"""
+
+from src.batch import call_id_for, output_path_for
+
+def test_same_file_name_in_different_directories(tmp_path):
+    first = tmp_path / "monday" / "call.wav"
+    second = tmp_path / "tuesday" / "call.wav"
+
+    assert call_id_for(first) != call_id_for(second)
+    assert output_path_for(first, tmp_path, "json") != output_path_for(second, tmp_path, "json")
+
+def test_name_is_stable(tmp_path):
+    audio_path = tmp_path / "call.wav"
+
+    assert call_id_for(audio_path) == call_id_for(tmp_path / "." / "call.wav")
+    assert call_id_for(audio_path).startswith("call-")
+    assert output_path_for(audio_path, tmp_path, "jsonl", "gzip").name == f"{call_id_for(audio_path)}.jsonl.gz"
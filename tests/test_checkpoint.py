@@ -0,0 +1,73 @@
+"""
+Tests for job checkpoints.
+"""
+
+import os
+import time
+import threading
+
+import pytest
+
+from src.utils.checkpoint import JobCheckpoint
+from src.transcription.progress import CancellationToken, JobCancelledError
+
+def test_save_load_complete(tmp_path):
+    checkpoint = JobCheckpoint.for_file("abc", {"model": "base"}, root=tmp_path)
+    checkpoint.save("transcribe", {"segments": [1, 2]})
+
+    assert checkpoint.load("transcribe") == {"segments": [1, 2]}
+    assert checkpoint.load("missing") is None
+    checkpoint.complete()
+    assert not checkpoint.job_dir.exists()
+
+def test_released_state_resumes(tmp_path):
+    checkpoint = JobCheckpoint.for_file("abc", {}, root=tmp_path)
+    checkpoint.save("transcribe", [1])
+    checkpoint.release()
+
+    assert JobCheckpoint.for_file("abc", {}, root=tmp_path).load("transcribe") == [1]
+    assert JobCheckpoint.for_file("abc", {"model": "tiny"}, root=tmp_path).load("transcribe") is None
+
+def test_second_job_waits_for_the_first(tmp_path):
+    first = JobCheckpoint.for_file("abc", {}, root=tmp_path)
+    first.save("transcribe", [1])
+    opened = []
+
+    def second_job():
+        second = JobCheckpoint.for_file("abc", {}, root=tmp_path)
+        opened.append(second.load("transcribe"))
+        second.save("transcribe", [2])
+        second.complete()
+
+    thread = threading.Thread(target=second_job)
+    thread.start()
+    time.sleep(0.5)
+    # The second job must not touch the directory while the first holds it
+    assert not opened
+    assert first.load("transcribe") == [1]
+
+    first.complete()
+    thread.join(timeout=5)
+    # It starts from a fresh directory instead of the deleted one
+    assert opened == [None]
+
+def test_waiting_job_can_be_cancelled(tmp_path):
+    first = JobCheckpoint.for_file("abc", {}, root=tmp_path)
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(JobCancelledError):
+        JobCheckpoint.for_file("abc", {}, root=tmp_path, cancel_token=token)
+    first.release()
+
+def test_prune_keeps_locked_directories(tmp_path):
+    live = JobCheckpoint.for_file("live", {}, root=tmp_path)
+    abandoned = JobCheckpoint.for_file("abandoned", {}, root=tmp_path)
+    abandoned.release()
+    old = time.time() - 3600
+    for job_dir in (live.job_dir, abandoned.job_dir):
+        os.utime(job_dir, (old, old))
+
+    assert JobCheckpoint.prune(tmp_path, max_age=60) == 1
+    assert live.job_dir.exists()
+    assert not abandoned.job_dir.exists()
+    live.complete()
@@ -0,0 +1,31 @@
+"""
+Tests for pooling frame MFCCs into segment embeddings.
+"""
+
+import numpy as np
+
+from src.transcription import diarization
+from src.transcription.diarization import AcousticDiarizer
+
+def test_embed_segments_matches_brute_force(monkeypatch):
+    # Small blocks so segments span several of them
+    monkeypatch.setattr(diarization, "_FRAMES_PER_BLOCK", 1000)
+    rng = np.random.default_rng(0)
+    mfcc = rng.normal(size=(20_000, 13)).astype(np.float32)
+    voiced = rng.random(20_000) > 0.3
+    starts = np.sort(rng.uniform(0, 200, 300))
+    starts[0] = 0.0
+    ends = starts + rng.exponential(5.0, 300)
+    ends[-1] = 250.0
+
+    diarizer = AcousticDiarizer.__new__(AcousticDiarizer)
+    diarizer.hop_length, diarizer.sample_rate = 160, 16000
+    embeddings, usable = diarizer.embed_segments(mfcc, voiced, starts, ends)
+
+    for i, (start, end) in enumerate(zip(starts, ends)):
+        frames = mfcc[int(start * 100):min(int(end * 100), len(mfcc))]
+        frames = frames[voiced[int(start * 100):int(start * 100) + len(frames)]].astype(np.float64)
+        assert usable[i] == (len(frames) >= 10)
+        if usable[i]:
+            np.testing.assert_allclose(embeddings[i, :13], frames.mean(axis=0), atol=1e-9)
+            np.testing.assert_allclose(embeddings[i, 13:], frames.std(axis=0), atol=1e-6)
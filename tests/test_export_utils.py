@@ -0,0 +1,68 @@
+"""
+Tests for the JSONL and Parquet exporters.
+"""
+
+import json
+import gzip
+
+import pytest
+
+from src.utils.export_utils import export_transcript, export_to_dataset
+
+def _results():
+    """Build results where the first two segments overlap."""
+    return {
+        "segments": [
+            {"start": 0.0, "end": 2.0, "text": "Hello, thanks for calling.",
+             "speaker": "agent", "confidence": 0.9, "speaker_confidence": 0.8,
+             "overlap": {"duration": 0.5, "overlaps_with": 1}},
+            {"start": 1.5, "end": 4.0, "text": "Hi, I have a question.",
+             "speaker": "customer", "confidence": 0.7, "speaker_confidence": 0.6,
+             "overlap": {"duration": 0.5, "overlaps_with": 0}},
+            {"start": 4.5, "end": 6.0, "text": "Sure."}
+        ],
+        "statistics": {},
+        "language": "en",
+        "duration": 6.0
+    }
+
+def test_jsonl_writes_one_segment_per_line(tmp_path):
+    output_path = tmp_path / "call.jsonl"
+    export_transcript(_results(), output_path, "jsonl")
+
+    lines = output_path.read_text(encoding="utf-8").splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert [row["text"] for row in rows] == [segment["text"] for segment in _results()["segments"]]
+    assert rows[1]["overlap"] == {"duration": 0.5, "overlaps_with": 0}
+    assert "speaker" not in rows[2]
+
+def test_jsonl_gzip(tmp_path):
+    output_path = tmp_path / "call.jsonl.gz"
+    export_transcript(_results(), output_path, "jsonl", compression="gzip")
+
+    with gzip.open(output_path, "rt", encoding="utf-8") as f:
+        assert len(f.read().splitlines()) == 3
+
+def test_parquet_with_overlapping_segment(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    output_path = tmp_path / "call.parquet"
+    progress = []
+    export_transcript(_results(), output_path, "parquet", progress_callback=progress.append)
+
+    table = pq.read_table(output_path)
+    assert table.num_rows == 3
+    assert table.column("overlap").to_pylist() == [0.5, 0.5, None]
+    assert table.column("speaker").to_pylist() == ["agent", "customer", None]
+    assert table.column("text").to_pylist()[1] == "Hi, I have a question."
+    assert table.column("call_id").to_pylist() == [None] * 3
+    assert table.schema.metadata[b"language"] == b"en"
+    assert progress[-1] == 1.0
+
+def test_dataset_partition(tmp_path):
+    ds = pytest.importorskip("pyarrow.dataset")
+    path = export_to_dataset(_results(), tmp_path, "call-1", partition="2024-01-02")
+
+    assert path == tmp_path / "date=2024-01-02" / "call-1.parquet"
+    table = ds.dataset(tmp_path, partitioning="hive").to_table()
+    assert table.column("call_id").to_pylist() == ["call-1"] * 3
+    assert table.column("overlap").to_pylist() == [0.5, 0.5, None]
@@ -0,0 +1,13 @@
+"""
+Tests that the modules needed to show the window import quickly and lightly.
+"""
+
+from benchmarks.import_budget import DEFAULT_BUDGET, HEAVY_MODULES, measure_startup_imports
+
+def test_startup_imports_within_budget():
+    # Each run is a fresh interpreter; the fastest is least affected by load
+    results = [measure_startup_imports() for _ in range(3)]
+
+    assert min(result["seconds"] for result in results) <= DEFAULT_BUDGET
+    loaded = set(results[0]["modules"])
+    assert [name for name in HEAVY_MODULES if name in loaded] == []
@@ -0,0 +1,84 @@
+"""
+Tests for the interval index against brute force.
+"""
+
+import numpy as np
+import pytest
+
+from src.transcription.interval_index import IntervalIndex
+
+def _intervals(seed, n=300):
+    rng = np.random.default_rng(seed)
+    # Rounded times produce shared starts, shared ends and touching intervals
+    starts = np.round(rng.uniform(0, 100, n), 1)
+    ends = starts + np.round(rng.exponential(3, n), 1)
+    return starts, ends
+
+@pytest.mark.parametrize("seed", range(5))
+def test_query_matches_brute_force(seed):
+    starts, ends = _intervals(seed)
+    index = IntervalIndex(starts, ends)
+    rng = np.random.default_rng(seed + 100)
+
+    for _ in range(200):
+        start = round(rng.uniform(-5, 105), 1)
+        end = start + round(rng.exponential(5), 1)
+        expected = np.flatnonzero((starts < end) & (ends > start))
+        assert sorted(index.query(start, end).tolist()) == expected.tolist()
+
+@pytest.mark.parametrize("seed", range(5))
+def test_at_matches_brute_force(seed):
+    starts, ends = _intervals(seed)
+    index = IntervalIndex(starts, ends)
+
+    for time in np.linspace(-1, 110, 97):
+        expected = np.flatnonzero((starts <= time) & (ends > time))
+        assert sorted(index.at(time).tolist()) == expected.tolist()
+
+@pytest.mark.parametrize("seed", range(5))
+def test_overlaps_match_brute_force(seed):
+    starts, ends = _intervals(seed, n=150)
+    first, second, durations = IntervalIndex(starts, ends).overlaps()
+
+    expected = {}
+    for i in range(len(starts)):
+        for j in range(i + 1, len(starts)):
+            duration = min(ends[i], ends[j]) - max(starts[i], starts[j])
+            if duration > 0:
+                expected[(i, j)] = duration
+
+    found = {}
+    for a, b, duration in zip(first.tolist(), second.tolist(), durations.tolist()):
+        assert starts[a] <= starts[b]
+        found[(min(a, b), max(a, b))] = duration
+    assert found.keys() == expected.keys()
+    for pair, duration in expected.items():
+        assert found[pair] == pytest.approx(duration)
+
+def test_empty_and_single():
+    empty = IntervalIndex(np.zeros(0), np.zeros(0))
+    assert len(empty.query(0, 10)) == 0
+    assert len(empty.overlaps()[0]) == 0
+
+    single = IntervalIndex(np.array([1.0]), np.array([2.0]))
+    assert single.query(0, 10).tolist() == [0]
+    assert single.query(2.0, 3.0).tolist() == []
+    assert len(single.overlaps()[0]) == 0
+
+@pytest.mark.parametrize("keep", [0, 120, 300])
+def test_splice_matches_rebuild(keep):
+    starts, ends = _intervals(7)
+    order = np.argsort(starts, kind="stable")
+    starts, ends = starts[order], ends[order]
+    new_starts = np.sort(np.round(np.random.default_rng(8).uniform(starts[keep - 1] if keep else 0, 150, 40), 1))
+    new_ends = new_starts + 2.5
+
+    spliced = IntervalIndex(starts, ends).splice(keep, new_starts, new_ends)
+    all_starts = np.concatenate((starts[:keep], new_starts))
+    all_ends = np.concatenate((ends[:keep], new_ends))
+    rebuilt = IntervalIndex(all_starts, all_ends)
+
+    for start in np.linspace(-1, 155, 60):
+        assert spliced.query(start, start + 4).tolist() == rebuilt.query(start, start + 4).tolist()
+    with pytest.raises(ValueError):
+        IntervalIndex(starts, ends).splice(len(starts), np.array([0.0]), np.array([1.0]))
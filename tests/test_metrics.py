@@ -0,0 +1,49 @@
+"""
+Tests for per-stage pipeline metrics.
+"""
+
+import os
+
+import numpy as np
+
+from src.utils.metrics import PipelineMetrics, MetricsSink
+
+def test_stage_memory_is_measured_per_stage():
+    metrics = PipelineMetrics()
+    with metrics.stage("allocate"):
+        buffer = np.ones(20_000_000)
+    with metrics.stage("release"):
+        del buffer
+    metrics.audio_duration = 10.0
+    summary = metrics.to_dict()
+
+    stages = summary["stages"]
+    assert "peak_rss" not in stages["allocate"]
+    if stages["allocate"]["rss_end"]:
+        assert stages["allocate"]["rss_delta"] > 100_000_000
+        assert stages["release"]["rss_delta"] < 0
+    assert summary["total"]["peak_rss"] > 0
+
+def test_repeated_stage_accumulates():
+    metrics = PipelineMetrics()
+    for _ in range(2):
+        with metrics.stage("load"):
+            pass
+    assert set(metrics.to_dict()["stages"]) == {"load"}
+
+def test_prometheus_textfile(tmp_path):
+    metrics = PipelineMetrics()
+    with metrics.stage("transcribe"):
+        pass
+    metrics.audio_duration = 5.0
+
+    # Another worker's file stays; one of an exited process is removed
+    (tmp_path / "metrics_1.prom").write_text("", encoding="utf-8")
+    (tmp_path / "metrics_999999999.prom").write_text("", encoding="utf-8")
+    MetricsSink("prometheus", tmp_path).write(tmp_path / "call.wav", metrics.to_dict())
+
+    pid = os.getpid()
+    text = (tmp_path / f"metrics_{pid}.prom").read_text(encoding="utf-8")
+    assert f'transcription_stage_rss_delta_bytes{{stage="transcribe",pid="{pid}"}}' in text
+    assert f'transcription_peak_rss_bytes{{pid="{pid}"}}' in text
+    assert sorted(path.name for path in tmp_path.glob("*.prom")) == ["metrics_1.prom", f"metrics_{pid}.prom"]
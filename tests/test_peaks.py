@@ -0,0 +1,127 @@
+"""
+Tests for the waveform peak pyramid and its sidecar in the audio store.
+"""
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+import src.transcription.model_registry as model_registry
+from benchmarks.stub_models import install_stub_models
+from src.transcription.peaks import PeakPyramid
+from src.utils.artifact_cache import ArtifactCache
+from src.utils.audio_store import AudioStore
+from src.utils.metrics import MetricsSink
+
+def _audio(samples=100_000, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-1, 1, samples).astype(np.float32)
+
+def _brute_envelope(audio, start, end, columns, sample_rate=16000):
+    """Min and max of the samples under each column."""
+    mins = np.full(columns, np.nan)
+    maxs = np.full(columns, np.nan)
+    edges = start + np.arange(columns + 1) * ((end - start) / columns)
+    for column in range(columns):
+        first = int(edges[column] * sample_rate)
+        last = min(len(audio), int(edges[column + 1] * sample_rate))
+        if first < last:
+            mins[column] = audio[first:last].min()
+            maxs[column] = audio[first:last].max()
+    return mins, maxs
+
+def test_levels_halve():
+    pyramid = PeakPyramid.from_audio(_audio(), bucket=256, block_seconds=1.0)
+    sizes = [len(level) for level in pyramid.levels]
+
+    assert sizes[0] == -(-100_000 // 256)
+    assert sizes[-1] == 1
+    assert all(size == -(-previous // 2) for previous, size in zip(sizes, sizes[1:]))
+
+@pytest.mark.parametrize("start, end, columns", [
+    (0.0, 6.25, 100),
+    (1.3, 4.9, 37),
+    (0.0, 6.25, 3),
+    (2.0, 2.05, 400),
+    (5.0, 9.0, 50)
+])
+def test_envelope_contains_samples(start, end, columns):
+    audio = _audio()
+    pyramid = PeakPyramid.from_audio(audio, bucket=256, block_seconds=1.0)
+    mins, maxs = pyramid.envelope(start, end, columns)
+    brute_mins, brute_maxs = _brute_envelope(audio, start, end, columns)
+
+    # Buckets are aligned to the pyramid, so a column can show a little
+    # more than its own samples but never less
+    has_audio = ~np.isnan(brute_mins)
+    assert np.all(mins[has_audio] <= brute_mins[has_audio] + 1e-6)
+    assert np.all(maxs[has_audio] >= brute_maxs[has_audio] - 1e-6)
+    # Columns past the end of the audio are empty
+    beyond = start + np.arange(columns) * ((end - start) / columns) >= 100_000 / 16000
+    assert np.all(np.isnan(mins[beyond]))
+    assert not np.isnan(mins[~beyond]).any()
+
+def test_envelope_of_silence_and_empty_audio():
+    pyramid = PeakPyramid.from_audio(np.zeros(16000, dtype=np.float32))
+    mins, maxs = pyramid.envelope(0.0, 1.0, 10)
+    assert np.all(mins == 0) and np.all(maxs == 0)
+
+    mins, maxs = PeakPyramid.from_audio(np.zeros(0, dtype=np.float32)).envelope(0.0, 1.0, 10)
+    assert np.all(np.isnan(mins)) and np.all(np.isnan(maxs))
+
+def test_save_and_load(tmp_path):
+    pyramid = PeakPyramid.from_audio(_audio(), bucket=256)
+    path = tmp_path / "peaks.npz"
+    pyramid.save(path)
+    loaded = PeakPyramid.load(path)
+
+    assert (loaded.samples, loaded.bucket, loaded.sample_rate) == (100_000, 256, 16000)
+    assert len(loaded.levels) == len(pyramid.levels)
+    for level, loaded_level in zip(pyramid.levels, loaded.levels):
+        np.testing.assert_array_equal(level, loaded_level)
+    assert PeakPyramid.load(tmp_path / "missing.npz") is None
+    assert list(tmp_path.iterdir()) == [path]
+
+def test_sidecars_count_towards_store_size(tmp_path):
+    store = AudioStore(tmp_path)
+    key = store.key("abc")
+    store.put(key, _audio())
+    audio_size = store.get_statistics()["size"]
+    PeakPyramid.from_audio(store.open(key)).save(store.sidecar(key, "peaks.npz"))
+
+    sidecar_size = store.sidecar(key, "peaks.npz").stat().st_size
+    statistics = store.get_statistics()
+    assert statistics["entries"] == 1
+    assert statistics["size"] == audio_size + sidecar_size
+
+    # An entry that only fits without its sidecar is evicted
+    store.max_size = audio_size * 2 + sidecar_size // 2
+    store.put(store.key("def"), _audio(seed=1))
+    assert store.open(key) is None
+    assert not store.sidecar(key, "peaks.npz").exists()
+
+def test_pipeline_rebuilds_evicted_peaks_on_cache_hit(monkeypatch, tmp_path):
+    registry = model_registry.ModelRegistry()
+    monkeypatch.setattr(model_registry, "_registry", registry)
+    install_stub_models(registry)
+    from src.transcription.pipeline import TranscriptionPipeline
+
+    audio_path = tmp_path / "call.wav"
+    sf.write(audio_path, _audio(48_000) * 0.5, 16000)
+    store = AudioStore(tmp_path / "audio")
+    pipeline = TranscriptionPipeline(cache=ArtifactCache(tmp_path / "cache"), metrics_sink=MetricsSink(None),
+                                     diarization="acoustic", checkpoints=False, audio_store=store)
+
+    # The first run fills the cache, then eviction removes audio and peaks
+    first = pipeline.process(audio_path)
+    assert "transcribe" in first["metrics"]["stages"]
+    store.clear()
+    results = pipeline.process(audio_path)
+    assert "transcribe" not in results["metrics"]["stages"]
+    peaks = PeakPyramid.load(store.sidecar(results["audio_key"], "peaks.npz"))
+    assert peaks is not None and peaks.samples == 48_000
+    assert "preprocess_audio" in results["metrics"]["stages"]
+
+    # With the sidecar in place nothing is decoded
+    results = pipeline.process(audio_path)
+    assert "preprocess_audio" not in results["metrics"]["stages"]
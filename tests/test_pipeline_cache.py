@@ -0,0 +1,27 @@
+"""
+Tests for the pipeline's artifact cache keys.
+"""
+
+import src.transcription.model_registry as model_registry
+from benchmarks.stub_models import install_stub_models
+from src.utils.artifact_cache import ArtifactCache
+from src.utils.audio_store import AudioStore
+from src.utils.metrics import MetricsSink
+
+def test_transcribe_key_depends_on_device(monkeypatch, tmp_path):
+    registry = model_registry.ModelRegistry()
+    monkeypatch.setattr(model_registry, "_registry", registry)
+    install_stub_models(registry)
+    from src.transcription.pipeline import TranscriptionPipeline
+
+    pipeline = TranscriptionPipeline(cache=ArtifactCache(tmp_path / "cache"), metrics_sink=MetricsSink(None),
+                                     diarization="acoustic", checkpoints=False,
+                                     audio_store=AudioStore(tmp_path / "audio"))
+    pipeline.transcriber.device = "cpu"
+    cpu = pipeline._stage_keys("abc", pipeline._stage_params())
+    pipeline.transcriber.device = "cuda"
+    cuda = pipeline._stage_keys("abc", pipeline._stage_params())
+
+    assert cpu["preprocess"] == cuda["preprocess"]
+    assert cpu["transcribe"] != cuda["transcribe"]
+    assert cpu["classify"] != cuda["classify"]
@@ -0,0 +1,111 @@
+"""
+Tests that interrupted transcription and classification resume to the same result.
+"""
+
+import numpy as np
+import pytest
+
+import src.transcription.model_registry as model_registry
+from benchmarks.stub_models import install_stub_models
+from src.transcription.progress import CancellationToken, JobCancelledError
+from src.utils.checkpoint import JobCheckpoint
+
+class WindowedWhisper:
+    """Stub Whisper whose text depends on the audio, language and prompt it is given."""
+
+    def __init__(self):
+        self.calls = 0
+        self.cancel_after = None
+        self.cancel_token = None
+
+    def transcribe(self, audio, language=None, initial_prompt=None, **kwargs):
+        self.calls += 1
+        if self.calls == self.cancel_after:
+            self.cancel_token.cancel()
+        duration = len(audio) / 16000
+        segments = []
+        start = 0.0
+        while start < duration:
+            end = min(start + 3.0, duration)
+            segments.append({
+                "start": start,
+                "end": end,
+                "text": f" {float(np.abs(audio).sum()):.3f} {len(initial_prompt or '')}",
+                "avg_logprob": -0.2
+            })
+            start = end
+        return {"segments": segments, "language": language or "en"}
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Use a fresh model registry with the offline stub models."""
+    registry = model_registry.ModelRegistry()
+    monkeypatch.setattr(model_registry, "_registry", registry)
+    install_stub_models(registry)
+    return registry
+
+def _audio(seconds=60, seed=0):
+    """Noise with a quiet gap every 5 seconds for the windows to split at."""
+    rng = np.random.default_rng(seed)
+    audio = rng.uniform(-0.5, 0.5, seconds * 16000).astype(np.float32)
+    for start in range(0, seconds, 5):
+        audio[start * 16000:start * 16000 + 4000] *= 0.001
+    return audio
+
+def test_transcribe_windows_resume(registry, monkeypatch, tmp_path):
+    from src.transcription import transcriber as transcriber_module
+    monkeypatch.setattr(transcriber_module, "CHECKPOINT_WINDOW_SECONDS", 10)
+    model = WindowedWhisper()
+    registry.register_loader("whisper", lambda name, device, **options: model)
+    transcriber = transcriber_module.AudioTranscriber(model_name="stub", device="cpu",
+                                                     parallel=False, cascade=False)
+    audio = _audio()
+
+    reference = JobCheckpoint(tmp_path / "reference")
+    expected = transcriber._transcribe_windows(audio, reference)
+    reference.complete()
+    windows = model.calls
+    assert windows > 3
+
+    # Cancel while the third window is decoded; it is saved, then the job stops
+    checkpoint = JobCheckpoint(tmp_path / "job")
+    token = CancellationToken()
+    model.calls, model.cancel_after, model.cancel_token = 0, 3, token
+    with pytest.raises(JobCancelledError):
+        transcriber._transcribe_windows(audio, checkpoint, lambda fraction: token.raise_if_cancelled())
+    checkpoint.release()
+    assert checkpoint.load("transcribe")["windows"] == 3
+
+    model.calls, model.cancel_after = 0, None
+    resumed = transcriber._transcribe_windows(audio, JobCheckpoint(tmp_path / "job"))
+    assert model.calls == windows - 3
+    assert resumed == expected
+
+def test_classify_texts_resume(registry, monkeypatch, tmp_path):
+    from src.transcription import classifier as classifier_module
+    # Save after every batch
+    monkeypatch.setattr(classifier_module, "CHECKPOINT_INTERVAL_SECONDS", 0)
+    monkeypatch.setattr(classifier_module, "BATCH_SIZE", 4)
+    classifier = classifier_module.SpeakerClassifier(quantized=False)
+    texts = [" ".join(["word"] * (1 + i % 7)) + f" {i}" for i in range(30)]
+    expected = classifier._classify_texts(texts)
+
+    batches = []
+    stub = classifier.classifier
+    classifier.classifier = lambda inputs, **kwargs: batches.append(len(inputs)) or stub(inputs, **kwargs)
+    token = CancellationToken()
+
+    def progress(fraction):
+        if len(batches) == 3:
+            token.cancel()
+
+    checkpoint = JobCheckpoint(tmp_path / "job")
+    with pytest.raises(JobCancelledError):
+        classifier._classify_texts(texts, progress, token, checkpoint)
+    checkpoint.release()
+    assert sum(prediction is not None for prediction in checkpoint.load("classify")) == 12
+
+    batches.clear()
+    resumed = classifier._classify_texts(texts, checkpoint=JobCheckpoint(tmp_path / "job"))
+    assert sum(batches) == len(texts) - 12
+    assert resumed == expected
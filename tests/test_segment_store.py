@@ -0,0 +1,71 @@
+"""
+Tests for the columnar segment store.
+"""
+
+import numpy as np
+import pytest
+
+from src.transcription.segment_store import SegmentStore
+
+def _segments():
+    return [
+        {"start": 0.0, "end": 2.0, "text": "Hello there", "speaker": "salesperson",
+         "confidence": 0.9, "speaker_confidence": 0.8,
+         "overlap": {"duration": 0.5, "overlaps_with": 1}, "words": ["Hello", "there"]},
+        {"start": 1.5, "end": 3.0, "text": "Hi", "speaker": "customer",
+         "overlap": {"duration": 0.5, "overlaps_with": 0}},
+        {"start": 3.5, "end": 5.0, "text": "Ünïcode text"}
+    ]
+
+def test_round_trip():
+    segments = _segments()
+    store = SegmentStore.from_dicts(segments)
+
+    assert len(store) == 3
+    assert store.to_dicts() == segments
+    assert SegmentStore.from_dicts(store.to_dicts()).to_dicts() == segments
+
+def test_round_trip_with_overlap_lists():
+    store = SegmentStore.from_dicts(_segments())
+    store.set_overlaps(np.array([0, 0]), np.array([1, 2]), np.array([0.5, 0.25]))
+    dicts = store.to_dicts()
+
+    assert dicts[0]["overlaps"] == [{"duration": 0.5, "overlaps_with": 1},
+                                    {"duration": 0.25, "overlaps_with": 2}]
+    assert SegmentStore.from_dicts(dicts).to_dicts() == dicts
+
+def test_extend_offsets_overlaps_and_text():
+    store = SegmentStore.from_dicts(_segments())
+    store.extend(_segments())
+
+    assert len(store) == 6
+    assert store[4]["overlap"] == {"duration": 0.5, "overlaps_with": 3}
+    assert store.texts()[3:] == [segment["text"] for segment in _segments()]
+
+def test_copy_is_not_affected_by_extend():
+    store = SegmentStore.from_dicts(_segments())
+    snapshot = store.copy()
+    store.extend(_segments())
+
+    assert len(snapshot) == 3
+    assert snapshot.to_dicts() == _segments()
+
+def test_set_text():
+    store = SegmentStore.from_dicts(_segments())
+    snapshot = store.copy()
+    store[0]["text"] = "Good morning to you"
+
+    assert store.texts() == ["Good morning to you", "Hi", "Ünïcode text"]
+    assert store.speaker_statistics()["salesperson"]["word_count"] == 4
+    assert snapshot[0]["text"] == "Hello there"
+
+def test_overlaps_are_read_only():
+    store = SegmentStore.from_dicts(_segments())
+    with pytest.raises(TypeError):
+        store[0]["overlaps"] = []
+
+def test_speaker_statistics():
+    stats = SegmentStore.from_dicts(_segments()).speaker_statistics()
+
+    assert stats["salesperson"] == {"total_time": 2.0, "segment_count": 1, "word_count": 2}
+    assert stats["customer"] == {"total_time": 1.5, "segment_count": 1, "word_count": 1}
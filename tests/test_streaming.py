@@ -0,0 +1,44 @@
+"""
+Tests for reading WAV files that are still being written.
+"""
+
+import struct
+
+import numpy as np
+import pytest
+
+from src.transcription.streaming import GrowingFileSource, wav_data_offset
+
+def _write_wav(path, samples, chunks=(), sample_rate=16000):
+    """Write a 16-bit mono WAV with extra chunks before the data chunk."""
+    fmt = struct.pack("<HHIIHH", 1, 1, sample_rate, sample_rate * 2, 2, 16)
+    body = b"WAVE" + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+    for chunk_id, payload in chunks:
+        body += chunk_id + struct.pack("<I", len(payload)) + payload + b"\0" * (len(payload) & 1)
+    data = samples.astype("<i2").tobytes()
+    # Recorders leave the data size at zero until they finish
+    body += b"data" + struct.pack("<I", 0) + data
+    path.write_bytes(b"RIFF" + struct.pack("<I", 0) + body)
+    return len(b"RIFF") + 4 + len(body) - len(data)
+
+def test_data_chunk_after_large_metadata(tmp_path):
+    samples = (np.arange(1000) - 500).astype(np.int16)
+    # An odd-sized chunk containing the bytes "data", then more than 4 KB of metadata
+    chunks = [(b"bext", b"metadata" * 3 + b"x"), (b"LIST", b"\1" * 6000)]
+    offset = _write_wav(tmp_path / "call.wav", samples, chunks)
+
+    with open(tmp_path / "call.wav", "rb") as f:
+        assert wav_data_offset(f) == offset
+
+    source = GrowingFileSource(tmp_path / "call.wav")
+    try:
+        audio = source.read(timeout=0)
+    finally:
+        source.close()
+    np.testing.assert_allclose(audio, samples / np.iinfo(np.int16).max, rtol=1e-6)
+
+def test_missing_data_chunk(tmp_path):
+    path = tmp_path / "broken.wav"
+    path.write_bytes(b"RIFF" + struct.pack("<I", 4) + b"WAVE")
+    with open(path, "rb") as f, pytest.raises(ValueError):
+        wav_data_offset(f)
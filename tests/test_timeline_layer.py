@@ -0,0 +1,85 @@
+"""
+Tests that live appends to the timeline's segment layer match a full rebuild.
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("PyQt6.QtWidgets")
+
+from src.gui.timeline_view import SegmentLayer
+from src.transcription.segment_store import SegmentStore
+
+def _segments(seed, n=3000, duration=7200.0):
+    rng = np.random.default_rng(seed)
+    starts = np.sort(rng.uniform(0, duration, n))
+    return [
+        {
+            "start": float(start),
+            "end": float(start + rng.exponential(2.0)),
+            "text": "word",
+            "speaker": ["salesperson", "customer", "unknown"][rng.integers(0, 3)],
+            "overlap": {"overlaps_with": 0, "duration": 0.1} if rng.random() < 0.05 else None
+        }
+        for start in starts
+    ]
+
+def _assert_same_levels(layer, expected):
+    assert [gap for gap, _ in layer.levels] == [gap for gap, _ in expected.levels]
+    for (_, blocks), (_, reference) in zip(layer.levels, expected.levels):
+        for name in ("start", "end", "speaker", "overlap", "last"):
+            np.testing.assert_array_equal(blocks[name], reference[name])
+        for start in np.linspace(0, 7300, 40):
+            assert blocks["index"].query(start, start + 200).tolist() == \
+                reference["index"].query(start, start + 200).tolist()
+
+@pytest.mark.parametrize("seed", range(3))
+def test_append_matches_rebuild(seed):
+    segments = _segments(seed)
+    layer = SegmentLayer(SegmentStore.from_dicts(segments[:200]), max_blocks=100)
+    for first in range(200, len(segments), 150):
+        changed = layer.append(SegmentStore.from_dicts(segments[first:first + 150]))
+        assert changed <= segments[first]["start"]
+
+    _assert_same_levels(layer, SegmentLayer(SegmentStore.from_dicts(segments), max_blocks=100))
+
+def test_append_reports_changed_range():
+    segments = _segments(0)
+    layer = SegmentLayer(SegmentStore.from_dicts(segments[:2000]), max_blocks=100)
+    levels = len(layer.levels)
+    changed = layer.append(SegmentStore.from_dicts(segments[2000:2005]))
+
+    if len(layer.levels) == levels:
+        # Only blocks reaching the new segments changed
+        assert 0 < changed <= segments[2000]["start"]
+    assert layer.append(SegmentStore()) == np.inf
+
+def test_out_of_order_append_rebuilds():
+    segments = _segments(1, n=500)
+    layer = SegmentLayer(SegmentStore.from_dicts(segments[100:]), max_blocks=50)
+
+    assert layer.append(SegmentStore.from_dicts(segments[:100])) == 0.0
+    _assert_same_levels(layer, SegmentLayer(SegmentStore.from_dicts(segments[100:] + segments[:100]), max_blocks=50))
+
+def test_canvas_keeps_tiles_before_the_change(monkeypatch):
+    monkeypatch.setenv("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    from src.gui.timeline_view import BASE_WIDTH, TILE_WIDTH, TimelineCanvas
+    # Pixmaps need an application
+    app = QApplication.instance() or QApplication([])
+
+    segments = _segments(2, n=200, duration=1000.0)
+    canvas = TimelineCanvas()
+    canvas.set_layer(SegmentLayer(SegmentStore.from_dicts(segments[:100])), 512.0)
+    tile_span = TILE_WIDTH * 512.0 / BASE_WIDTH
+    for tile in range(2):
+        canvas._tile(0, tile, tile_span / TILE_WIDTH)
+    canvas._tile(1, 0, tile_span / TILE_WIDTH / 2)
+
+    # The call outgrows the grid: it doubles and tiles move up a level
+    canvas.extend_layer(600.0, 300.0)
+    assert set(canvas._tiles) == {(1, 0), (2, 0)}
+    assert canvas._grid_span == 1024.0
+
+    canvas.extend_layer(700.0, 200.0)
+    assert set(canvas._tiles) == {(2, 0)}